@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import io
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+import pyarrow as pa
+
+from macro_cache import arrow_safe, cache_key
+from macro_fetch import CircuitOpenError, DataFetcher
+from macro_metrics import METRICS, METRICS_CONTENT_TYPE
+from macro_normalize import clean_numeric, normalize
+from macro_registry import dataset_params, iter_datasets
+
+# --- Local Data API ---
+# GET /datasets                          catalog metadata
+# GET /datasets/<region>/<dataset>       one dataset from the shared cache
+#     ?start=2020-01-01&end=2023-12-31   slice on the detected date column
+#     &columns=今值,预测值                 project columns (date column is kept)
+#     &format=json|arrow                 JSON records or Arrow IPC stream
+# Any other query parameter is passed to the akshare function and must be one
+# of the dataset's params.
+# GET /metrics                          stage timings in the Prometheus text format
+RESERVED_PARAMS = {"start", "end", "columns", "format"}
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def catalog(registry=None):
+    return [
+        {
+            "region": region_name, "dataset": dataset_name, "desc": info["desc"],
+            "url": info.get("url"), "freq": info.get("freq"), "params": dataset_params(info),
+        }
+        for region_name, dataset_name, info in iter_datasets(registry=registry)
+    ]
+
+
+def select(df, layout_key, start=None, end=None, columns=None):
+    formatted, date_col, numeric_cols = normalize(df, layout_key=layout_key)
+    if (start or end) and date_col is None:
+        raise ApiError(400, "该数据集没有可识别的日期列，无法按日期切片")
+    if start:
+        formatted = formatted[formatted[date_col] >= pd.Timestamp(start)]
+    if end:
+        formatted = formatted[formatted[date_col] <= pd.Timestamp(end)]
+    if columns:
+        missing = [c for c in columns if c not in formatted.columns]
+        if missing:
+            raise ApiError(400, f"未知列: {', '.join(missing)}")
+        keep = ([date_col] if date_col is not None and date_col not in columns else []) + columns
+        formatted = formatted[keep]
+    # API consumers get numbers, not the display text kept in the app preview
+    formatted = formatted.copy(deep=False)
+    with METRICS.time("numeric"):
+        for col in numeric_cols:
+            if col in formatted.columns:
+                formatted[col] = clean_numeric(formatted[col])
+    return formatted
+
+
+def etag_matches(header, etag):
+    # If-None-Match: a comma-separated list of (possibly weak) tags, or *
+    tags = {tag.strip().removeprefix("W/") for tag in (header or "").split(",")}
+    return "*" in tags or etag in tags
+
+
+def to_json_bytes(df):
+    return df.to_json(orient="records", date_format="iso", force_ascii=False).encode("utf-8")
+
+
+def to_arrow_bytes(df):
+    table = pa.Table.from_pandas(arrow_safe(df), preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class MacroApiHandler(BaseHTTPRequestHandler):
+    fetcher = None
+
+    def _send(self, status, body=b"", content_type="application/json; charset=utf-8", etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        try:
+            if parts == ["datasets"]:
+                self._send(200, json.dumps(catalog(self.fetcher.registry), ensure_ascii=False).encode("utf-8"))
+            elif parts == ["metrics"]:
+                self._send(200, METRICS.render().encode("utf-8"), METRICS_CONTENT_TYPE)
+            elif len(parts) == 3 and parts[0] == "datasets":
+                self._serve_dataset(parts[1], parts[2], parse_qs(url.query))
+            else:
+                raise ApiError(404, "未知路径")
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+        except CircuitOpenError as e:
+            self._send_error(503, str(e))
+        except Exception as e:
+            self._send_error(502, f"获取数据时发生错误: {e}")
+
+    def _serve_dataset(self, region_name, dataset_name, query):
+        info = self.fetcher.registry.get(region_name, {}).get(dataset_name)
+        if info is None:
+            raise ApiError(404, f"未知数据集: {region_name}/{dataset_name}")
+        options = {k: v[-1] for k, v in query.items() if k in RESERVED_PARAMS}
+        kwargs = {k: v[-1] for k, v in query.items() if k not in RESERVED_PARAMS}
+        unknown = [k for k in kwargs if k not in dataset_params(info)]
+        if unknown:
+            raise ApiError(400, f"未知参数: {', '.join(unknown)}")
+        fmt = options.get("format", "json")
+        if fmt not in ("json", "arrow"):
+            raise ApiError(400, f"不支持的格式: {fmt}")
+
+        # the version seen before fetching is safe to hand out: a refresh that
+        # lands in between only produces a newer ETag on the next request
+        version = self.fetcher.cache.fetched_at(region_name, dataset_name, kwargs)
+        df = self.fetcher.fetch(region_name, dataset_name, kwargs)
+        if not isinstance(df, pd.DataFrame):
+            raise ApiError(502, "接口未返回表格数据")
+        if version is None:
+            version = self.fetcher.cache.fetched_at(region_name, dataset_name, kwargs)
+        etag = None
+        if version is not None:
+            raw = json.dumps([cache_key(region_name, dataset_name, kwargs), version, sorted(options.items())], default=str)
+            etag = f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                self._send(304, etag=etag)
+                return
+
+        columns = [c for c in options.get("columns", "").split(",") if c]
+        try:
+            result = select(df, f"{region_name}/{dataset_name}", options.get("start"), options.get("end"), columns)
+        except ValueError as e:
+            raise ApiError(400, f"参数错误: {e}")
+        with METRICS.time("serialize"):
+            body = to_arrow_bytes(result) if fmt == "arrow" else to_json_bytes(result)
+        if etag is None:
+            # no cached version (evicted or failed write): tag the payload itself
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                self._send(304, etag=etag)
+                return
+        if fmt == "arrow":
+            self._send(200, body, ARROW_CONTENT_TYPE, etag)
+        else:
+            self._send(200, body, etag=etag)
+
+
+def make_server(host="127.0.0.1", port=8765, fetcher=None):
+    handler = type("BoundMacroApiHandler", (MacroApiHandler,), {"fetcher": fetcher or DataFetcher()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="以 HTTP 接口提供缓存的 AKShare 宏观数据")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}/datasets", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from macro_cache import DatasetCache, arrow_safe
+from macro_charts import build_line_chart
+from macro_metrics import METRICS
+from macro_normalize import normalize, numeric_frame
+from macro_registry import AKSHARE_MACRO_MAP, resolve_func
+
+# --- Offline Benchmarks ---
+# Replays DataFrame fixtures through the stages of a page view, from the disk
+# cache read to the chart, and reports the median time of each stage as
+# recorded by macro_metrics. Fixtures are recorded from the live akshare
+# functions with --record; one that has not been recorded is generated with the
+# same columns and date format, so the suite always runs without network access.
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+CHART_COLUMNS = 5
+NOISE_FLOOR = 0.002
+
+
+def _random_walk(rng, n, start=100.0, scale=0.01):
+    return start * np.exp(np.cumsum(rng.normal(0, scale, n)))
+
+
+def _pct_change(values, periods):
+    out = np.full(len(values), np.nan)
+    out[periods:] = (values[periods:] / values[:-periods] - 1) * 100
+    return out.round(2)
+
+
+def make_daily_long(rng):
+    # eastmoney index pages: decades of daily closes, dates as datetime.date objects
+    dates = pd.bdate_range("1985-01-04", "2025-12-31")
+    level = _random_walk(rng, len(dates), 1500.0, 0.02).round(0)
+    data = {"日期": dates.date, "最新值": level, "涨跌幅": _pct_change(level, 1)}
+    for label, periods in [("近3月", 63), ("近6月", 126), ("近1年", 252), ("近2年", 504), ("近3年", 756)]:
+        data[f"{label}涨跌幅"] = _pct_change(level, periods)
+    return pd.DataFrame(data)
+
+
+def make_nbs_wide(rng):
+    # NBS long format: one row per (period, indicator), pivoted to one column per indicator
+    periods = pd.period_range("1996-01", "2025-12", freq="M")
+    items = [f"居民消费价格指数(上年同月=100)-分项{i:03d}" for i in range(200)]
+    values = 100 + rng.normal(0, 2, (len(periods), len(items))).round(1)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame({
+        "date": np.repeat([f"{p.year}年{p.month}月" for p in periods], len(items)),
+        "item": np.tile(items, len(periods)),
+        "value": values.ravel(),
+    })
+
+
+def make_cn_month(rng):
+    # eastmoney CPI table: "2024年01月份", newest first
+    months = pd.period_range("2008-01", "2025-12", freq="M")[::-1]
+    data = {"月份": [f"{p.year}年{p.month:02d}月份" for p in months]}
+    for area in ["全国", "城市", "农村"]:
+        level = _random_walk(rng, len(months), 100.0, 0.003)
+        data[f"{area}-当月"] = level.round(1)
+        data[f"{area}-同比增长"] = rng.normal(2, 1.5, len(months)).round(1)
+        data[f"{area}-环比增长"] = rng.normal(0.2, 0.4, len(months)).round(1)
+        data[f"{area}-累计"] = level.round(1)
+    return pd.DataFrame(data)
+
+
+def make_cn_quarter(rng):
+    # eastmoney GDP table: cumulative quarters such as "2024年第1-3季度"
+    quarters = pd.period_range("2006Q1", "2025Q4", freq="Q")[::-1]
+    labels = [f"{q.year}年第1季度" if q.quarter == 1 else f"{q.year}年第1-{q.quarter}季度" for q in quarters]
+    data = {"季度": labels}
+    for name in ["国内生产总值", "第一产业", "第二产业", "第三产业"]:
+        data[f"{name}-绝对值"] = _random_walk(rng, len(quarters), 50000.0, 0.02).round(1)
+        data[f"{name}-同比增长"] = rng.normal(6, 2, len(quarters)).round(1)
+    return pd.DataFrame(data)
+
+
+FIXTURES = {
+    "daily_long": {"region": "中国宏观", "dataset": "波罗的海干散货指数", "kwargs": {}, "make": make_daily_long},
+    "nbs_wide": {
+        "region": "国家统计局(通用接口)", "dataset": "全国数据",
+        "kwargs": {"kind": "月度数据", "path": "价格 > 居民消费价格指数(上年同月=100)", "period": "1996-"},
+        "make": make_nbs_wide,
+    },
+    "cn_month": {"region": "中国宏观", "dataset": "居民消费价格指数", "kwargs": {}, "make": make_cn_month},
+    "cn_quarter": {"region": "中国宏观", "dataset": "国内生产总值", "kwargs": {}, "make": make_cn_quarter},
+}
+
+
+# --- Fixtures ---
+def fixture_path(name, fixture_dir=FIXTURE_DIR):
+    return os.path.join(fixture_dir, f"{name}.parquet")
+
+
+def load_fixture(name, fixture_dir=FIXTURE_DIR, seed=0):
+    path = fixture_path(name, fixture_dir)
+    if os.path.exists(path):
+        return pd.read_parquet(path), "recorded"
+    return FIXTURES[name]["make"](np.random.default_rng(seed)), "synthetic"
+
+
+def record_fixture(name, fixture_dir=FIXTURE_DIR):
+    fixture = FIXTURES[name]
+    info = AKSHARE_MACRO_MAP[fixture["region"]][fixture["dataset"]]
+    df = resolve_func(info)(**fixture["kwargs"])
+    os.makedirs(fixture_dir, exist_ok=True)
+    try:
+        df.to_parquet(fixture_path(name, fixture_dir))
+    except (ValueError, TypeError):
+        arrow_safe(df).to_parquet(fixture_path(name, fixture_dir))
+    return df
+
+
+# --- Replay ---
+def replay(name, cache):
+    fixture = FIXTURES[name]
+    METRICS.reset()
+    df, _ = cache.read(fixture["region"], fixture["dataset"], fixture["kwargs"])
+    # no layout key: every run pays for layout detection, as a first page view does
+    formatted, date_col, numeric_cols = normalize(df)
+    columns = numeric_cols[:CHART_COLUMNS]
+    if date_col is not None and columns:
+        plot = numeric_frame(formatted, date_col, columns)
+        build_line_chart(plot, date_col, columns, title=name)
+    return METRICS.totals()
+
+
+def run(names=None, repeat=5, fixture_dir=FIXTURE_DIR):
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        cache = DatasetCache(root=root)
+        for name in names or FIXTURES:
+            fixture = FIXTURES[name]
+            df, source = load_fixture(name, fixture_dir)
+            cache.write(fixture["region"], fixture["dataset"], fixture["kwargs"], df)
+            replay(name, cache)  # warm-up: imports, plotly templates, page cache
+            runs = [replay(name, cache) for _ in range(repeat)]
+            stages = {stage: statistics.median(r.get(stage, 0.0) for r in runs) for stage in set().union(*runs)}
+            results[name] = {"source": source, "rows": len(df), "columns": len(df.columns), "stages": stages}
+    METRICS.reset()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base_stages = baseline.get(name, {}).get("stages", {})
+        for stage, seconds in result["stages"].items():
+            base = base_stages.get(stage)
+            # tiny stages fluctuate by whole multiples; ignore differences below the noise floor
+            if base is not None and seconds > base * (1 + tolerance) and seconds - base > NOISE_FLOOR:
+                regressions.append((name, stage, base, seconds))
+    return regressions
+
+
+def print_results(results):
+    for name, result in results.items():
+        print(f"{name} ({result['source']}, {result['rows']} 行 x {result['columns']} 列)")
+        for stage, seconds in sorted(result["stages"].items(), key=lambda item: -item[1]):
+            print(f"  {stage:<14} {seconds * 1000:9.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="离线回放数据样本，测量各处理阶段的耗时")
+    parser.add_argument("--fixture", action="append", choices=list(FIXTURES), help="仅运行指定样本 (可重复)")
+    parser.add_argument("--fixture-dir", default=FIXTURE_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--record", action="store_true", help="从 akshare 重新录制样本 (需要网络)")
+    parser.add_argument("--out", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前 --out 写出的结果比较，有阶段变慢时返回非零")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="允许的相对变慢幅度")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        for name in args.fixture or FIXTURES:
+            df = record_fixture(name, args.fixture_dir)
+            print(f"已录制 {name}: {len(df)} 行 -> {fixture_path(name, args.fixture_dir)}")
+
+    results = run(args.fixture, args.repeat, args.fixture_dir)
+    print_results(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, stage, base, seconds in regressions:
+            print(f"变慢: {name}/{stage} {base * 1000:.2f} ms -> {seconds * 1000:.2f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
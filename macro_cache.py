@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from macro_metrics import METRICS
+
+# --- Cache Configuration ---
+CACHE_DIR = os.environ.get(
+    "MACRO_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".macro_cache")
+)
+CACHE_MAX_BYTES = int(os.environ.get("MACRO_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+HOUR = 3600
+DAY = 24 * HOUR
+FREQUENCY_TTL = {
+    "event": 1 * HOUR,
+    "daily": 6 * HOUR,
+    "weekly": 1 * DAY,
+    "monthly": 1 * DAY,
+    "quarterly": 3 * DAY,
+    "yearly": 7 * DAY,
+}
+DEFAULT_TTL = FREQUENCY_TTL["monthly"]
+NBS_KIND_FREQUENCY = {"年度": "yearly", "季度": "quarterly", "月度": "monthly"}
+
+
+def dataset_frequency(info, kwargs=None):
+    # NBS generic interfaces carry their frequency in the selected `kind`
+    kind = (kwargs or {}).get("kind", "")
+    for marker, freq in NBS_KIND_FREQUENCY.items():
+        if marker in kind:
+            return freq
+    return info.get("freq", "monthly")
+
+
+def dataset_ttl(info, kwargs=None):
+    return FREQUENCY_TTL.get(dataset_frequency(info, kwargs), DEFAULT_TTL)
+
+
+def cache_key(region_name, dataset_name, kwargs):
+    raw = json.dumps([region_name, dataset_name, kwargs or {}], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def arrow_safe(df):
+    # AKShare frames may carry non-string column labels and mixed-type object columns
+    safe = df.copy()
+    safe.columns = [str(c) for c in safe.columns]
+    for col in safe.columns:
+        if safe[col].dtype == object:
+            safe[col] = safe[col].astype("string")
+    return safe
+
+
+# --- Persistent Dataset Cache ---
+# One Parquet file per (region, dataset, kwargs); the file mtime is the fetch time.
+class DatasetCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.parquet")
+
+    def fetched_at(self, region_name, dataset_name, kwargs=None):
+        try:
+            return os.path.getmtime(self._path(cache_key(region_name, dataset_name, kwargs)))
+        except OSError:
+            return None
+
+    def age(self, region_name, dataset_name, kwargs=None):
+        fetched_at = self.fetched_at(region_name, dataset_name, kwargs)
+        return None if fetched_at is None else time.time() - fetched_at
+
+    def read(self, region_name, dataset_name, kwargs=None, touch=True):
+        path = self._path(cache_key(region_name, dataset_name, kwargs))
+        try:
+            stat = os.stat(path)
+            fetched_at = stat.st_mtime
+            with METRICS.time("cache_read"):
+                df = pd.read_parquet(path)
+            # atime tracks last use for LRU eviction; mtime stays the fetch time.
+            # Scans (touch=False) restore the old atime whatever the mount options.
+            os.utime(path, (time.time() if touch else stat.st_atime, fetched_at))
+        except (OSError, ValueError):
+            return None, None
+        return df, fetched_at
+
+    def write(self, region_name, dataset_name, kwargs, df):
+        path = self._path(cache_key(region_name, dataset_name, kwargs))
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                df.to_parquet(tmp_path)
+            except (ValueError, TypeError):
+                arrow_safe(df).to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".parquet"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, name))
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.root, name))
+            except OSError:
+                continue
+            total -= size
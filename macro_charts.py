@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from macro_metrics import METRICS
+
+# --- Chart Rendering ---
+# Long series are reduced server-side with Largest-Triangle-Three-Buckets so the
+# browser only receives about two points per horizontal pixel; figures that
+# still carry many points switch to WebGL traces.
+CHART_WIDTH_PX = 1200
+POINTS_PER_PIXEL = 2
+WEBGL_THRESHOLD = 5000
+
+
+def lttb(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    buckets = np.array_split(np.arange(1, n - 1), n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, bucket in enumerate(buckets):
+        nxt = buckets[i + 1] if i + 1 < len(buckets) else np.array([n - 1])
+        avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        # pick the point forming the largest triangle with the previous pick
+        # and the average of the next bucket
+        area = np.abs((x[a] - avg_x) * (y[bucket] - y[a]) - (x[a] - x[bucket]) * (avg_y - y[a]))
+        a = bucket[np.argmax(area)]
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_series(dates, values, n_out):
+    keep = dates.notna()
+    dates = dates[keep]
+    y = pd.to_numeric(values[keep], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    # ratios can produce ±inf (division by a zero base): drawn as gaps like NaN
+    y = np.where(np.isfinite(y), y, np.nan)
+    if len(dates) <= n_out:
+        return dates, pd.Series(y, index=dates.index)
+    order = np.argsort(dates.to_numpy(), kind="stable")
+    dates, y = dates.iloc[order], y[order]
+    x = dates.to_numpy().astype("datetime64[s]").astype(np.float64)
+    # LTTB ranks only real points; every gap between two kept points keeps one
+    # NaN row so connectgaps=False still breaks the line there
+    finite = np.flatnonzero(~np.isnan(y))
+    picked = finite[lttb(x[finite], y[finite], n_out)]
+    gaps = np.flatnonzero(np.isnan(y))
+    slots = np.searchsorted(picked, gaps)
+    markers = gaps[np.r_[True, slots[1:] != slots[:-1]]] if len(gaps) else gaps
+    idx = np.sort(np.concatenate([picked, markers]))
+    return dates.iloc[idx], pd.Series(y[idx], index=dates.index[idx])
+
+
+@METRICS.timed("chart")
+def build_line_chart(df, date_col, y_cols, title, x_range=None, width_px=CHART_WIDTH_PX):
+    dates = df[date_col]
+    if x_range is not None:
+        window = (dates >= pd.Timestamp(x_range[0])) & (dates <= pd.Timestamp(x_range[1]))
+        df, dates = df[window], dates[window]
+    n_out = width_px * POINTS_PER_PIXEL
+    series = [(col, *downsample_series(dates, df[col], n_out)) for col in y_cols]
+    use_webgl = sum(len(x) for _, x, _ in series) > WEBGL_THRESHOLD
+    trace = go.Scattergl if use_webgl else go.Scatter
+    fig = go.Figure()
+    for col, x, y in series:
+        fig.add_trace(trace(x=x, y=y, mode="lines", name=str(col), connectgaps=False))
+    fig.update_layout(title=title, xaxis_title="日期", yaxis_title="数值", legend_title_text='指标')
+    return fig
+
+
+def needs_downsampling(df, width_px=CHART_WIDTH_PX):
+    return len(df) > width_px * POINTS_PER_PIXEL
@@ -0,0 +1,137 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from macro_registry import iter_datasets
+from macro_workspace import align_series, extract_series, numeric_columns, series_label
+
+# --- Correlation & Lead-Lag Scan ---
+# All cached numeric series are aligned on one calendar and correlated with
+# masked matrix products: for every lag k one batch of matmuls yields the
+# pairwise-complete Pearson correlation of x_i(t) with x_j(t + k) for all i, j.
+MIN_PERIODS = 24
+
+
+def cached_series(cache, regions=None):
+    series = {}
+    for region_name, dataset_name, info in iter_datasets(regions):
+        if info.get("params"):
+            continue
+        # a scan is not a use: leave the LRU eviction order alone
+        df, _ = cache.read(region_name, dataset_name, {}, touch=False)
+        if df is None or df.empty:
+            continue
+        layout_key = f"{region_name}/{dataset_name}"
+        try:
+            for col in numeric_columns(df, layout_key):
+                series[series_label(region_name, dataset_name, col)] = extract_series(df, layout_key, col)
+        except (KeyError, ValueError, TypeError):
+            continue
+    return series
+
+
+def aligned_matrix(series, freq="MS", min_periods=MIN_PERIODS):
+    aligned = align_series(series, freq=freq, how="last")
+    if aligned.empty:
+        return aligned
+    return aligned.loc[:, aligned.notna().sum() >= min_periods]
+
+
+def _standardize(X):
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0)
+    std[~(std > 0)] = 1.0
+    return (X - mean) / std
+
+
+def lagged_correlation(A, B, min_periods=MIN_PERIODS):
+    # A: (T, n) values at t, B: (T, m) values at t + k, NaN where missing
+    fa, fb = ~np.isnan(A), ~np.isnan(B)
+    A0, B0 = np.where(fa, A, 0.0), np.where(fb, B, 0.0)
+    fa, fb = fa.astype(np.float64), fb.astype(np.float64)
+    n = fa.T @ fb
+    sx, sy = A0.T @ fb, fa.T @ B0
+    sxx, syy = (A0 * A0).T @ fb, fa.T @ (B0 * B0)
+    sxy = A0.T @ B0
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (n * sxy - sx * sy) / np.sqrt(var)
+    corr[(n < min_periods) | ~(var > 0)] = np.nan
+    return corr
+
+
+def _fingerprint(series):
+    values = series.dropna()
+    return int(pd.util.hash_pandas_object(values).sum()) if len(values) else 0
+
+
+class CorrelationScanner:
+    def __init__(self, max_lag=12, min_periods=MIN_PERIODS):
+        self.max_lag = max_lag
+        self.min_periods = min_periods
+        # (columns, cube) is replaced as a whole: the scanner is shared across
+        # sessions, and readers must never pair new columns with an old cube
+        self._state = ([], np.empty((max_lag + 1, 0, 0)))
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+    @property
+    def columns(self):
+        return self._state[0]
+
+    @property
+    def cube(self):
+        return self._state[1]
+
+    def update(self, aligned):
+        # only pairs involving new or changed series are recomputed; values of
+        # untouched pairs do not depend on how far the shared calendar extends
+        with self._lock:
+            old_columns, old_cube = self._state
+            columns = list(aligned.columns)
+            fingerprints = {col: _fingerprint(aligned[col]) for col in columns}
+            reused = [c for c in columns if c in self._fingerprints and self._fingerprints[c] == fingerprints[c]]
+            changed = np.array([i for i, c in enumerate(columns) if c not in set(reused)], dtype=np.int64)
+
+            cube = np.full((self.max_lag + 1, len(columns), len(columns)), np.nan)
+            if reused:
+                old_pos = {c: i for i, c in enumerate(old_columns)}
+                new_idx = np.array([columns.index(c) for c in reused])
+                old_idx = np.array([old_pos[c] for c in reused])
+                cube[:, new_idx[:, None], new_idx[None, :]] = old_cube[:, old_idx[:, None], old_idx[None, :]]
+
+            if len(changed):
+                X = _standardize(aligned.to_numpy(dtype=np.float64))
+                T = len(X)
+                for k in range(min(self.max_lag, T - 1) + 1):
+                    lead, lag = X[:T - k], X[k:]
+                    cube[k, changed, :] = lagged_correlation(lead[:, changed], lag, self.min_periods)
+                    cube[k, :, changed] = lagged_correlation(lead, lag[:, changed], self.min_periods).T
+
+            self._state, self._fingerprints = (columns, cube), fingerprints
+            return len(changed)
+
+    def top_related(self, target, top_n=10):
+        columns, cube = self._state
+        if target not in columns:
+            # dropped by another session's update since the caller listed the columns
+            return pd.DataFrame(columns=["序列", "相关系数", "领先期数", "同期相关"])
+        t = columns.index(target)
+        # lag > 0: target leads the other series; lag < 0: target lags behind it
+        leads = cube[:, t, :]
+        lags = cube[:, :, t]
+        candidates = np.concatenate([leads, lags[1:]], axis=0)
+        lag_values = np.concatenate([np.arange(self.max_lag + 1), -np.arange(1, self.max_lag + 1)])
+        strength = np.where(np.isnan(candidates), -1.0, np.abs(candidates))
+        best = strength.argmax(axis=0)
+        cols = np.arange(len(columns))
+        result = pd.DataFrame({
+            "序列": columns,
+            "相关系数": candidates[best, cols],
+            "领先期数": lag_values[best],
+            "同期相关": cube[0, t, :],
+        })
+        result = result.drop(index=t).dropna(subset=["相关系数"])
+        return result.reindex(result["相关系数"].abs().sort_values(ascending=False).index).head(top_n)
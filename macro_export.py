@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+import pandas as pd
+
+from macro_cache import arrow_safe, dataset_ttl
+from macro_fetch import DataFetcher
+from macro_normalize import normalize
+from macro_registry import dataset_host
+from macro_warmup import HostLimiter, call_with_retry, run_by_host, warmup_targets
+
+# --- Bulk Export ---
+# Writes each dataset to <out>/region=<r>/dataset=<d>/part-0.parquet as soon as
+# it arrives and records it in manifest.json, so an interrupted run resumes
+# from the datasets that are still missing. A cached copy is exported only
+# while it is within its TTL; anything older is fetched from upstream.
+MANIFEST_NAME = "manifest.json"
+
+
+def partition_dir(out_dir, region_name, dataset_name):
+    return os.path.join(out_dir, f"region={quote(region_name, safe='')}", f"dataset={quote(dataset_name, safe='')}")
+
+
+class Manifest:
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)["datasets"]
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    @staticmethod
+    def key(region_name, dataset_name):
+        return f"{region_name}/{dataset_name}"
+
+    def done(self, region_name, dataset_name, out_dir):
+        entry = self.entries.get(self.key(region_name, dataset_name))
+        return bool(entry) and entry["status"] == "ok" and os.path.exists(os.path.join(out_dir, entry["path"]))
+
+    def record(self, region_name, dataset_name, entry):
+        with self._lock:
+            self.entries[self.key(region_name, dataset_name)] = entry
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"datasets": self.entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def _isodate(value):
+    return None if pd.isna(value) else pd.Timestamp(value).date().isoformat()
+
+
+def _load(fetcher, limiter, region_name, dataset_name, info, retries, backoff):
+    # -> (df, source, fetched_at); fetcher.fetch would hand out expired copies and
+    # leave background refreshes running when the CLI exits
+    age = fetcher.cache.age(region_name, dataset_name, {})
+    if age is not None and age <= dataset_ttl(info):
+        df, fetched_at = fetcher.cache.read(region_name, dataset_name, {})
+        if df is not None:
+            return df, "cache", fetched_at
+    with limiter(dataset_host(info)):
+        df = call_with_retry(lambda: fetcher.load(region_name, dataset_name), retries=retries, backoff=backoff)
+    return df, "upstream", time.time()
+
+
+def export_one(fetcher, limiter, out_dir, region_name, dataset_name, info, retries=3, backoff=1.0):
+    entry = {"region": region_name, "dataset": dataset_name, "url": info.get("url"), "freq": info.get("freq")}
+    start = time.perf_counter()
+    try:
+        df, source, fetched_at = _load(fetcher, limiter, region_name, dataset_name, info, retries, backoff)
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError(f"接口返回了 {type(df).__name__}，而不是 DataFrame")
+    except Exception as e:
+        entry.update(status="failed", source="upstream", error=str(e), fetch_seconds=round(time.perf_counter() - start, 3))
+        return entry
+    # fetch_seconds is the upstream call, or the disk read for a cached copy
+    entry.update(
+        source=source,
+        fetched_at=datetime.fromtimestamp(fetched_at).isoformat(timespec="seconds"),
+        fetch_seconds=round(time.perf_counter() - start, 3),
+    )
+
+    start = time.perf_counter()
+    try:
+        formatted, date_col, numeric_cols = normalize(df, layout_key=f"{region_name}/{dataset_name}")
+        target_dir = partition_dir(out_dir, region_name, dataset_name)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, "part-0.parquet")
+        arrow_safe(formatted).to_parquet(f"{target}.tmp", index=False)
+        os.replace(f"{target}.tmp", target)
+    except Exception as e:
+        entry.update(status="failed", error=f"写入失败: {e}")
+        return entry
+    entry.update(
+        status="ok",
+        path=os.path.relpath(target, out_dir),
+        rows=len(formatted),
+        columns=[str(c) for c in formatted.columns],
+        date_col=None if date_col is None else str(date_col),
+        numeric_cols=[str(c) for c in numeric_cols],
+        first_date=_isodate(formatted[date_col].min()) if date_col is not None else None,
+        last_date=_isodate(formatted[date_col].max()) if date_col is not None else None,
+        write_seconds=round(time.perf_counter() - start, 3),
+        exported_at=datetime.now().isoformat(timespec="seconds"),
+    )
+    return entry
+
+
+def export(out_dir, fetcher=None, regions=None, datasets=None, workers=8, limiter=None,
+           resume=True, retries=3, backoff=1.0, progress=None):
+    os.makedirs(out_dir, exist_ok=True)
+    fetcher = fetcher or DataFetcher()
+    limiter = limiter or HostLimiter()
+    manifest = Manifest(out_dir)
+    targets = [
+        target for target in warmup_targets(regions, datasets, fetcher.registry)
+        if not (resume and manifest.done(target[0], target[1], out_dir))
+    ]
+    results = run_by_host(
+        targets, lambda t: export_one(fetcher, limiter, out_dir, *t, retries, backoff), limiter, workers
+    )
+    for done, ((region_name, dataset_name, _), entry) in enumerate(results, start=1):
+        manifest.record(region_name, dataset_name, entry)
+        if progress:
+            progress(done, len(targets), entry)
+    return manifest
+
+
+def print_progress(done, total, entry):
+    line = f"[{done}/{total}] {entry['status']:<6} {entry['region']}/{entry['dataset']}"
+    if entry["status"] == "ok":
+        line += f" {entry['rows']} 行 ({entry['fetch_seconds']:.1f}s)"
+    else:
+        line += f" - {entry['error']}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="将 AKShare 宏观数据目录批量导出为按地区/数据集分区的 Parquet 数据集")
+    parser.add_argument("--out", default="export", help="输出目录")
+    parser.add_argument("--region", action="append", help="仅导出指定国家/地区 (可重复)")
+    parser.add_argument("--dataset", action="append", help="仅导出指定数据集 (可重复)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=1.0)
+    parser.add_argument("--no-resume", action="store_true", help="忽略已有 manifest，重新导出全部数据集")
+    args = parser.parse_args(argv)
+
+    manifest = export(
+        args.out, regions=args.region, datasets=args.dataset, workers=args.workers,
+        resume=not args.no_resume, retries=args.retries, backoff=args.backoff,
+        progress=print_progress
+    )
+    failed = [e for e in manifest.entries.values() if e["status"] != "ok"]
+    print(f"完成: {len(manifest.entries) - len(failed)} 个数据集已导出, {len(failed)} 个失败 (见 {manifest.path})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+from macro_cache import DatasetCache, cache_key, dataset_ttl
+from macro_metadata import METADATA_FILE, MetadataIndex
+from macro_metrics import METRICS
+from macro_registry import AKSHARE_MACRO_MAP, dataset_host, resolve_func
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+def is_host_failure(exc):
+    # only an unreachable, timing-out or failing host trips its breaker; bad
+    # parameters or unparseable answers are the request's own fault.
+    # requests and urllib errors are OSError subclasses; their JSON errors are also ValueError
+    if not isinstance(exc, OSError) or isinstance(exc, ValueError):
+        return False
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) if response is not None else getattr(exc, "code", None)
+    return not isinstance(status, int) or status >= 500 or status == 429
+
+
+# --- Upstream Timeouts ---
+# akshare calls requests without a timeout, so a stalled host would pin the
+# calling thread forever. Requests sent while `upstream_timeout` is active get
+# that connect/read timeout unless akshare passed one itself.
+UPSTREAM_TIMEOUT = float(os.environ.get("MACRO_UPSTREAM_TIMEOUT", 30))
+_request_timeout = threading.local()
+
+
+def _install_request_timeout():
+    try:
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return
+    send = HTTPAdapter.send
+    if getattr(send, "_macro_timeout", False):
+        return
+
+    @functools.wraps(send)
+    def send_with_timeout(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = getattr(_request_timeout, "seconds", None)
+        return send(self, request, timeout=timeout, **kwargs)
+
+    send_with_timeout._macro_timeout = True
+    HTTPAdapter.send = send_with_timeout
+
+
+@contextmanager
+def upstream_timeout(seconds):
+    _install_request_timeout()
+    previous = getattr(_request_timeout, "seconds", None)
+    _request_timeout.seconds = seconds
+    try:
+        yield
+    finally:
+        _request_timeout.seconds = previous
+
+
+# --- Request Coalescing ---
+# Concurrent callers asking for the same key share one in-flight call.
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+# --- Circuit Breaking ---
+# After `failure_threshold` consecutive failures a host is skipped for
+# `reset_timeout` seconds, then a single trial call decides whether it recovers.
+class CircuitBreaker:
+    def __init__(self, failure_threshold=3, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self._trial = set()
+
+    def state(self, host):
+        with self._lock:
+            return self._state(host)
+
+    def _state(self, host):
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return "closed"
+        if self.clock() - opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self, host):
+        with self._lock:
+            state = self._state(host)
+            if state == "closed":
+                return True
+            if state == "half-open" and host not in self._trial:
+                self._trial.add(host)
+                return True
+            return False
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial.discard(host)
+
+    def record_failure(self, host):
+        with self._lock:
+            self._trial.discard(host)
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold or host in self._opened_at:
+                self._opened_at[host] = self.clock()
+
+
+# --- Fetch Layer ---
+class DataFetcher:
+    def __init__(self, cache=None, breaker=None, registry=AKSHARE_MACRO_MAP, resolver=resolve_func, metadata=None,
+                 timeout=UPSTREAM_TIMEOUT):
+        self.cache = cache or DatasetCache()
+        self.breaker = breaker or CircuitBreaker()
+        self.registry = registry
+        self.metadata = metadata or MetadataIndex(os.path.join(self.cache.root, METADATA_FILE), registry)
+        self.resolver = resolver
+        self.timeout = timeout
+        self.flights = SingleFlight()
+        # describing a frame normalizes it and writes SQLite; keep that off the
+        # single-flight leader so waiting callers get the result right away
+        self._recorder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="macro-metadata")
+
+    def _info(self, region_name, dataset_name):
+        return self.registry[region_name][dataset_name]
+
+    def _call_upstream(self, region_name, dataset_name, kwargs, store):
+        info = self._info(region_name, dataset_name)
+        host = dataset_host(info)
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"数据源 {host} 暂时不可用，已暂停请求")
+        start = time.perf_counter()
+        try:
+            with upstream_timeout(self.timeout), METRICS.time("upstream"):
+                df = self.resolver(info)(**kwargs)
+        except Exception as e:
+            if is_host_failure(e):
+                self.breaker.record_failure(host)
+            else:
+                # the host answered; the request itself was bad
+                self.breaker.record_success(host)
+            raise
+        self.breaker.record_success(host)
+        if store and isinstance(df, pd.DataFrame):
+            self.cache.write(region_name, dataset_name, kwargs, df)
+            self.record_metadata(region_name, dataset_name, df, kwargs, time.perf_counter() - start)
+        return df
+
+    def _record(self, *args):
+        try:
+            self.metadata.record(*args)
+        except Exception:
+            # the index is a convenience; never fail a fetch because of it
+            pass
+
+    def record_metadata(self, region_name, dataset_name, df, kwargs, fetch_seconds=None):
+        return self._recorder.submit(self._record, region_name, dataset_name, df, kwargs, fetch_seconds)
+
+    def load(self, region_name, dataset_name, kwargs=None, store=True):
+        kwargs = kwargs or {}
+        return self.flights.do(
+            cache_key(region_name, dataset_name, kwargs),
+            lambda: self._call_upstream(region_name, dataset_name, kwargs, store)
+        )
+
+    def _refresh(self, region_name, dataset_name, kwargs):
+        try:
+            self.load(region_name, dataset_name, kwargs)
+        except Exception:
+            # keep serving the stale copy; the next expired read retries
+            pass
+
+    def refresh_in_background(self, region_name, dataset_name, kwargs=None):
+        kwargs = kwargs or {}
+        if self.flights.in_flight(cache_key(region_name, dataset_name, kwargs)):
+            return
+        threading.Thread(target=self._refresh, args=(region_name, dataset_name, kwargs), daemon=True).start()
+
+    def fetch(self, region_name, dataset_name, kwargs=None):
+        kwargs = kwargs or {}
+        info = self._info(region_name, dataset_name)
+        df, fetched_at = self.cache.read(region_name, dataset_name, kwargs)
+        if df is not None:
+            expired = time.time() - fetched_at > dataset_ttl(info, kwargs)
+            if expired and self.breaker.state(dataset_host(info)) != "open":
+                self.refresh_in_background(region_name, dataset_name, kwargs)
+            return df
+        return self.load(region_name, dataset_name, kwargs)
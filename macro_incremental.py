@@ -0,0 +1,213 @@
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from macro_cache import dataset_frequency, dataset_ttl
+from macro_normalize import find_and_format_date_column, parse_dates
+
+# --- Incremental Refresh ---
+# Interfaces with a "window" in the registry keep one stored history per
+# request without its range. Refreshes only request the range after the last
+# stored date, re-reading a short look-back so late revisions are upserted;
+# ranges starting before the stored history are backfilled. Every request is
+# answered with the slice of the history it asked for.
+WINDOW_PARAMS = {
+    "date_range": ("start_date", "end_date"),
+    "nbs_period": ("period",),
+}
+REVISION_LOOKBACK = {
+    "daily": pd.DateOffset(days=7),
+    "weekly": pd.DateOffset(weeks=2),
+    "monthly": pd.DateOffset(months=2),
+    "quarterly": pd.DateOffset(months=6),
+    "yearly": pd.DateOffset(years=1),
+}
+ID_COLUMNS = ["item", "region", "地区", "指标"]
+# the stored history remembers which range it covers, so a range the upstream
+# has no data for is not requested again on every read
+COVERED_FROM = "covered_from"
+COVERED_TO = "covered_to"
+
+
+def history_kwargs(info, kwargs):
+    window = WINDOW_PARAMS.get(info.get("window"), ())
+    base = {k: v for k, v in kwargs.items() if k not in window}
+    base["_history"] = True
+    return base
+
+
+# --- Requested Ranges ---
+def _nbs_period(token):
+    # NBS period codes: "2023" (year), "2023B" (quarter), "202305" (month)
+    if re.fullmatch(r"\d{4}", token):
+        return pd.Period(token, freq="Y")
+    if re.fullmatch(r"\d{4}[A-D]", token):
+        return pd.Period(f"{token[:4]}Q{'ABCD'.index(token[4]) + 1}", freq="Q")
+    if re.fullmatch(r"\d{6}", token):
+        return pd.Period(f"{token[:4]}-{token[4:]}", freq="M")
+    raise ValueError(token)
+
+
+def requested_range(info, kwargs):
+    # {"start", "end", "last"}; None when the range cannot be interpreted locally
+    if info["window"] == "date_range":
+        try:
+            return {
+                "start": pd.to_datetime(kwargs["start_date"], format="%Y%m%d") if kwargs.get("start_date") else None,
+                "end": pd.to_datetime(kwargs["end_date"], format="%Y%m%d") if kwargs.get("end_date") else None,
+                "last": None,
+            }
+        except ValueError:
+            return None
+    period = str(kwargs.get("period", "")).strip().upper()
+    match = re.fullmatch(r"LAST(\d+)", period)
+    if match:
+        return {"start": None, "end": None, "last": int(match.group(1))}
+    first, sep, second = period.partition("-")
+    try:
+        start = _nbs_period(first)
+        end = _nbs_period(second) if second else (None if sep else start)
+    except ValueError:
+        return None
+    return {"start": start.start_time, "end": end.end_time.normalize() if end is not None else None, "last": None}
+
+
+def period_token(ts, freq):
+    if freq == "yearly":
+        return f"{ts.year}"
+    if freq == "quarterly":
+        return f"{ts.year}{'ABCD'[(ts.month - 1) // 3]}"
+    return f"{ts:%Y%m}"
+
+
+def window_kwargs(info, kwargs, last, today):
+    freq = dataset_frequency(info, kwargs)
+    start = pd.Timestamp(last) - REVISION_LOOKBACK.get(freq, REVISION_LOOKBACK["monthly"])
+    if info["window"] == "date_range":
+        return {"start_date": start.strftime("%Y%m%d"), "end_date": today.strftime("%Y%m%d")}
+    # NBS accepts open-ended ranges such as "2023-", "2023B-" and "202305-"
+    return {"period": f"{period_token(start, freq)}-"}
+
+
+def backfill_kwargs(info, kwargs, start, first):
+    if info["window"] == "date_range":
+        return {"start_date": start.strftime("%Y%m%d"), "end_date": first.strftime("%Y%m%d")}
+    freq = dataset_frequency(info, kwargs)
+    return {"period": f"{period_token(start, freq)}-{period_token(first, freq)}"}
+
+
+# --- History ---
+def _dates(df):
+    _, date_col = find_and_format_date_column(df)
+    return None if date_col is None else parse_dates(df[date_col])
+
+
+def last_date(df):
+    dates = _dates(df)
+    return None if dates is None or dates.isna().all() else dates.max()
+
+
+def first_date(df):
+    dates = _dates(df)
+    return None if dates is None or dates.isna().all() else dates.min()
+
+
+def upsert(history, new):
+    _, date_col = find_and_format_date_column(history)
+    if date_col is None:
+        return new
+    combined = pd.concat([history, new], ignore_index=True)
+    key_cols = [date_col] + [c for c in ID_COLUMNS if c in combined.columns]
+    # rows from the newer fetch win, so revised values replace stored ones
+    keys = combined[key_cols].astype(str)
+    combined = combined[~keys.duplicated(keep="last")]
+    order = parse_dates(combined[date_col])
+    return combined.iloc[order.argsort(kind="stable")].reset_index(drop=True)
+
+
+def covered_range(history, fetched_at):
+    start = history.attrs.get(COVERED_FROM)
+    end = history.attrs.get(COVERED_TO)
+    return (
+        pd.Timestamp(start) if start else first_date(history),
+        pd.Timestamp(end) if end else pd.Timestamp(datetime.fromtimestamp(fetched_at).date()),
+    )
+
+
+def select_range(history, requested):
+    dates = _dates(history)
+    if dates is None:
+        return history
+    if requested["last"]:
+        keep = dates.isin(dates.drop_duplicates().nlargest(requested["last"]))
+    else:
+        keep = dates.notna()
+        if requested["start"] is not None:
+            keep &= dates >= requested["start"]
+        if requested["end"] is not None:
+            keep &= dates <= requested["end"]
+    return history[keep.to_numpy()].reset_index(drop=True)
+
+
+def refresh_incremental(fetcher, region_name, dataset_name, kwargs=None, today=None, force=False):
+    kwargs = kwargs or {}
+    info = fetcher.registry[region_name][dataset_name]
+    if not info.get("window"):
+        return fetcher.fetch(region_name, dataset_name, kwargs)
+    requested = requested_range(info, kwargs)
+    if requested is None:
+        # a range we cannot interpret (e.g. a list of periods) is passed through as is
+        return fetcher.fetch(region_name, dataset_name, kwargs)
+
+    today = pd.Timestamp(today or datetime.today()).normalize()
+    store_kwargs = history_kwargs(info, kwargs)
+    history, fetched_at = fetcher.cache.read(region_name, dataset_name, store_kwargs)
+    start = time.perf_counter()
+    if history is None:
+        merged = fetcher.load(region_name, dataset_name, kwargs, store=False)
+        if not isinstance(merged, pd.DataFrame):
+            return merged
+        covered_from = requested["start"] or first_date(merged)
+        covered_to = min(requested["end"] or today, today)
+    else:
+        merged = history
+        covered_from, covered_to = covered_range(history, fetched_at)
+        changed = False
+        first = first_date(history)
+        if requested["start"] is not None and first is not None and requested["start"] < covered_from:
+            # the stored history starts later than the requested range: fetch the gap
+            try:
+                old = fetcher.load(region_name, dataset_name, {**kwargs, **backfill_kwargs(info, kwargs, requested["start"], first)}, store=False)
+            except Exception:
+                # upstream trouble: serve what is stored, covered_from stays so the gap is retried
+                old = None
+            if isinstance(old, pd.DataFrame):
+                merged = upsert(old, merged) if not old.empty else merged
+                covered_from, changed = requested["start"], True
+        wanted_to = min(requested["end"] or today, today)
+        expired = time.time() - fetched_at > dataset_ttl(info, kwargs)
+        if force or expired or wanted_to > covered_to:
+            last = last_date(merged)
+            try:
+                if last is None:
+                    new = fetcher.load(region_name, dataset_name, kwargs, store=False)
+                else:
+                    new = fetcher.load(region_name, dataset_name, {**kwargs, **window_kwargs(info, kwargs, last, today)}, store=False)
+            except Exception:
+                # upstream trouble: keep serving the stored history
+                new = None
+            if isinstance(new, pd.DataFrame):
+                merged = upsert(merged, new) if not new.empty else merged
+                covered_to, changed = today, True
+        if not changed:
+            return select_range(history, requested)
+
+    # loaded frames may be shared with other single-flight callers
+    merged = merged.copy(deep=False)
+    merged.attrs[COVERED_FROM] = covered_from.isoformat() if covered_from is not None else None
+    merged.attrs[COVERED_TO] = covered_to.isoformat()
+    fetcher.cache.write(region_name, dataset_name, store_kwargs, merged)
+    fetcher.record_metadata(region_name, dataset_name, merged, store_kwargs, time.perf_counter() - start)
+    return select_range(merged, requested)
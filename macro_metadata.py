@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from macro_cache import cache_key, dataset_frequency
+from macro_normalize import normalize
+from macro_registry import AKSHARE_MACRO_MAP
+from macro_transforms import infer_frequency
+
+# --- Dataset Metadata Index ---
+# A local SQLite file next to the cache. `datasets` holds one row per registry
+# entry; `fetches` holds one row per cached request, keyed like the cache
+# file, with schema, date range, row count and latency filled in whenever a
+# fetch is written. An FTS5 trigram table gives substring search over names,
+# descriptions and the column names of the latest fetch.
+METADATA_FILE = "metadata.sqlite"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    region TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    func TEXT,
+    desc TEXT,
+    url TEXT,
+    freq TEXT,
+    PRIMARY KEY (region, dataset)
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    key TEXT PRIMARY KEY,
+    region TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    kwargs TEXT,
+    freq TEXT,
+    columns TEXT,
+    date_col TEXT,
+    first_date TEXT,
+    last_date TEXT,
+    observed_freq TEXT,
+    rows INTEGER,
+    fetched_at REAL,
+    fetch_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS fetches_dataset ON fetches (region, dataset, fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts USING fts5(region, dataset, desc, columns, tokenize='trigram');
+"""
+DATASET_FIELDS = ("region", "dataset", "func", "desc", "url")
+FETCH_FIELDS = (
+    "kwargs", "columns", "date_col", "first_date", "last_date", "observed_freq", "rows", "fetched_at", "fetch_seconds"
+)
+# trigram search needs at least three characters; shorter queries use LIKE
+FTS_MIN_CHARS = 3
+
+
+def describe(df, layout_key, info, kwargs=None):
+    formatted, date_col, _ = normalize(df, layout_key=layout_key)
+    entry = {
+        "kwargs": json.dumps(kwargs or {}, ensure_ascii=False, sort_keys=True),
+        "columns": json.dumps([str(c) for c in df.columns], ensure_ascii=False),
+        "date_col": None if date_col is None else str(date_col),
+        "first_date": None,
+        "last_date": None,
+        "observed_freq": None,
+        "rows": len(df),
+        "freq": dataset_frequency(info, kwargs),
+    }
+    if date_col is not None:
+        dates = pd.DatetimeIndex(formatted[date_col].dropna()).sort_values().unique()
+        if len(dates):
+            entry.update(
+                first_date=dates[0].date().isoformat(),
+                last_date=dates[-1].date().isoformat(),
+                observed_freq=infer_frequency(dates),
+            )
+    return entry
+
+
+class MetadataIndex:
+    def __init__(self, path, registry=AKSHARE_MACRO_MAP):
+        self.path = path
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._ready = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(SCHEMA)
+                    self._sync_registry(conn)
+                    self._ready = True
+        return conn
+
+    def _sync_registry(self, conn):
+        rows = [
+            (region_name, dataset_name, info["func"], info["desc"], info.get("url"), info.get("freq"))
+            for region_name, datasets in self.registry.items()
+            for dataset_name, info in datasets.items()
+        ]
+        with conn:
+            conn.executemany(
+                "INSERT INTO datasets (region, dataset, func, desc, url, freq) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (region, dataset) DO UPDATE SET "
+                "func = excluded.func, desc = excluded.desc, url = excluded.url, freq = excluded.freq",
+                rows
+            )
+            names = [f"{r[0]}/{r[1]}" for r in rows]
+            placeholders = ",".join("?" * len(rows))
+            for table in ("datasets", "fetches"):
+                conn.execute(f"DELETE FROM {table} WHERE region || '/' || dataset NOT IN ({placeholders})", names)
+            self._reindex(conn)
+
+    @staticmethod
+    def _reindex(conn, region_name=None, dataset_name=None):
+        where, args = ("WHERE region = ? AND dataset = ?", (region_name, dataset_name)) if region_name else ("", ())
+        conn.execute(f"DELETE FROM datasets_fts {where}", args)
+        conn.execute(
+            f"INSERT INTO datasets_fts (region, dataset, desc, columns) "
+            f"SELECT region, dataset, desc, coalesce(("
+            f"SELECT columns FROM fetches f WHERE f.region = d.region AND f.dataset = d.dataset "
+            f"ORDER BY fetched_at DESC LIMIT 1), '') FROM datasets d {where}",
+            args
+        )
+
+    def record(self, region_name, dataset_name, df, kwargs=None, fetch_seconds=None, fetched_at=None):
+        info = self.registry[region_name][dataset_name]
+        entry = describe(df, f"{region_name}/{dataset_name}", info, kwargs)
+        entry.update(
+            key=cache_key(region_name, dataset_name, kwargs or {}), region=region_name, dataset=dataset_name,
+            fetched_at=fetched_at or time.time(), fetch_seconds=fetch_seconds,
+        )
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO fetches ({', '.join(entry)}) VALUES ({', '.join(':' + k for k in entry)})",
+                    entry
+                )
+                self._reindex(conn, region_name, dataset_name)
+        finally:
+            conn.close()
+
+    def backfill(self, cache):
+        # index cached datasets written before the index existed (no latency known)
+        conn = self._connect()
+        try:
+            missing = conn.execute(
+                "SELECT region, dataset FROM datasets d "
+                "WHERE NOT EXISTS (SELECT 1 FROM fetches f WHERE f.region = d.region AND f.dataset = d.dataset)"
+            ).fetchall()
+        finally:
+            conn.close()
+        filled = 0
+        for row in missing:
+            info = self.registry[row["region"]][row["dataset"]]
+            if info.get("params"):
+                continue
+            df, fetched_at = cache.read(row["region"], row["dataset"], {}, touch=False)
+            if isinstance(df, pd.DataFrame):
+                self.record(row["region"], row["dataset"], df, fetched_at=fetched_at)
+                filled += 1
+        return filled
+
+    def get(self, region_name, dataset_name, kwargs=None):
+        # kwargs=None: the most recent fetch with any parameters
+        if kwargs is None:
+            match, args = "f.region = d.region AND f.dataset = d.dataset", ()
+        else:
+            match, args = "f.key = ?", (cache_key(region_name, dataset_name, kwargs),)
+        fields = ", ".join([f"d.{name}" for name in DATASET_FIELDS] + [f"f.{name}" for name in FETCH_FIELDS])
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {fields}, coalesce(f.freq, d.freq) AS freq FROM datasets d LEFT JOIN fetches f ON {match} "
+                f"WHERE d.region = ? AND d.dataset = ? ORDER BY f.fetched_at DESC LIMIT 1",
+                (*args, region_name, dataset_name)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["columns"] = json.loads(entry["columns"]) if entry["columns"] else None
+        entry["kwargs"] = json.loads(entry["kwargs"]) if entry["kwargs"] else None
+        return entry
+
+    def search(self, query, limit=20):
+        # -> [(region, dataset)] over names, descriptions and column names
+        query = query.strip()
+        if not query:
+            return []
+        conn = self._connect()
+        try:
+            if len(query) >= FTS_MIN_CHARS:
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = conn.execute(
+                    "SELECT region, dataset FROM datasets_fts WHERE datasets_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (phrase, limit)
+                ).fetchall()
+            else:
+                pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                rows = conn.execute(
+                    "SELECT region, dataset FROM datasets_fts WHERE dataset LIKE ?1 ESCAPE '\\' "
+                    "OR desc LIKE ?1 ESCAPE '\\' OR columns LIKE ?1 ESCAPE '\\' LIMIT ?2",
+                    (pattern, limit)
+                ).fetchall()
+        finally:
+            conn.close()
+        return [(row["region"], row["dataset"]) for row in rows]
@@ -0,0 +1,143 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# --- Stage Metrics ---
+# Process-wide timings of each step between the upstream call and the chart:
+# cache reads, layout detection, date parsing, the NBS item/value pivot,
+# numeric cleaning and figure building. Each process serves its own timings
+# in the Prometheus text format at /metrics: macro_api.py on its API port,
+# the Streamlit app on a small exporter thread (METRICS_PORT).
+METRIC_NAME = "macro_stage_duration_seconds"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_HOST = os.environ.get("MACRO_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("MACRO_METRICS_PORT", 9108))
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_LABELS = {
+    "upstream": "上游接口调用",
+    "cache_read": "磁盘缓存读取",
+    "detect_layout": "版式识别",
+    "parse_dates": "日期解析",
+    "pivot": "统计局长表透视",
+    "normalize": "标准化 (合计)",
+    "numeric": "数值清洗",
+    "transform": "衍生指标",
+    "chart": "图表构建",
+    "serialize": "接口序列化",
+}
+
+
+class StageStats:
+    __slots__ = ("buckets", "count", "total", "max", "last")
+
+    def __init__(self, n_buckets):
+        self.buckets = [0] * n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+
+class StageMetrics:
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.bounds = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(len(self.bounds))
+            index = bisect.bisect_left(self.bounds, seconds)
+            if index < len(self.bounds):
+                stats.buckets[index] += 1
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.last = seconds
+
+    @contextmanager
+    def time(self, stage):
+        # failed steps are timed too: a slow timeout is exactly what we want to see
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                stage: {
+                    "count": s.count, "sum": s.total, "max": s.max, "last": s.last, "buckets": list(s.buckets),
+                }
+                for stage, s in self._stages.items()
+            }
+
+    def totals(self):
+        return {stage: s["sum"] for stage, s in self.snapshot().items()}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def render(self):
+        # buckets are stored per interval; Prometheus expects cumulative counts
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each data processing stage.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, s in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, n in zip(self.bounds, s["buckets"]):
+                cumulative += n
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {s["count"]}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {s["sum"]:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = StageMetrics()
+
+
+# --- Exporter ---
+class MetricsHandler(BaseHTTPRequestHandler):
+    metrics = METRICS
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        # scrapes every few seconds would flood the app log
+        pass
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT, metrics=METRICS):
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="macro-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import warnings
+
+import requests
+import urllib3
+
+from macro_cache import CACHE_DIR
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# --- NBS Catalog ---
+# Indicator trees, indicator names and regions of data.stats.gov.cn, kept in a
+# compact JSON index. Subtrees are fetched the first time they are expanded
+# (or all at once with --build) and searched locally by prefix, substring,
+# pinyin and initials.
+NBS_URL = "https://data.stats.gov.cn/easyquery.htm"
+NBS_KINDS = {
+    "全国数据": {"月度数据": "hgyd", "季度数据": "hgjd", "年度数据": "hgnd"},
+    "地区数据": {"分省月度数据": "fsyd", "分省季度数据": "fsjd", "分省年度数据": "fsnd"},
+}
+ROOT_ID = "zb"
+PATH_SEPARATOR = " > "
+INDEX_VERSION = 1
+
+
+def ignore_nbs_certificate_warning():
+    # the site's certificate chain is incomplete, so requests to it skip
+    # verification (akshare does too). urllib3 names the host in its warning:
+    # only this host is silenced, once per process, since per-call filter
+    # swaps are not thread-safe.
+    warnings.filterwarnings(
+        "ignore", message=r".*data\.stats\.gov\.cn.*", category=urllib3.exceptions.InsecureRequestWarning
+    )
+
+
+ignore_nbs_certificate_warning()
+
+
+def search_keys(name):
+    # -> (full pinyin, initials); empty when pypinyin is not installed
+    if lazy_pinyin is None:
+        return "", ""
+    syllables = lazy_pinyin(name, errors=lambda chars: list(chars.lower()))
+    initials = lazy_pinyin(name, style=Style.FIRST_LETTER, errors=lambda chars: list(chars.lower()))
+    return "".join(syllables).lower(), "".join(initials).lower()
+
+
+def kind_dbcode(kind):
+    for kinds in NBS_KINDS.values():
+        if kind in kinds:
+            return kinds[kind]
+    raise KeyError(f"未知的数据类型: {kind}")
+
+
+class NbsClient:
+    def __init__(self, timeout=15):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _post(self, params):
+        response = self.session.post(NBS_URL, params=params, timeout=self.timeout, verify=False)
+        response.raise_for_status()
+        return response.json()
+
+    def tree(self, dbcode, node_id):
+        nodes = self._post({"m": "getTree", "dbcode": dbcode, "wdcode": "zb", "id": node_id})
+        return [(node["id"], node["name"], not node["isParent"]) for node in nodes]
+
+    def indicators(self, dbcode, node_id):
+        data = self._post({
+            "m": "QueryData", "dbcode": dbcode, "rowcode": "reg" if dbcode.startswith("fs") else "zb",
+            "colcode": "sj", "wds": "[]", "dfwds": json.dumps([{"wdcode": "zb", "valuecode": node_id}]),
+        })
+        nodes = next(w["nodes"] for w in data["returndata"]["wdnodes"] if w["wdcode"] == "zb")
+        return [f"{n['cname']}({n['unit']})" if n.get("unit") else n["cname"] for n in nodes]
+
+    def regions(self, dbcode):
+        data = self._post({"m": "getOtherWds", "dbcode": dbcode, "rowcode": "zb", "colcode": "sj", "wds": "[]"})
+        return [node["name"] for w in data["returndata"] if w["wdcode"] == "reg" for node in w["nodes"]]
+
+
+class NbsCatalog:
+    # nodes[dbcode][id] = [name, parent_id, is_leaf, child_ids or None, pinyin, initials]
+    def __init__(self, path=os.path.join(CACHE_DIR, "nbs_catalog.json"), client=None):
+        self.path = path
+        self.client = client or NbsClient()
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") != INDEX_VERSION:
+                    raise ValueError(index.get("version"))
+            except (OSError, ValueError):
+                index = {"version": INDEX_VERSION, "nodes": {}, "indicators": {}, "regions": {}}
+            if lazy_pinyin is not None and not index.get("pinyin"):
+                # built before pypinyin was installed: its search keys are empty
+                self._fill_search_keys(index)
+            index["pinyin"] = lazy_pinyin is not None
+            self._index = index
+        return self._index
+
+    @staticmethod
+    def _fill_search_keys(index):
+        for nodes in index["nodes"].values():
+            for node in nodes.values():
+                if node[0]:
+                    node[4:6] = search_keys(node[0])
+        for entries in index["indicators"].values():
+            for entry in entries:
+                entry[1:3] = search_keys(entry[0])
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _nodes(self, dbcode):
+        with self._lock:
+            return self._load()["nodes"].setdefault(dbcode, {ROOT_ID: ["", None, False, None, "", ""]})
+
+    # --- Lazy Tree ---
+    def children(self, kind, node_id=ROOT_ID, save=True):
+        # -> [(node_id, name, is_leaf)]; fetches the subtree on first expansion
+        dbcode = kind_dbcode(kind)
+        nodes = self._nodes(dbcode)
+        node = nodes[node_id]
+        if node[3] is None:
+            fetched = self.client.tree(dbcode, node_id)
+            with self._lock:
+                for child_id, name, is_leaf in fetched:
+                    if child_id not in nodes:
+                        nodes[child_id] = [name, node_id, is_leaf, [] if is_leaf else None, *search_keys(name)]
+                node[3] = [child_id for child_id, _, _ in fetched]
+                if save:
+                    self._save()
+        return [(child_id, nodes[child_id][0], nodes[child_id][2]) for child_id in node[3]]
+
+    def node_path(self, kind, node_id):
+        nodes = self._nodes(kind_dbcode(kind))
+        names = []
+        while node_id not in (None, ROOT_ID):
+            names.append(nodes[node_id][0])
+            node_id = nodes[node_id][1]
+        return PATH_SEPARATOR.join(reversed(names))
+
+    def indicators(self, kind, node_id, save=True):
+        dbcode = kind_dbcode(kind)
+        with self._lock:
+            cached = self._load()["indicators"].get(f"{dbcode}:{node_id}")
+        if cached is not None:
+            return [entry[0] for entry in cached]
+        names = self.client.indicators(dbcode, node_id)
+        with self._lock:
+            self._index["indicators"][f"{dbcode}:{node_id}"] = [[name, *search_keys(name)] for name in names]
+            if save:
+                self._save()
+        return names
+
+    def regions(self, kind, save=True):
+        dbcode = kind_dbcode(kind)
+        with self._lock:
+            cached = self._load()["regions"].get(dbcode)
+        if cached is not None:
+            return cached
+        names = self.client.regions(dbcode)
+        with self._lock:
+            self._index["regions"][dbcode] = names
+            if save:
+                self._save()
+        return names
+
+    def build(self, kind, with_indicators=True, progress=None):
+        # eagerly crawls a whole kind so every path and indicator is searchable
+        pending, loaded = [ROOT_ID], 0
+        while pending:
+            node_id = pending.pop()
+            for child_id, name, is_leaf in self.children(kind, node_id, save=False):
+                loaded += 1
+                if not is_leaf:
+                    pending.append(child_id)
+                elif with_indicators:
+                    self.indicators(kind, child_id, save=False)
+                if progress:
+                    progress(kind, loaded, self.node_path(kind, child_id))
+        if kind in NBS_KINDS["地区数据"]:
+            self.regions(kind, save=False)
+        with self._lock:
+            self._save()
+        return loaded
+
+    # --- Search ---
+    def search(self, kind, query, limit=20):
+        # -> [{"path", "node_id", "indicator"}] best first; only indexed entries are searched
+        query = query.strip().lower()
+        if not query:
+            return []
+        fuzzy = re.compile(".*?".join(map(re.escape, query)))
+        dbcode = kind_dbcode(kind)
+        nodes = self._nodes(dbcode)
+        with self._lock:
+            indicators = {
+                key.split(":", 1)[1]: entries
+                for key, entries in self._index["indicators"].items() if key.startswith(f"{dbcode}:")
+            }
+            entries = [(node_id, None, node[0], node[4], node[5]) for node_id, node in nodes.items() if node_id != ROOT_ID]
+            entries += [(node_id, e[0], e[0], e[1], e[2]) for node_id, items in indicators.items() for e in items]
+
+        scored = []
+        for node_id, indicator, name, pinyin, initials in entries:
+            lowered = name.lower()
+            if lowered.startswith(query):
+                score = 0
+            elif initials.startswith(query) or pinyin.startswith(query):
+                score = 1
+            elif query in lowered:
+                score = 2
+            elif query in pinyin or query in initials:
+                score = 3
+            elif fuzzy.search(lowered) or fuzzy.search(initials):
+                score = 4
+            else:
+                continue
+            scored.append((score, len(name), node_id, indicator))
+        scored.sort(key=lambda item: item[:2])
+        return [
+            {"path": self.node_path(kind, node_id), "node_id": node_id, "indicator": indicator}
+            for _, _, node_id, indicator in scored[:limit]
+        ]
+
+
+def print_progress(kind, loaded, path):
+    print(f"{kind} [{loaded}] {path}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="预先下载国家统计局指标目录，供应用内离线搜索")
+    parser.add_argument("--kind", action="append", help="仅构建指定数据类型 (可重复)，如 月度数据、分省年度数据")
+    parser.add_argument("--no-indicators", action="store_true", help="只下载目录树，不下载各目录下的指标名")
+    args = parser.parse_args(argv)
+
+    catalog = NbsCatalog()
+    kinds = args.kind or [kind for kinds in NBS_KINDS.values() for kind in kinds]
+    for kind in kinds:
+        loaded = catalog.build(kind, with_indicators=not args.no_indicators, progress=print_progress)
+        print(f"{kind}: {loaded} 个目录节点", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
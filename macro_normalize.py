@@ -0,0 +1,256 @@
+import json
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from macro_cache import CACHE_DIR
+from macro_metrics import METRICS
+
+DATE_COLUMN_NAMES = ['date', '日期', '年份', '月份', '季度', '时间', '统计时间', '数据日期', 'trade_date']
+NULL_TOKENS = ["", "-", "--", "—", "nan", "NaN", "None", "<NA>", "NaT"]
+SAMPLE_ROWS = 200
+
+
+# --- Date Parsing ---
+# Each AKShare date layout gets an explicit vectorized parser; the format is
+# detected once on a sample and then applied to the whole column.
+def _from_parts(year, month):
+    code = (pd.to_numeric(year) * 100 + pd.to_numeric(month)).astype("Int64").astype("string")
+    return pd.to_datetime(code, format="%Y%m", errors="coerce")
+
+
+def _parse_cn_month(s):
+    parts = s.str.extract(r"^(\d{4})年(\d{1,2})月份?$")
+    return _from_parts(parts[0], parts[1])
+
+
+def _parse_cn_quarter(s):
+    # cumulative ranges such as "2023年第1-3季度" are dated by their last quarter
+    parts = s.str.extract(r"^(\d{4})年第(\d)(?:-(\d))?季度$")
+    quarter = pd.to_numeric(parts[2].fillna(parts[1]))
+    return _from_parts(parts[0], (quarter - 1) * 3 + 1)
+
+
+def _parse_quarter(s):
+    parts = s.str.upper().str.extract(r"^(\d{4})[-\s]?Q([1-4])$")
+    return _from_parts(parts[0], (pd.to_numeric(parts[1]) - 1) * 3 + 1)
+
+
+def _parse_nbs_quarter(s):
+    parts = s.str.extract(r"^(\d{4})([A-D])$")
+    quarter = parts[1].map({"A": 1, "B": 2, "C": 3, "D": 4})
+    return _from_parts(parts[0], (quarter - 1) * 3 + 1)
+
+
+def _parse_year(s):
+    return _from_parts(s.str.extract(r"^(\d{4})年?$")[0], 1)
+
+
+def _strptime(fmt):
+    return lambda s: pd.to_datetime(s, format=fmt, errors="coerce")
+
+
+DATE_FORMATS = {
+    "%Y-%m-%d": (r"\d{4}-\d{2}-\d{2}", _strptime("%Y-%m-%d")),
+    "iso8601": (r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?", _strptime("ISO8601")),
+    "%Y/%m/%d": (r"\d{4}/\d{1,2}/\d{1,2}", _strptime("%Y/%m/%d")),
+    "%Y年%m月%d日": (r"\d{4}年\d{1,2}月\d{1,2}日", _strptime("%Y年%m月%d日")),
+    "%Y%m%d": (r"\d{8}", _strptime("%Y%m%d")),
+    "%Y-%m": (r"\d{4}-\d{1,2}", _strptime("%Y-%m")),
+    "%Y%m": (r"\d{6}", _strptime("%Y%m")),
+    "cn_month": (r"\d{4}年\d{1,2}月份?", _parse_cn_month),
+    "cn_quarter": (r"\d{4}年第\d(-\d)?季度", _parse_cn_quarter),
+    "quarter": (r"\d{4}[-\s]?[Qq][1-4]", _parse_quarter),
+    "nbs_quarter": (r"\d{4}[A-D]", _parse_nbs_quarter),
+    "year": (r"\d{4}年?", _parse_year),
+}
+
+
+def _as_text(series):
+    if is_numeric_dtype(series):
+        # integer-like years/months such as 2023 or 202301 stored as numbers
+        values = series.dropna()
+        if len(values) and (values % 1 == 0).all():
+            series = series.astype("Int64")
+    return series.astype("string").str.strip()
+
+
+def detect_date_format(series):
+    if is_datetime64_any_dtype(series):
+        return "datetime"
+    sample = _as_text(series.dropna().head(SAMPLE_ROWS))
+    if sample.empty:
+        return None
+    best, best_share = None, 0.5
+    for name, (pattern, _) in DATE_FORMATS.items():
+        share = sample.str.fullmatch(pattern).mean()
+        if share > best_share:
+            best, best_share = name, share
+    return best or "infer"
+
+
+def parse_dates(series, date_format=None):
+    date_format = date_format or detect_date_format(series)
+    if date_format == "datetime":
+        return series
+    # long tables repeat each period once per item or region: parse the
+    # distinct values and map them back
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques)
+    if date_format in DATE_FORMATS:
+        # strptime formats parse raw strings directly; regex parsers need clean text
+        strptime = date_format.startswith("%") or date_format == "iso8601"
+        text = uniques if strptime and not is_numeric_dtype(uniques) else _as_text(uniques)
+        parsed = DATE_FORMATS[date_format][1](text)
+    else:
+        parsed = pd.to_datetime(uniques, errors="coerce")
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=series.index, name=series.name)
+
+
+# --- Numeric Cleaning ---
+def clean_numeric(series):
+    if is_numeric_dtype(series):
+        return series
+    try:
+        # fast path: plain numeric text needs no cleaning
+        return pd.to_numeric(series).astype("float64")
+    except (ValueError, TypeError):
+        pass
+    text = series.astype("string").str.strip()
+    text = text.str.replace(",", "", regex=False).str.replace("%", "", regex=False)
+    text = text.mask(text.isin(NULL_TOKENS))
+    return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def _is_numeric_column(series):
+    sample = series.dropna().head(SAMPLE_ROWS)
+    if sample.empty:
+        return False
+    return clean_numeric(sample).notna().mean() >= 0.5
+
+
+# --- Layout Detection ---
+def _is_item_value(df):
+    return {'item', 'value', 'date'} <= set(df.columns)
+
+
+def _detect_columns(df):
+    date_col, date_format = None, None
+    for col in df.columns:
+        if not any(name in str(col).lower() for name in DATE_COLUMN_NAMES):
+            continue
+        fmt = detect_date_format(df[col])
+        if fmt and parse_dates(df[col].dropna().head(SAMPLE_ROWS), fmt).notna().mean() >= 0.5:
+            date_col, date_format = col, fmt
+            break
+    numeric_cols = [c for c in df.columns if c != date_col and _is_numeric_column(df[c])]
+    return {
+        "columns": [str(c) for c in df.columns], "pivot": False, "date_col": date_col,
+        "date_format": date_format, "numeric_cols": numeric_cols,
+    }
+
+
+@METRICS.timed("detect_layout")
+def detect_layout(df):
+    if _is_item_value(df):
+        return {
+            "columns": [str(c) for c in df.columns], "pivot": True, "date_col": "date",
+            "date_format": detect_date_format(df['date']), "numeric_cols": None,
+        }
+    return _detect_columns(df)
+
+
+class LayoutCache:
+    def __init__(self, path=os.path.join(CACHE_DIR, "layouts.json")):
+        self.path = path
+        self._lock = threading.Lock()
+        self._layouts = None
+
+    def _load(self):
+        if self._layouts is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._layouts = json.load(f)
+            except (OSError, ValueError):
+                self._layouts = {}
+        return self._layouts
+
+    def get(self, key, columns):
+        with self._lock:
+            layout = self._load().get(key)
+        # a changed upstream schema invalidates the stored layout
+        if layout is None or layout["columns"] != [str(c) for c in columns]:
+            return None
+        return layout
+
+    def put(self, key, layout):
+        with self._lock:
+            self._load()[key] = layout
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._layouts, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+LAYOUTS = LayoutCache()
+
+
+def get_layout(df, layout_key=None):
+    layout = LAYOUTS.get(layout_key, df.columns) if layout_key else None
+    if layout is None:
+        layout = detect_layout(df)
+        if layout_key:
+            LAYOUTS.put(layout_key, layout)
+    return layout
+
+
+# --- Normalization ---
+def apply_layout(df, layout):
+    date_col = layout["date_col"]
+    if layout["pivot"]:
+        with METRICS.time("parse_dates"):
+            dates = parse_dates(df['date'], layout["date_format"])
+        with METRICS.time("numeric"):
+            values = clean_numeric(df['value'])
+        # a categorical item column would give categorical result columns
+        long = pd.DataFrame({'date': dates, 'item': df['item'].to_numpy(), 'value': values})
+        try:
+            with METRICS.time("pivot"):
+                wide = long.pivot(index='date', columns='item', values='value').reset_index()
+        except ValueError:
+            # duplicated (date, item) pairs, e.g. several regions: treat as a flat table
+            return apply_layout(df, _detect_columns(df))
+        wide.columns.name = None
+        return wide, 'date', [c for c in wide.columns if c != 'date']
+    if date_col is None:
+        return df.copy(), None, []
+    with METRICS.time("parse_dates"):
+        parsed = parse_dates(df[date_col], layout["date_format"])
+    # shallow copy: only the parsed date column is replaced
+    out = df.copy(deep=False)
+    out[date_col] = parsed
+    mask = parsed.notna()
+    if not mask.all():
+        out = out[mask]
+    return out, date_col, list(layout["numeric_cols"])
+
+
+@METRICS.timed("normalize")
+def normalize(df, layout_key=None):
+    return apply_layout(df, get_layout(df, layout_key))
+
+
+@METRICS.timed("numeric")
+def numeric_frame(formatted, date_col, columns):
+    data = {date_col: formatted[date_col]}
+    for col in columns:
+        data[col] = clean_numeric(formatted[col])
+    return pd.DataFrame(data)
+
+
+def find_and_format_date_column(df, layout_key=None):
+    formatted, date_col, _ = normalize(df, layout_key)
+    return formatted, date_col
@@ -0,0 +1,286 @@
+import importlib
+from urllib.parse import urlparse
+
+# --- Dataset Registry ---
+# Declarative metadata only: "func" names an akshare function that is resolved
+# on first fetch, so listing datasets never imports akshare. "window" marks
+# interfaces that accept a date/period range for incremental refresh.
+AKSHARE_MACRO_MAP = {
+    "中国宏观": {
+        "中国宏观杠杆率": {"func": "macro_cnbs", "desc": "中国国家金融与发展实验室-中国宏观杠杆率数据", "url": "http://114.115.232.154:8080/", "freq": "quarterly"},
+        "企业商品价格指数": {"func": "macro_china_qyspjg", "desc": "东方财富-经济数据一览-中国-企业商品价格指数", "url": "http://data.eastmoney.com/cjsj/qyspjg.html", "freq": "monthly"},
+        "外商直接投资数据": {"func": "macro_china_fdi", "desc": "东方财富-经济数据一览-中国-外商直接投资数据", "url": "https://data.eastmoney.com/cjsj/fdi.html", "freq": "monthly"},
+        "LPR品种数据": {"func": "macro_china_lpr", "desc": "中国 LPR 品种数据", "url": "https://data.eastmoney.com/cjsj/globalRateLPR.html", "freq": "monthly"},
+        "城镇调查失业率": {"func": "macro_china_urban_unemployment", "desc": "国家统计局-月度数据-城镇调查失业率", "url": "https://data.stats.gov.cn/easyquery.htm?cn=A01&zb=A0203&sj=202304", "freq": "monthly"},
+        "社会融资规模增量统计": {"func": "macro_china_shrzgm", "desc": "商务数据中心-国内贸易-社会融资规模增量统计", "url": "http://data.mofcom.gov.cn/gnmy/shrzgm.shtml", "freq": "monthly"},
+        "中国 GDP 年率": {"func": "macro_china_gdp_yearly", "desc": "金十数据中心-中国 GDP 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_gdp_yoy", "freq": "quarterly"},
+        "中国 CPI 年率报告": {"func": "macro_china_cpi_yearly", "desc": "中国年度 CPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_cpi_yoy", "freq": "monthly"},
+        "中国 CPI 月率报告": {"func": "macro_china_cpi_monthly", "desc": "中国月度 CPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_cpi_mom", "freq": "monthly"},
+        "中国 PPI 年率报告": {"func": "macro_china_ppi_yearly", "desc": "中国年度 PPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_ppi_yoy", "freq": "monthly"},
+        "以美元计算出口年率": {"func": "macro_china_exports_yoy", "desc": "中国以美元计算出口年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_exports_yoy", "freq": "monthly"},
+        "以美元计算进口年率": {"func": "macro_china_imports_yoy", "desc": "中国以美元计算进口年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_imports_yoy", "freq": "monthly"},
+        "以美元计算贸易帐": {"func": "macro_china_trade_balance", "desc": "中国以美元计算贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_trade_balance", "freq": "monthly"},
+        "工业增加值增长": {"func": "macro_china_gyzjz", "desc": "东方财富-中国工业增加值增长", "url": "https://data.eastmoney.com/cjsj/gyzjz.html", "freq": "monthly"},
+        "规模以上工业增加值年率": {"func": "macro_china_industrial_production_yoy", "desc": "中国规模以上工业增加值年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_industrial_production_yoy", "freq": "monthly"},
+        "官方制造业 PMI": {"func": "macro_china_pmi_yearly", "desc": "中国年度PMI数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_manufacturing_pmi", "freq": "monthly"},
+        "财新制造业PMI终值": {"func": "macro_china_cx_pmi_yearly", "desc": "中国年度财新 PMI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_caixin_manufacturing_pmi", "freq": "monthly"},
+        "财新服务业PMI": {"func": "macro_china_cx_services_pmi_yearly", "desc": "中国财新服务业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_caixin_services_pmi", "freq": "monthly"},
+        "中国官方非制造业PMI": {"func": "macro_china_non_man_pmi", "desc": "中国官方非制造业 PMI", "url": "https://datacenter.jin10.com/reportType/dc_chinese_non_manufacturing_pmi", "freq": "monthly"},
+        "外汇储备": {"func": "macro_china_fx_reserves_yearly", "desc": "中国年度外汇储备数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_fx_reserves", "freq": "monthly"},
+        "M2货币供应年率": {"func": "macro_china_m2_yearly", "desc": "中国年度 M2 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_m2_money_supply_yoy", "freq": "monthly"},
+        "新房价指数": {"func": "macro_china_new_house_price", "desc": "中国新房价指数月度数据", "url": "http://data.eastmoney.com/cjsj/newhouse.html", "freq": "monthly", "params": ["city_first", "city_second"]},
+        "企业景气及企业家信心指数": {"func": "macro_china_enterprise_boom_index", "desc": "中国企业景气及企业家信心指数数据", "url": "http://data.eastmoney.com/cjsj/qyjqzs.html", "freq": "quarterly"},
+        "全国税收收入": {"func": "macro_china_national_tax_receipts", "desc": "中国全国税收收入数据", "url": "http://data.eastmoney.com/cjsj/nationaltaxreceipts.aspx", "freq": "quarterly"},
+        "银行理财产品发行数量": {"func": "macro_china_bank_financing", "desc": "银行理财产品发行数量", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI01516267.html", "freq": "monthly"},
+        "原保险保费收入": {"func": "macro_china_insurance_income", "desc": "原保险保费收入", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMM00088870.html", "freq": "monthly"},
+        "手机出货量": {"func": "macro_china_mobile_number", "desc": "手机出货量", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00225823.html", "freq": "monthly"},
+        "菜篮子产品批发价格指数": {"func": "macro_china_vegetable_basket", "desc": "菜篮子产品批发价格指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00009275.html", "freq": "daily"},
+        "农产品批发价格总指数": {"func": "macro_china_agricultural_product", "desc": "农产品批发价格总指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00009274.html", "freq": "daily"},
+        "农副指数": {"func": "macro_china_agricultural_index", "desc": "农副指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662543.html", "freq": "daily"},
+        "能源指数": {"func": "macro_china_energy_index", "desc": "能源指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662539.html", "freq": "daily"},
+        "大宗商品价格指数": {"func": "macro_china_commodity_price_index", "desc": "大宗商品价格数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662535.html", "freq": "daily"},
+        "费城半导体指数": {"func": "macro_global_sox_index", "desc": "费城半导体指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00055562.html", "freq": "daily"},
+        "义乌小商品指数-电子元器件": {"func": "macro_china_yw_electronic_index", "desc": "义乌小商品指数-电子元器件数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00055551.html", "freq": "weekly"},
+        "建材指数": {"func": "macro_china_construction_index", "desc": "建材指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662541.html", "freq": "daily"},
+        "建材价格指数": {"func": "macro_china_construction_price_index", "desc": "建材价格指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00237146.html", "freq": "daily"},
+        "物流景气指数": {"func": "macro_china_lpi_index", "desc": "物流景气指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00352262.html", "freq": "monthly"},
+        "原油运输指数": {"func": "macro_china_bdti_index", "desc": "原油运输指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107668.html", "freq": "daily"},
+        "超灵便型船运价指数": {"func": "macro_china_bsi_index", "desc": "超灵便型船运价指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107667.html", "freq": "daily"},
+        "海岬型运费指数": {"func": "macro_shipping_bci", "desc": "海岬型运费指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107666.html", "freq": "daily"},
+        "波罗的海干散货指数": {"func": "macro_shipping_bdi", "desc": "波罗的海干散货指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107664.html", "freq": "daily"},
+        "巴拿马型运费指数": {"func": "macro_shipping_bpi", "desc": "巴拿马型运费指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107665.html", "freq": "daily"},
+        "成品油运输指数": {"func": "macro_shipping_bcti", "desc": "成品油运输指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107669.html", "freq": "daily"},
+        "新增信贷数据": {"func": "macro_china_new_financial_credit", "desc": "中国新增信贷数据数据", "url": "http://data.eastmoney.com/cjsj/xzxd.html", "freq": "monthly"},
+        "居民消费价格指数": {"func": "macro_china_cpi", "desc": "中国居民消费价格指数", "url": "http://data.eastmoney.com/cjsj/cpi.html", "freq": "monthly"},
+        "国内生产总值": {"func": "macro_china_gdp", "desc": "中国国内生产总值", "url": "http://data.eastmoney.com/cjsj/gdp.html", "freq": "quarterly"},
+        "工业品出厂价格指数": {"func": "macro_china_ppi", "desc": "工业品出厂价格指数", "url": "http://data.eastmoney.com/cjsj/ppi.html", "freq": "monthly"},
+        "采购经理人指数": {"func": "macro_china_pmi", "desc": "采购经理人指数", "url": "http://data.eastmoney.com/cjsj/pmi.html", "freq": "monthly"},
+        "中国城镇固定资产投资": {"func": "macro_china_gdzctz", "desc": "中国城镇固定资产投资", "url": "http://data.eastmoney.com/cjsj/gdzctz.html", "freq": "monthly"},
+        "海关进出口增减情况": {"func": "macro_china_hgjck", "desc": "中国海关进出口增减情况一览表", "url": "https://data.eastmoney.com/cjsj/hgjck.html", "freq": "monthly"},
+        "财政收入": {"func": "macro_china_czsr", "desc": "中国财政收入", "url": "http://data.eastmoney.com/cjsj/czsr.html", "freq": "monthly"},
+        "外汇贷款数据": {"func": "macro_china_whxd", "desc": "外汇贷款数据", "url": "http://data.eastmoney.com/cjsj/whxd.html", "freq": "monthly"},
+        "本外币存款": {"func": "macro_china_wbck", "desc": "本外币存款", "url": "http://data.eastmoney.com/cjsj/wbck.html", "freq": "monthly"},
+        "新债发行": {"func": "macro_china_bond_public", "desc": "中国外汇交易中心暨全国银行间同业拆借中心-债券信息披露-新债发行", "url": "https://www.chinamoney.com.cn/chinese/xzjfx/", "freq": "daily"},
+        "消费者信心指数": {"func": "macro_china_xfzxx", "desc": "东方财富网-消费者信心指数", "url": "https://data.eastmoney.com/cjsj/xfzxx.html", "freq": "monthly"},
+        "存款准备金率": {"func": "macro_china_reserve_requirement_ratio", "desc": "国家统计局-存款准备金率", "url": "https://data.eastmoney.com/cjsj/ckzbj.html", "freq": "monthly"},
+        "社会消费品零售总额": {"func": "macro_china_consumer_goods_retail", "desc": "东方财富-经济数据-社会消费品零售总额", "url": "http://data.eastmoney.com/cjsj/xfp.html", "freq": "monthly"},
+        "全社会用电分类情况表": {"func": "macro_china_society_electricity", "desc": "国家统计局-全社会用电分类情况表", "url": "http://finance.sina.com.cn/mac/#industry-6-0-31-1", "freq": "monthly"},
+        "全社会客货运输量": {"func": "macro_china_society_traffic_volume", "desc": "国家统计局-全社会客货运输量-非累计", "url": "http://finance.sina.com.cn/mac/#industry-10-0-31-1", "freq": "monthly"},
+        "邮电业务基本情况": {"func": "macro_china_postal_telecommunicational", "desc": "国家统计局-邮电业务基本情况-非累计", "url": "http://finance.sina.com.cn/mac/#industry-11-0-31-1", "freq": "monthly"},
+        "国际旅游外汇收入构成": {"func": "macro_china_international_tourism_fx", "desc": "国家统计局-国际旅游外汇收入构成", "url": "http://finance.sina.com.cn/mac/#industry-15-0-31-3", "freq": "yearly"},
+        "民航客座率及载运率": {"func": "macro_china_passenger_load_factor", "desc": "国家统计局-民航客座率及载运率", "url": "http://finance.sina.com.cn/mac/#industry-20-0-31-1", "freq": "monthly"},
+        "航贸运价指数": {"func": "macro_china_freight_index", "desc": "新浪财经-中国宏观经济数据-航贸运价指数", "url": "http://finance.sina.com.cn/mac/#industry-22-0-31-2", "freq": "weekly"},
+        "央行货币当局资产负债": {"func": "macro_china_central_bank_balance", "desc": "新浪财经-中国宏观经济数据-央行货币当局资产负债", "url": "http://finance.sina.com.cn/mac/#fininfo-8-0-31-2", "freq": "monthly"},
+        "保险业经营情况": {"func": "macro_china_insurance", "desc": "新浪财经-中国宏观经济数据-保险业经营情况", "url": "http://finance.sina.com.cn/mac/#fininfo-19-0-31-3", "freq": "monthly"},
+        "货币供应量": {"func": "macro_china_supply_of_money", "desc": "新浪财经-中国宏观经济数据-货币供应量", "url": "http://finance.sina.com.cn/mac/#fininfo-1-0-31-1", "freq": "monthly"},
+        "FR007利率互换曲线历史数据": {"func": "macro_china_swap_rate", "desc": "国家统计局-FR007利率互换曲线历史数据 (近一年)", "url": "https://www.chinamoney.com.cn/chinese/bkcurvfxhis/?cfgItemType=72&curveType=FR007", "freq": "daily", "params": ["start_date", "end_date"], "window": "date_range"},
+        "央行黄金和外汇储备": {"func": "macro_china_foreign_exchange_gold", "desc": "国家统计局-央行黄金和外汇储备", "url": "http://finance.sina.com.cn/mac/#fininfo-5-0-31-2", "freq": "monthly"},
+        "商品零售价格指数": {"func": "macro_china_retail_price_index", "desc": "国家统计局-商品零售价格指数", "url": "http://finance.sina.com.cn/mac/#price-12-0-31-1", "freq": "monthly"},
+        "国房景气指数": {"func": "macro_china_real_estate", "desc": "国家统计局-国房景气指数", "url": "http://data.eastmoney.com/cjsj/hyzs_list_EMM00121987.html", "freq": "monthly"},
+        "外汇和黄金储备": {"func": "macro_china_fx_gold", "desc": "中国外汇和黄金储备", "url": "http://data.eastmoney.com/cjsj/hjwh.html", "freq": "monthly"},
+        "中国货币供应量": {"func": "macro_china_money_supply", "desc": "东方财富-经济数据-中国宏观-中国货币供应量", "url": "http://data.eastmoney.com/cjsj/hbgyl.html", "freq": "monthly"},
+        "全国股票交易统计表": {"func": "macro_china_stock_market_cap", "desc": "全国股票交易统计表", "url": "http://data.eastmoney.com/cjsj/gpjytj.html", "freq": "monthly"},
+        "上海银行业同业拆借报告": {"func": "macro_china_shibor_all", "desc": "上海银行业同业拆借报告", "url": "https://datacenter.jin10.com/reportType/dc_shibor", "freq": "daily"},
+        "人民币香港银行同业拆息": {"func": "macro_china_hk_market_info", "desc": "香港同业拆借报告", "url": "https://datacenter.jin10.com/reportType/dc_hk_market_info", "freq": "daily"},
+        "中国日度沿海六大电库存(历史)": {"func": "macro_china_daily_energy", "desc": "中国日度沿海六大电库存数据(不再更新)", "url": "https://datacenter.jin10.com/reportType/dc_qihuo_energy_report", "freq": "daily"},
+        "人民币汇率中间价报告(历史)": {"func": "macro_china_rmb", "desc": "中国人民币汇率中间价报告(2017-2021)", "url": "https://datacenter.jin10.com/reportType/dc_rmb_data", "freq": "daily"},
+        "深圳融资融券报告": {"func": "macro_china_market_margin_sz", "desc": "深圳融资融券报告", "url": "https://datacenter.jin10.com/reportType/dc_market_margin_sz", "freq": "daily"},
+        "上海融资融券报告": {"func": "macro_china_market_margin_sh", "desc": "上海融资融券报告", "url": "https://datacenter.jin10.com/reportType/dc_market_margin_sse", "freq": "daily"},
+        "上海黄金交易所报告": {"func": "macro_china_au_report", "desc": "上海黄金交易所报告", "url": "https://datacenter.jin10.com/reportType/dc_sge_report", "freq": "daily"},
+        "股票筹资": {"func": "macro_stock_finance", "desc": "同花顺-数据中心-宏观数据-股票筹资", "url": "https://data.10jqka.com.cn/macro/finance/", "freq": "monthly"},
+        "新增人民币贷款": {"func": "macro_rmb_loan", "desc": "同花顺-数据中心-宏观数据-新增人民币贷款", "url": "https://data.10jqka.com.cn/macro/loan/", "freq": "monthly"},
+        "人民币存款余额": {"func": "macro_rmb_deposit", "desc": "同花顺-数据中心-宏观数据-人民币存款余额", "url": "https://data.10jqka.com.cn/macro/rmb/", "freq": "monthly"},
+    },
+    "国家统计局(通用接口)": {
+        "全国数据": {"func": "macro_china_nbs_nation", "desc": "国家统计局全国数据通用接口。请通过下面的下拉菜单选择数据路径。", "url": "https://data.stats.gov.cn/easyquery.htm", "freq": "monthly", "params": ["ui_nbs_nation"], "window": "nbs_period"},
+        "地区数据": {"func": "macro_china_nbs_region", "desc": "国家统计局地区数据通用接口。请通过下面的下拉菜单选择数据路径。", "url": "https://data.stats.gov.cn/easyquery.htm", "freq": "monthly", "params": ["ui_nbs_region"], "window": "nbs_period"},
+    },
+    "全球宏观": {
+        "宏观日历-华尔街见闻": {"func": "macro_info_ws", "desc": "华尔街见闻-日历-宏观", "url": "https://wallstreetcn.com/calendar", "freq": "event", "params": ["date"]},
+        "全球宏观事件-百度": {"func": "news_economic_baidu", "desc": "全球宏观指标重大事件", "url": "https://gushitong.baidu.com/calendar", "freq": "event", "params": ["date"]},
+    },
+    "重要机构": {
+       "SPDR黄金ETF持仓": {"func": "macro_cons_gold", "desc": "全球最大黄金 ETF—SPDR Gold Trust 持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_etf_gold", "freq": "daily"},
+       "iShares白银ETF持仓": {"func": "macro_cons_silver", "desc": "全球最大白银 ETF--iShares Silver Trust 持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_etf_sliver", "freq": "daily"},
+       "欧佩克月度报告": {"func": "macro_cons_opec_month", "desc": "欧佩克月度原油产量报告", "url": "https://datacenter.jin10.com/reportType/dc_opec_report", "freq": "monthly"},
+       "LME持仓报告": {"func": "macro_euro_lme_holding", "desc": "伦敦金属交易所(LME)-持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_lme_traders_report", "freq": "weekly"},
+       "LME库存报告": {"func": "macro_euro_lme_stock", "desc": "伦敦金属交易所(LME)-库存报告", "url": "https://datacenter.jin10.com/reportType/dc_lme_report", "freq": "daily"},
+       "CFTC外汇类非商业持仓": {"func": "macro_usa_cftc_nc_holding", "desc": "美国商品期货交易委员会CFTC外汇类非商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_nc_report", "freq": "weekly"},
+       "CFTC商品类非商业持仓": {"func": "macro_usa_cftc_c_holding", "desc": "美国商品期货交易委员会CFTC商品类非商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_c_report", "freq": "weekly"},
+       "CFTC外汇类商业持仓": {"func": "macro_usa_cftc_merchant_currency_holding", "desc": "美国商品期货交易委员会CFTC外汇类商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_merchant_currency", "freq": "weekly"},
+       "CFTC商品类商业持仓": {"func": "macro_usa_cftc_merchant_goods_holding", "desc": "美国商品期货交易委员会 CFTC 商品类商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_merchant_goods", "freq": "weekly"},
+       "CME贵金属成交量": {"func": "macro_usa_cme_merchant_goods_holding", "desc": "芝加哥交易所-贵金属成交量数据", "url": "https://datacenter.jin10.com/org", "freq": "daily"},
+    },
+    "美国宏观": {
+        "美国GDP月度报告": {"func": "macro_usa_gdp_monthly", "desc": "美国国内生产总值(GDP)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_gdp", "freq": "quarterly"},
+        "美国CPI月率报告": {"func": "macro_usa_cpi_monthly", "desc": "美国 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_cpi", "freq": "monthly"},
+        "美国CPI年率报告": {"func": "macro_usa_cpi_yoy", "desc": "东方财富-经济数据一览-美国-CPI年率", "url": "https://data.eastmoney.com/cjsj/foreign_0_12.html", "freq": "monthly"},
+        "美国核心CPI月率报告": {"func": "macro_usa_core_cpi_monthly", "desc": "美国核心 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_cpi", "freq": "monthly"},
+        "美国个人支出月率报告": {"func": "macro_usa_personal_spending", "desc": "美国个人支出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_personal_spending", "freq": "monthly"},
+        "美国零售销售月率报告": {"func": "macro_usa_retail_sales", "desc": "美国零售销售月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_retail_sales", "freq": "monthly"},
+        "美国进口物价指数报告": {"func": "macro_usa_import_price", "desc": "美国进口物价指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_import_price", "freq": "monthly"},
+        "美国出口价格指数报告": {"func": "macro_usa_export_price", "desc": "美国出口价格指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_export_price", "freq": "monthly"},
+        "美联储劳动力市场状况指数": {"func": "macro_usa_lmci", "desc": "美联储劳动力市场状况指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_lmci", "freq": "monthly"},
+        "美国失业率报告": {"func": "macro_usa_unemployment_rate", "desc": "美国失业率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_unemployment_rate", "freq": "monthly"},
+        "美国挑战者企业裁员人数报告": {"func": "macro_usa_job_cuts", "desc": "美国挑战者企业裁员人数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_job_cuts", "freq": "monthly"},
+        "美国非农就业人数报告": {"func": "macro_usa_non_farm", "desc": "美国非农就业人数报告", "url": "https://datacenter.jin10.com/reportType/dc_nonfarm_payrolls", "freq": "monthly"},
+        "美国ADP就业人数报告": {"func": "macro_usa_adp_employment", "desc": "美国 ADP 就业人数报告", "url": "https://datacenter.jin10.com/reportType/dc_adp_nonfarm_employment", "freq": "monthly"},
+        "美国核心PCE物价指数年率报告": {"func": "macro_usa_core_pce_price", "desc": "美国核心 PCE 物价指数年率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_pce_price", "freq": "monthly"},
+        "美国实际个人消费支出季率初值报告": {"func": "macro_usa_real_consumer_spending", "desc": "美国实际个人消费支出季率初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_real_consumer_spending", "freq": "quarterly"},
+        "美国贸易帐报告": {"func": "macro_usa_trade_balance", "desc": "美国贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_trade_balance", "freq": "monthly"},
+        "美国经常帐报告": {"func": "macro_usa_current_account", "desc": "美国经常帐报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_current_account", "freq": "quarterly"},
+        "贝克休斯钻井报告": {"func": "macro_usa_rig_count", "desc": "贝克休斯钻井报告", "url": "https://datacenter.jin10.com/reportType/dc_rig_count_summary", "freq": "weekly"},
+        "美国生产者物价指数(PPI)报告": {"func": "macro_usa_ppi", "desc": "美国生产者物价指数(PPI)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ppi", "freq": "monthly"},
+        "美国核心生产者物价指数(PPI)报告": {"func": "macro_usa_core_ppi", "desc": "美国核心生产者物价指数(PPI)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_ppi", "freq": "monthly"},
+        "美国API原油库存报告": {"func": "macro_usa_api_crude_stock", "desc": "美国 API 原油库存报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_api_crude_stock", "freq": "weekly"},
+        "美国Markit制造业PMI初值报告": {"func": "macro_usa_pmi", "desc": "美国 Markit 制造业 PMI 初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_pmi", "freq": "monthly"},
+        "美国ISM制造业PMI报告": {"func": "macro_usa_ism_pmi", "desc": "美国 ISM 制造业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ism_pmi", "freq": "monthly"},
+        "美国工业产出月率报告": {"func": "macro_usa_industrial_production", "desc": "美国工业产出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_industrial_production", "freq": "monthly"},
+        "美国耐用品订单月率报告": {"func": "macro_usa_durable_goods_orders", "desc": "美国耐用品订单月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_durable_goods_orders", "freq": "monthly"},
+        "美国工厂订单月率报告": {"func": "macro_usa_factory_orders", "desc": "美国工厂订单月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_factory_orders", "freq": "monthly"},
+        "美国Markit服务业PMI初值报告": {"func": "macro_usa_services_pmi", "desc": "美国Markit服务业PMI初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_services_pmi", "freq": "monthly"},
+        "美国商业库存月率报告": {"func": "macro_usa_business_inventories", "desc": "美国商业库存月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_business_inventories", "freq": "monthly"},
+        "美国ISM非制造业PMI报告": {"func": "macro_usa_ism_non_pmi", "desc": "美国 ISM 非制造业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ism_non_pmi", "freq": "monthly"},
+        "美国NAHB房产市场指数报告": {"func": "macro_usa_nahb_house_market_index", "desc": "美国 NAHB 房产市场指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_nahb_house_market_index", "freq": "monthly"},
+        "美国新屋开工总数年化报告": {"func": "macro_usa_house_starts", "desc": "美国新屋开工总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_house_starts", "freq": "monthly"},
+        "美国新屋销售总数年化报告": {"func": "macro_usa_new_home_sales", "desc": "美国新屋销售总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_new_home_sales", "freq": "monthly"},
+        "美国营建许可总数报告": {"func": "macro_usa_building_permits", "desc": "美国营建许可总数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_building_permits", "freq": "monthly"},
+        "美国成屋销售总数年化报告": {"func": "macro_usa_exist_home_sales", "desc": "美国成屋销售总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_exist_home_sales", "freq": "monthly"},
+        "美国FHFA房价指数月率报告": {"func": "macro_usa_house_price_index", "desc": "美国 FHFA 房价指数月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_house_price_index", "freq": "monthly"},
+        "美国S&P/CS20座大城市房价指数年率报告": {"func": "macro_usa_spcs20", "desc": "美国S&P/CS20座大城市房价指数年率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_spcs20", "freq": "monthly"},
+        "美国成屋签约销售指数月率报告": {"func": "macro_usa_pending_home_sales", "desc": "美国成屋签约销售指数月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_pending_home_sales", "freq": "monthly"},
+        "美国未决房屋销售月率": {"func": "macro_usa_phs", "desc": "东方财富-经济数据一览-美国-未决房屋销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_0_5.html", "freq": "monthly"},
+        "美国谘商会消费者信心指数报告": {"func": "macro_usa_cb_consumer_confidence", "desc": "美国谘商会消费者信心指数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_cb_consumer_confidence_all.js?v=1578576859", "freq": "monthly"},
+        "美国NFIB小型企业信心指数报告": {"func": "macro_usa_nfib_small_business", "desc": "美国NFIB小型企业信心指数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_nfib_small_business_all.js?v=1578576631", "freq": "monthly"},
+        "美国密歇根大学消费者信心指数初值报告": {"func": "macro_usa_michigan_consumer_sentiment", "desc": "美国密歇根大学消费者信心指数初值报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228", "freq": "monthly"},
+        "美国EIA原油库存报告": {"func": "macro_usa_eia_crude_rate", "desc": "美国EIA原油库存报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228", "freq": "weekly"},
+        "美国初请失业金人数报告": {"func": "macro_usa_initial_jobless", "desc": "美国初请失业金人数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228", "freq": "weekly"},
+        "美国原油产量报告": {"func": "macro_usa_crude_inner", "desc": "美国原油产量报告", "url": "https://datacenter.jin10.com/reportType/dc_eia_crude_oil_produce", "freq": "weekly"},
+    },
+    "欧元区宏观": {
+        "欧元区季度GDP年率报告": {"func": "macro_euro_gdp_yoy", "desc": "欧元区季度 GDP 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_gdp_yoy", "freq": "quarterly"},
+        "欧元区CPI月率报告": {"func": "macro_euro_cpi_mom", "desc": "欧元区 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_cpi_mom", "freq": "monthly"},
+        "欧元区CPI年率报告": {"func": "macro_euro_cpi_yoy", "desc": "欧元区 CPI 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_cpi_yoy", "freq": "monthly"},
+        "欧元区PPI月率报告": {"func": "macro_euro_ppi_mom", "desc": "欧元区 PPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_ppi_mom", "freq": "monthly"},
+        "欧元区零售销售月率报告": {"func": "macro_euro_retail_sales_mom", "desc": "欧元区零售销售月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_retail_sales_mom", "freq": "monthly"},
+        "欧元区季调后就业人数季率报告": {"func": "macro_euro_employment_change_qoq", "desc": "欧元区季调后就业人数季率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_employment_change_qoq", "freq": "quarterly"},
+        "欧元区失业率报告": {"func": "macro_euro_unemployment_rate_mom", "desc": "欧元区失业率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_unemployment_rate_mom", "freq": "monthly"},
+        "欧元区未季调贸易帐报告": {"func": "macro_euro_trade_balance", "desc": "欧元区未季调贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_trade_balance_mom", "freq": "monthly"},
+        "欧元区经常帐报告": {"func": "macro_euro_current_account_mom", "desc": "欧元区经常帐报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_current_account_mom", "freq": "monthly"},
+        "欧元区工业产出月率报告": {"func": "macro_euro_industrial_production_mom", "desc": "欧元区工业产出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_industrial_production_mom", "freq": "monthly"},
+        "欧元区制造业PMI初值报告": {"func": "macro_euro_manufacturing_pmi", "desc": "欧元区制造业 PMI 初值报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_manufacturing_pmi", "freq": "monthly"},
+        "欧元区服务业PMI终值报告": {"func": "macro_euro_services_pmi", "desc": "欧元区服务业 PMI 终值报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_services_pmi", "freq": "monthly"},
+        "欧元区ZEW经济景气指数报告": {"func": "macro_euro_zew_economic_sentiment", "desc": "欧元区 ZEW 经济景气指数报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_zew_economic_sentiment", "freq": "monthly"},
+        "欧元区Sentix投资者信心指数报告": {"func": "macro_euro_sentix_investor_confidence", "desc": "欧元区 Sentix 投资者信心指数报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_sentix_investor_confidence", "freq": "monthly"},
+    },
+    "中国香港宏观": {
+        "消费者物价指数": {"func": "macro_china_hk_cpi", "desc": "东方财富-经济数据一览-中国香港-消费者物价指数", "url": "https://data.eastmoney.com/cjsj/foreign_8_0.html", "freq": "monthly"},
+        "消费者物价指数年率": {"func": "macro_china_hk_cpi_ratio", "desc": "东方财富-经济数据一览-中国香港-消费者物价指数年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_1.html", "freq": "monthly"},
+        "失业率": {"func": "macro_china_hk_rate_of_unemployment", "desc": "东方财富-经济数据一览-中国香港-失业率", "url": "https://data.eastmoney.com/cjsj/foreign_8_2.html", "freq": "monthly"},
+        "香港GDP": {"func": "macro_china_hk_gbp", "desc": "东方财富-经济数据一览-中国香港-香港 GDP", "url": "https://data.eastmoney.com/cjsj/foreign_8_3.html", "freq": "quarterly"},
+        "香港GDP同比": {"func": "macro_china_hk_gbp_ratio", "desc": "东方财富-经济数据一览-中国香港-香港 GDP 同比", "url": "https://data.eastmoney.com/cjsj/foreign_8_4.html", "freq": "quarterly"},
+        "香港楼宇买卖合约数量": {"func": "macro_china_hk_building_volume", "desc": "东方财富-经济数据一览-中国香港-香港楼宇买卖合约数量", "url": "https://data.eastmoney.com/cjsj/foreign_8_5.html", "freq": "monthly"},
+        "香港楼宇买卖合约成交金额": {"func": "macro_china_hk_building_amount", "desc": "东方财富-经济数据一览-中国香港-香港楼宇买卖合约成交金额", "url": "https://data.eastmoney.com/cjsj/foreign_8_6.html", "freq": "monthly"},
+        "香港商品贸易差额年率": {"func": "macro_china_hk_trade_diff_ratio", "desc": "东方财富-经济数据一览-中国香港-香港商品贸易差额年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_7.html", "freq": "monthly"},
+        "香港制造业PPI年率": {"func": "macro_china_hk_ppi", "desc": "东方财富-经济数据一览-中国香港-香港制造业PPI年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_8.html", "freq": "monthly"},
+    },
+    "德国宏观": {
+        "IFO商业景气指数": {"func": "macro_germany_ifo", "desc": "东方财富-数据中心-经济数据一览-IFO商业景气指数", "url": "https://data.eastmoney.com/cjsj/foreign_1_0.html", "freq": "monthly"},
+        "消费者物价指数月率终值": {"func": "macro_germany_cpi_monthly", "desc": "东方财富-数据中心-经济数据一览-德国-消费者物价指数月率终值", "url": "https://data.eastmoney.com/cjsj/foreign_1_1.html", "freq": "monthly"},
+        "消费者物价指数年率终值": {"func": "macro_germany_cpi_yearly", "desc": "东方财富-数据中心-经济数据一览-德国-消费者物价指数年率终值", "url": "https://data.eastmoney.com/cjsj/foreign_1_2.html", "freq": "monthly"},
+        "贸易帐-季调后": {"func": "macro_germany_trade_adjusted", "desc": "东方财富-数据中心-经济数据一览-德国-贸易帐(季调后)", "url": "https://data.eastmoney.com/cjsj/foreign_1_3.html", "freq": "monthly"},
+        "GDP": {"func": "macro_germany_gdp", "desc": "东方财富-数据中心-经济数据一览-德国-GDP", "url": "https://data.eastmoney.com/cjsj/foreign_1_4.html", "freq": "quarterly"},
+        "实际零售销售月率": {"func": "macro_germany_retail_sale_monthly", "desc": "东方财富-数据中心-经济数据一览-德国-实际零售销售月率", "url": "https://data.eastmoney.com/cjsj/foreign_1_5.html", "freq": "monthly"},
+        "实际零售销售年率": {"func": "macro_germany_retail_sale_yearly", "desc": "东方财富-数据中心-经济数据一览-德国-实际零售销售年率", "url": "https://data.eastmoney.com/cjsj/foreign_1_6.html", "freq": "monthly"},
+        "ZEW经济景气指数": {"func": "macro_germany_zew", "desc": "东方财富-数据中心-经济数据一览-德国-ZEW 经济景气指数", "url": "https://data.eastmoney.com/cjsj/foreign_1_7.html", "freq": "monthly"},
+    },
+    "瑞士宏观": {
+        "SVME采购经理人指数": {"func": "macro_swiss_svme", "desc": "东方财富-经济数据-瑞士-SVME采购经理人指数", "url": "http://data.eastmoney.com/cjsj/foreign_2_0.html", "freq": "monthly"},
+        "贸易帐": {"func": "macro_swiss_trade", "desc": "东方财富-经济数据-瑞士-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_2_1.html", "freq": "monthly"},
+        "消费者物价指数年率": {"func": "macro_swiss_cpi_yearly", "desc": "东方财富-经济数据-瑞士-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_2.html", "freq": "monthly"},
+        "GDP季率": {"func": "macro_swiss_gdp_quarterly", "desc": "东方财富-经济数据-瑞士-GDP 季率", "url": "http://data.eastmoney.com/cjsj/foreign_2_3.html", "freq": "quarterly"},
+        "GDP年率": {"func": "macro_swiss_gbd_yearly", "desc": "东方财富-经济数据-瑞士-GDP 年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_4.html", "freq": "quarterly"},
+        "央行公布利率决议": {"func": "macro_swiss_gbd_bank_rate", "desc": "东方财富-经济数据-瑞士-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_2_5.html", "freq": "monthly"},
+    },
+    "日本宏观": {
+        "央行公布利率决议": {"func": "macro_japan_bank_rate", "desc": "东方财富-经济数据-日本-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_3_0.html", "freq": "monthly"},
+        "全国消费者物价指数年率": {"func": "macro_japan_cpi_yearly", "desc": "东方财富-经济数据-日本-全国消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_3_1.html", "freq": "monthly"},
+        "全国核心消费者物价指数年率": {"func": "macro_japan_core_cpi_yearly", "desc": "东方财富-经济数据-日本-全国核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_2.html", "freq": "monthly"},
+        "失业率": {"func": "macro_japan_unemployment_rate", "desc": "东方财富-经济数据-日本-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_2_3.html", "freq": "monthly"},
+        "领先指标终值": {"func": "macro_japan_head_indicator", "desc": "东方财富-经济数据-日本-领先指标终值", "url": "http://data.eastmoney.com/cjsj/foreign_3_4.html", "freq": "monthly"},
+    },
+    "英国宏观": {
+        "Halifax房价指数月率": {"func": "macro_uk_halifax_monthly", "desc": "东方财富-经济数据-英国-Halifax 房价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_0.html", "freq": "monthly"},
+        "Halifax房价指数年率": {"func": "macro_uk_halifax_yearly", "desc": "东方财富-经济数据-英国-Halifax 房价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_1.html", "freq": "monthly"},
+        "贸易帐": {"func": "macro_uk_trade", "desc": "东方财富-经济数据-英国-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_4_2.html", "freq": "monthly"},
+        "央行公布利率决议": {"func": "macro_uk_bank_rate", "desc": "东方财富-经济数据-英国-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_4_3.html", "freq": "monthly"},
+        "核心消费者物价指数年率": {"func": "macro_uk_core_cpi_yearly", "desc": "东方财富-经济数据-英国-核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_4.html", "freq": "monthly"},
+        "核心消费者物价指数月率": {"func": "macro_uk_cpi_monthly", "desc": "东方财富-经济数据-英国-核心消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_7.html", "freq": "monthly"},
+        "消费者物价指数年率": {"func": "macro_uk_cpi_yearly", "desc": "东方财富-经济数据-英国-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_6.html", "freq": "monthly"},
+        "消费者物价指数月率": {"func": "macro_uk_cpi_monthly", "desc": "东方财富-经济数据-英国-消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_7.html", "freq": "monthly"},
+        "零售销售月率": {"func": "macro_uk_retail_monthly", "desc": "东方财富-经济数据-英国-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_8.html", "freq": "monthly"},
+        "零售销售年率": {"func": "macro_uk_retail_yearly", "desc": "东方财富-经济数据-英国-零售销售年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_9.html", "freq": "monthly"},
+        "Rightmove房价指数年率": {"func": "macro_uk_rightmove_yearly", "desc": "东方财富-经济数据-英国-Rightmove 房价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_10.html", "freq": "monthly"},
+        "Rightmove房价指数月率": {"func": "macro_uk_rightmove_monthly", "desc": "东方财富-经济数据-英国-Rightmove 房价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_11.html", "freq": "monthly"},
+        "GDP季率初值": {"func": "macro_uk_gdp_quarterly", "desc": "东方财富-经济数据-英国-GDP 季率初值", "url": "http://data.eastmoney.com/cjsj/foreign_4_12.html", "freq": "quarterly"},
+        "GDP年率初值": {"func": "macro_uk_gdp_yearly", "desc": "东方财富-经济数据-英国-GDP 年率初值", "url": "http://data.eastmoney.com/cjsj/foreign_4_13.html", "freq": "quarterly"},
+        "失业率": {"func": "macro_uk_unemployment_rate", "desc": "东方财富-经济数据-英国-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_4_14.html", "freq": "monthly"},
+    },
+    "澳大利亚宏观": {
+        "零售销售月率": {"func": "macro_australia_retail_rate_monthly", "desc": "东方财富-经济数据-澳大利亚-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_5_0.html", "freq": "monthly"},
+        "贸易帐": {"func": "macro_australia_trade", "desc": "东方财富-经济数据-澳大利亚-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_5_1.html", "freq": "monthly"},
+        "失业率": {"func": "macro_australia_unemployment_rate", "desc": "东方财富-经济数据-澳大利亚-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_5_2.html", "freq": "monthly"},
+        "生产者物价指数季率": {"func": "macro_australia_ppi_quarterly", "desc": "东方财富-经济数据-澳大利亚-生产者物价指数季率", "url": "http://data.eastmoney.com/cjsj/foreign_5_3.html", "freq": "quarterly"},
+        "消费者物价指数季率": {"func": "macro_australia_cpi_quarterly", "desc": "东方财富-经济数据-澳大利亚-消费者物价指数季率", "url": "http://data.eastmoney.com/cjsj/foreign_5_4.html", "freq": "quarterly"},
+        "消费者物价指数年率": {"func": "macro_australia_cpi_yearly", "desc": "东方财富-经济数据-澳大利亚-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_5_5.html", "freq": "quarterly"},
+        "央行公布利率决议": {"func": "macro_australia_bank_rate", "desc": "东方财富-经济数据-澳大利亚-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_5_6.html", "freq": "monthly"},
+    },
+    "加拿大宏观": {
+        "新屋开工": {"func": "macro_canada_new_house_rate", "desc": "东方财富-经济数据-加拿大-新屋开工", "url": "http://data.eastmoney.com/cjsj/foreign_7_0.html", "freq": "monthly"},
+        "失业率": {"func": "macro_canada_unemployment_rate", "desc": "东方财富-经济数据-加拿大-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_7_1.html", "freq": "monthly"},
+        "贸易帐": {"func": "macro_canada_trade", "desc": "东方财富-经济数据-加拿大-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_7_2.html", "freq": "monthly"},
+        "零售销售月率": {"func": "macro_canada_retail_rate_monthly", "desc": "东方财富-经济数据-加拿大-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_3.html", "freq": "monthly"},
+        "央行公布利率决议": {"func": "macro_canada_bank_rate", "desc": "东方财富-经济数据-加拿大-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_7_4.html", "freq": "monthly"},
+        "核心消费者物价指数年率": {"func": "macro_canada_core_cpi_yearly", "desc": "东方财富-经济数据-加拿大-核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_7_5.html", "freq": "monthly"},
+        "核心消费者物价指数月率": {"func": "macro_canada_core_cpi_monthly", "desc": "东方财富-经济数据-加拿大-核心消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_6.html", "freq": "monthly"},
+        "消费者物价指数年率": {"func": "macro_canada_cpi_yearly", "desc": "东方财富-经济数据-加拿大-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_7_7.html", "freq": "monthly"},
+        "消费者物价指数月率": {"func": "macro_canada_cpi_monthly", "desc": "东方财富-经济数据-加拿大-消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_8.html", "freq": "monthly"},
+        "GDP月率": {"func": "macro_canada_gdp_monthly", "desc": "东方财富-经济数据-加拿大-GDP 月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_9.html", "freq": "monthly"},
+    }
+}
+
+
+# the NBS interfaces take their arguments from dedicated widgets in the app
+UI_PARAMS = {
+    "ui_nbs_nation": ["kind", "path", "period"],
+    "ui_nbs_region": ["kind", "path", "indicator", "region", "period"],
+}
+
+_akshare = None
+
+
+def resolve_func(info):
+    global _akshare
+    if _akshare is None:
+        _akshare = importlib.import_module("akshare")
+    return getattr(_akshare, info["func"])
+
+
+def iter_datasets(regions=None, registry=None):
+    for region_name, datasets in (registry or AKSHARE_MACRO_MAP).items():
+        if regions and region_name not in regions:
+            continue
+        for dataset_name, info in datasets.items():
+            yield region_name, dataset_name, info
+
+
+def dataset_params(info):
+    # -> the keyword arguments the akshare function accepts
+    params = []
+    for name in info.get("params", []):
+        params.extend(UI_PARAMS.get(name, [name]))
+    return params
+
+
+def dataset_host(info):
+    return urlparse(info.get("url", "")).hostname or "unknown"
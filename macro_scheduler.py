@@ -0,0 +1,249 @@
+import argparse
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from macro_cache import DAY, HOUR, dataset_frequency, dataset_ttl
+from macro_fetch import DataFetcher
+from macro_warmup import HostLimiter, run_by_host, warm_one, warmup_targets
+
+# --- Release-Calendar Scheduler ---
+# Datasets matched to an event in the macro calendars are refreshed shortly
+# after each release; the rest fall back to their frequency TTL. Datasets that
+# are not cached yet are left to on-demand fetches and the warm-up.
+CALENDAR_SOURCES = (("全球宏观", "宏观日历-华尔街见闻"), ("全球宏观", "全球宏观事件-百度"))
+CALENDAR_TZ = "Asia/Shanghai"
+# upstream tables lag the headline by a few minutes, so check more than once
+RELEASE_CHECKS = (2 * 60, 15 * 60, HOUR)
+RETRY_AFTER = 5 * 60
+# safety net for calendar-tracked datasets whose release fell outside the loaded days
+TRACKED_MAX_AGE = {
+    "event": HOUR,
+    "daily": DAY,
+    "weekly": 7 * DAY,
+    "monthly": 31 * DAY,
+    "quarterly": 92 * DAY,
+    "yearly": 366 * DAY,
+}
+REGION_ALIASES = {"中国香港": ("中国香港", "香港")}
+TERM_SYNONYMS = {
+    "消费者物价指数": "CPI",
+    "生产者物价指数": "PPI",
+    "采购经理人指数": "PMI",
+    "国内生产总值": "GDP",
+}
+MATCH_THRESHOLD = 0.75
+
+
+def calendar_region(region_name):
+    return region_name[:-2] if region_name.endswith("宏观") else None
+
+
+def _terms(text, strip=()):
+    text = str(text).upper()
+    for long, short in TERM_SYNONYMS.items():
+        text = text.replace(long, short)
+    for word in strip:
+        text = text.replace(word, "")
+    # periods and boilerplate differ between the calendar and the registry names
+    text = re.sub(r"[(（].*?[)）]|报告|数据|第?[一二三四]季度|\d+月|\d+|\s", "", text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def matches(dataset_terms, event_terms):
+    return bool(dataset_terms) and len(dataset_terms & event_terms) / len(dataset_terms) >= MATCH_THRESHOLD
+
+
+def normalize_calendar(df, day):
+    # -> columns time (epoch seconds), region, event
+    if not isinstance(df, pd.DataFrame) or df.empty or "时间" not in df.columns:
+        return pd.DataFrame(columns=["time", "region", "event"])
+    stamp = df["时间"].astype(str)
+    if "日期" in df.columns:
+        stamp = df["日期"].astype(str) + " " + stamp
+    else:
+        stamp = stamp.where(stamp.str.len() > 8, day.strftime("%Y-%m-%d ") + stamp)
+    times = pd.to_datetime(stamp, errors="coerce", format="mixed").dt.tz_localize(CALENDAR_TZ, ambiguous="NaT", nonexistent="NaT")
+    events = pd.DataFrame({
+        "time": (times - pd.Timestamp(0, tz="UTC")).dt.total_seconds(),
+        "region": df.get("地区", pd.Series("", index=df.index)).astype(str).str.strip(),
+        "event": df.get("事件", pd.Series("", index=df.index)).astype(str),
+    })
+    return events.dropna(subset=["time"])
+
+
+def fetch_calendar(fetcher, day):
+    frames = []
+    for region_name, dataset_name in CALENDAR_SOURCES:
+        try:
+            df = fetcher.fetch(region_name, dataset_name, {"date": day.strftime("%Y%m%d")})
+        except Exception:
+            continue
+        frames.append(normalize_calendar(df, day))
+    if not frames:
+        return pd.DataFrame(columns=["time", "region", "event"])
+    return pd.concat(frames, ignore_index=True)
+
+
+class ReleaseScheduler:
+    def __init__(self, fetcher=None, calendar=None, clock=time.time, regions=None, limiter=None,
+                 workers=4, calendar_interval=HOUR, poll_interval=60, days_behind=1, days_ahead=1,
+                 retries=2, backoff=1.0):
+        self.fetcher = fetcher or DataFetcher()
+        # calendar(day) -> DataFrame[time, region, event]; swap in a stub for tests
+        self.calendar = calendar or (lambda day: fetch_calendar(self.fetcher, day))
+        self.clock = clock
+        self.limiter = limiter or HostLimiter()
+        self.workers = workers
+        self.calendar_interval = calendar_interval
+        self.poll_interval = poll_interval
+        self.days_behind = days_behind
+        self.days_ahead = days_ahead
+        self.retries = retries
+        self.backoff = backoff
+
+        self.targets = list(warmup_targets(regions, registry=self.fetcher.registry))
+        self._by_region = {}
+        self._terms = {}
+        for region_name, dataset_name, _ in self.targets:
+            region = calendar_region(region_name)
+            if region is None:
+                continue
+            aliases = REGION_ALIASES.get(region, (region,))
+            for alias in aliases:
+                self._by_region.setdefault(alias, []).append((region_name, dataset_name))
+            self._terms[(region_name, dataset_name)] = _terms(dataset_name, aliases)
+
+        self.releases = {}
+        self.tracked = set()
+        self.calendar_loaded_at = None
+        self._failed_at = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load_calendar(self, now):
+        today = pd.Timestamp(now, unit="s", tz="UTC").tz_convert(CALENDAR_TZ).normalize()
+        days = [today + pd.Timedelta(days=i) for i in range(-self.days_behind, self.days_ahead + 1)]
+        releases = {}
+        for day in days:
+            events = self.calendar(day)
+            for release, region, event in zip(events["time"], events["region"], events["event"]):
+                event_terms = None
+                for target in self._by_region.get(region, ()):
+                    event_terms = event_terms or _terms(event, REGION_ALIASES.get(region, (region,)))
+                    if matches(self._terms[target], event_terms):
+                        releases.setdefault(target, set()).add(float(release))
+        self.releases = {target: sorted(times) for target, times in releases.items()}
+        self.tracked.update(self.releases)
+        self.calendar_loaded_at = now
+
+    def _deadline(self, region_name, dataset_name, info, fetched):
+        # earliest time at which the cached copy should be replaced
+        for release in self.releases.get((region_name, dataset_name), ()):
+            for delay in RELEASE_CHECKS:
+                if release + delay > fetched:
+                    return release + delay
+        if (region_name, dataset_name) in self.tracked:
+            return fetched + TRACKED_MAX_AGE.get(dataset_frequency(info), 31 * DAY)
+        return fetched + dataset_ttl(info)
+
+    def due(self, now):
+        due = []
+        for region_name, dataset_name, info in self.targets:
+            fetched = self.fetcher.cache.fetched_at(region_name, dataset_name, {})
+            if fetched is None:
+                continue
+            if now - self._failed_at.get((region_name, dataset_name), -RETRY_AFTER) < RETRY_AFTER:
+                continue
+            if self._deadline(region_name, dataset_name, info, fetched) <= now:
+                due.append((region_name, dataset_name, info))
+        return due
+
+    def next_run(self, now):
+        wake = [now + self.poll_interval]
+        if self.calendar_loaded_at is not None:
+            wake.append(self.calendar_loaded_at + self.calendar_interval)
+        for region_name, dataset_name, info in self.targets:
+            fetched = self.fetcher.cache.fetched_at(region_name, dataset_name, {})
+            if fetched is not None:
+                retry = self._failed_at.get((region_name, dataset_name), -RETRY_AFTER) + RETRY_AFTER
+                wake.append(max(retry, self._deadline(region_name, dataset_name, info, fetched)))
+        return max(now, min(wake))
+
+    def run_once(self, now=None, progress=None):
+        now = self.clock() if now is None else now
+        if self.calendar_loaded_at is None or now - self.calendar_loaded_at >= self.calendar_interval:
+            try:
+                self.load_calendar(now)
+            except Exception:
+                # keep the previous release times; the TTL fallback still applies
+                self.calendar_loaded_at = now
+
+        report = {"ok": [], "failed": []}
+        targets = self.due(now)
+        if not targets:
+            return report
+        results = run_by_host(
+            targets, lambda t: warm_one(self.fetcher, self.limiter, *t, True, self.retries, self.backoff),
+            self.limiter, self.workers
+        )
+        for (region_name, dataset_name, _), (status, elapsed, error) in results:
+            if status == "failed":
+                self._failed_at[(region_name, dataset_name)] = now
+            else:
+                self._failed_at.pop((region_name, dataset_name), None)
+            report[status].append((region_name, dataset_name, elapsed, error))
+            if progress:
+                progress(region_name, dataset_name, status, elapsed, error)
+        return report
+
+    def _loop(self, progress):
+        while not self._stop.is_set():
+            self.run_once(progress=progress)
+            now = self.clock()
+            self._stop.wait(max(1.0, self.next_run(now) - now))
+
+    def start(self, progress=None):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(progress,), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def print_progress(region_name, dataset_name, status, elapsed, error):
+    line = f"{datetime.now():%Y-%m-%d %H:%M:%S} {status:<6} {region_name}/{dataset_name} ({elapsed:.1f}s)"
+    if error is not None:
+        line += f" - {error}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按宏观日历的发布时间刷新已缓存的 AKShare 宏观数据")
+    parser.add_argument("--region", action="append", help="仅调度指定国家/地区 (可重复)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--poll", type=float, default=60, help="最长检查间隔 (秒)")
+    args = parser.parse_args(argv)
+
+    scheduler = ReleaseScheduler(regions=args.region, workers=args.workers, poll_interval=args.poll)
+    print(f"调度 {len(scheduler.targets)} 个数据集，按 Ctrl+C 退出", flush=True)
+    scheduler.start(progress=print_progress)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop(timeout=5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
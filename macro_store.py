@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from macro_cache import cache_key
+from macro_normalize import get_layout
+
+# --- Shared Frame Store ---
+# One compacted, read-only copy of each loaded dataset per process. Sessions
+# keep FrameRefs (keys) instead of frames, so evicting an entry really frees
+# it; a session whose frame was evicted reloads it from the disk cache.
+STORE_MAX_BYTES = int(os.environ.get("MACRO_STORE_MAX_BYTES", 256 * 1024 * 1024))
+CATEGORY_MAX_RATIO = 0.5
+FLOAT32_MAX_DECIMALS = 6
+
+
+class FrameRef:
+    __slots__ = ("region_name", "dataset_name", "kwargs", "history", "key")
+
+    def __init__(self, region_name, dataset_name, kwargs=None, history=False):
+        self.region_name = region_name
+        self.dataset_name = dataset_name
+        self.kwargs = dict(kwargs or {})
+        self.history = history
+        self.key = cache_key(region_name, dataset_name, {**self.kwargs, "_history": history})
+
+    @property
+    def layout_key(self):
+        return f"{self.region_name}/{self.dataset_name}"
+
+    def __repr__(self):
+        return f"FrameRef({self.layout_key})"
+
+
+def _float32_exact(values):
+    # float32 keeps ~7 significant digits: accept it only if every value
+    # survives the round trip at the column's own decimal precision
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return True
+    narrowed = finite.astype(np.float32).astype(np.float64)
+    for decimals in range(FLOAT32_MAX_DECIMALS + 1):
+        if np.array_equal(np.round(finite, decimals), finite):
+            return np.array_equal(np.round(narrowed, decimals), finite)
+    return False
+
+
+def compact(df, layout_key=None):
+    layout = get_layout(df, layout_key)
+    # date and value columns stay text so normalization sees the original strings
+    text_cols = {layout["date_col"], *(layout["numeric_cols"] or [])}
+    if layout["pivot"]:
+        text_cols.add("value")
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df.iloc[:, i]
+        if col.dtype == np.float64 and _float32_exact(col.to_numpy()):
+            col = col.astype(np.float32)
+        elif col.dtype == np.int64:
+            col = pd.to_numeric(col, downcast="integer")
+        elif pd.api.types.is_object_dtype(col.dtype) or pd.api.types.is_string_dtype(col.dtype):
+            if pd.api.types.infer_dtype(col, skipna=True) not in ("string", "empty"):
+                columns.append(col)
+                continue
+            if name not in text_cols and col.nunique() <= CATEGORY_MAX_RATIO * len(col):
+                col = col.astype("category")
+            else:
+                col = col.astype("string[pyarrow]")
+        columns.append(col)
+    if not columns:
+        return df
+    out = pd.concat(columns, axis=1)
+    out.columns = df.columns
+    return out
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameStore:
+    def __init__(self, max_bytes=STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def put(self, key, df, layout_key=None):
+        frame = compact(df, layout_key)
+        size = frame_bytes(frame)
+        with self._lock:
+            self._entries[key] = (frame, size)
+            self._entries.move_to_end(key)
+            self._evict()
+        return frame
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def nbytes(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(size for _, size in self._entries.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self):
+        # the newest entry always stays, even if it alone exceeds the budget
+        total = sum(size for _, size in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            total -= size
@@ -0,0 +1,148 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+# --- Background Tasks ---
+# Slow upstream calls run on a shared worker pool instead of the Streamlit
+# script thread. Each owner (session, slot) has at most one current task; a
+# new submission supersedes the old one, which is cancelled if it has not
+# started yet and otherwise detached: it finishes, fills the shared caches,
+# and its result is dropped. Detached tasks still count against their
+# session's cap, so one session cannot pin the whole pool; tasks over the cap
+# wait in a per-session queue without holding a worker.
+TASK_WORKERS = 8
+SESSION_TASKS = 2
+TASK_TIMEOUT = 120
+TASK_RETENTION = 600
+
+
+class Task:
+    _ids = itertools.count(1)
+
+    def __init__(self, owner, label, tag, timeout, clock):
+        self.id = next(self._ids)
+        self.owner = owner
+        self.label = label
+        self.tag = tag
+        self.future = Future()
+        self.timeout = timeout
+        self.clock = clock
+        self.submitted_at = clock()
+        self.started_at = None
+        self.finished_at = None
+        self.queued = False
+        self.cancelled = False
+        self.future.add_done_callback(self._finished)
+
+    def _finished(self, _):
+        self.finished_at = self.clock()
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or self.clock()) - self.submitted_at
+
+    @property
+    def state(self):
+        if self.cancelled or self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "done"
+        if self.started_at is None:
+            return "queued" if self.queued else "pending"
+        # waiting for a worker does not count towards the timeout
+        if self.clock() - self.started_at > self.timeout:
+            return "timeout"
+        return "running"
+
+    def result(self):
+        return self.future.result(timeout=0)
+
+    def wait(self, timeout):
+        # lets fast (cached) loads finish inline instead of going through polling
+        return bool(wait([self.future], timeout=timeout).done)
+
+    def cancel(self):
+        self.cancelled = True
+        return self.future.cancel()
+
+
+class TaskRunner:
+    def __init__(self, workers=TASK_WORKERS, session_tasks=SESSION_TASKS, timeout=TASK_TIMEOUT, clock=time.monotonic):
+        self.session_tasks = session_tasks
+        self.timeout = timeout
+        self.clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="macro-task")
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._active = {}
+        self._queued = {}
+
+    def submit(self, owner, label, fn, *args, tag=None, timeout=None, **kwargs):
+        session = owner[0]
+        with self._lock:
+            self._prune()
+            previous = self._tasks.pop(owner, None)
+            if previous is not None:
+                previous.cancel()
+            task = Task(owner, label, tag, timeout or self.timeout, self.clock)
+            self._tasks[owner] = task
+            self._queued.setdefault(session, deque()).append((task, fn, args, kwargs))
+            self._start_queued(session)
+            return task
+
+    def _start_queued(self, session):
+        # called with the lock held
+        active = self._active.setdefault(session, set())
+        queue = self._queued.get(session)
+        while queue and len(active) < self.session_tasks:
+            task, fn, args, kwargs = queue.popleft()
+            if task.future.cancelled():
+                continue
+            task.queued = False
+            active.add(task)
+            self._pool.submit(self._run, session, task, fn, args, kwargs)
+        for task, *_ in queue or ():
+            task.queued = True
+        if not queue:
+            self._queued.pop(session, None)
+        if not active:
+            self._active.pop(session, None)
+
+    def _run(self, session, task, fn, args, kwargs):
+        try:
+            if task.future.set_running_or_notify_cancel():
+                task.started_at = self.clock()
+                try:
+                    task.future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    task.future.set_exception(e)
+        finally:
+            with self._lock:
+                self._active.get(session, set()).discard(task)
+                self._start_queued(session)
+
+    def get(self, owner):
+        with self._lock:
+            return self._tasks.get(owner)
+
+    def cancel(self, owner):
+        with self._lock:
+            task = self._tasks.pop(owner, None)
+        if task is not None:
+            task.cancel()
+        return task
+
+    def discard(self, owner, task):
+        # drop a finished task once its result has been consumed
+        with self._lock:
+            if self._tasks.get(owner) is task:
+                del self._tasks[owner]
+
+    def _prune(self):
+        # results nobody came back for (closed tabs) are released after a while
+        now = self.clock()
+        for owner, task in list(self._tasks.items()):
+            if task.finished_at is not None and now - task.finished_at > TASK_RETENTION:
+                del self._tasks[owner]
@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from macro_metrics import METRICS
+from macro_normalize import numeric_frame
+
+# --- Derived Series ---
+# Transforms run on every numeric column of a date-indexed frame at once.
+# Results are cached per (request, transform, params); when the source only
+# grew or had rows revised, outputs are recomputed from the first changed row.
+PERIODS_PER_YEAR = {"weekly": 52, "monthly": 12, "quarterly": 4, "yearly": 1}
+TRANSFORM_LABELS = {
+    "同比 (%)": "yoy",
+    "环比 (%)": "mom",
+    "移动平均": "rolling_mean",
+    "定基指数 (=100)": "rebase",
+}
+
+
+def infer_frequency(index):
+    if len(index) < 3:
+        return "monthly"
+    days = np.median(np.diff(index.to_numpy()).astype("timedelta64[s]").astype(np.int64)) / 86400
+    if days <= 2:
+        return "daily"
+    if days <= 10:
+        return "weekly"
+    if days <= 45:
+        return "monthly"
+    if days <= 120:
+        return "quarterly"
+    return "yearly"
+
+
+def prepare_frame(formatted, date_col, numeric_cols):
+    frame = numeric_frame(formatted, date_col, numeric_cols).set_index(date_col).sort_index()
+    return frame[~frame.index.duplicated(keep="last")]
+
+
+def _year_ago(frame):
+    # daily data has no fixed number of periods per year: look up the last
+    # observation at or before the same date one year earlier
+    past = frame.reindex(frame.index - pd.DateOffset(years=1), method="ffill")
+    past.index = frame.index
+    return past
+
+
+def base_row(frame, base=None):
+    return frame.loc[:base].iloc[-1] if base is not None else frame.iloc[0]
+
+
+def compute(frame, transform, freq, window=3, base=None, base_values=None):
+    if transform == "yoy":
+        past = _year_ago(frame) if freq == "daily" else frame.shift(PERIODS_PER_YEAR[freq])
+        return (frame / past - 1) * 100
+    if transform == "mom":
+        return frame.pct_change(fill_method=None) * 100
+    if transform == "rolling_mean":
+        return frame.rolling(window, min_periods=window).mean()
+    if transform == "rebase":
+        if base_values is None:
+            base_values = base_row(frame, base)
+        return frame / base_values * 100
+    raise ValueError(f"未知的变换: {transform}")
+
+
+def _context_start(frame, pos, transform, freq, window):
+    # first source row needed to recompute outputs from `pos` onward
+    if transform == "yoy" and freq == "daily":
+        return int(frame.index.searchsorted(frame.index[pos] - pd.DateOffset(years=1, days=7)))
+    lookback = {"yoy": PERIODS_PER_YEAR.get(freq, 0), "mom": 1, "rolling_mean": window - 1}.get(transform, 0)
+    return max(0, pos - lookback)
+
+
+def _row_hashes(frame):
+    # one hash per row, index included; hashing is cheap next to the transforms
+    return pd.util.hash_pandas_object(frame).to_numpy()
+
+
+class TransformEngine:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @METRICS.timed("transform")
+    def apply(self, key, frame, transform, freq=None, window=3, base=None):
+        freq = freq or infer_frequency(frame.index)
+        if transform == "rebase" and base is None and len(frame):
+            base = frame.index[0]
+        cache_key = (key, transform, freq, window, base)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+
+        hashes = _row_hashes(frame)
+        pos = self._reusable_rows(entry, frame, hashes)
+        if pos and transform == "rebase" and pos <= frame.index.searchsorted(base, side="right") - 1:
+            # a revised anchor row changes every rebased value
+            pos = 0
+        if pos == len(frame):
+            result = entry["result"]
+        elif pos > 0:
+            start = _context_start(frame, pos, transform, freq, window)
+            # the rebase anchor may lie before the recomputed slice
+            base_values = base_row(frame, base) if transform == "rebase" else None
+            tail = compute(frame.iloc[start:], transform, freq, window, base, base_values).iloc[pos - start:]
+            result = pd.concat([entry["result"].iloc[:pos], tail])
+        else:
+            result = compute(frame, transform, freq, window, base)
+
+        with self._lock:
+            self._entries[cache_key] = {
+                "result": result,
+                "columns": list(frame.columns),
+                "hashes": hashes,
+            }
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _reusable_rows(entry, frame, hashes):
+        # leading rows of the cached result that are still valid for `frame`:
+        # transforms only look back, so outputs before the first changed row hold
+        if entry is None or entry["columns"] != list(frame.columns):
+            return 0
+        old = entry["hashes"]
+        if len(old) > len(hashes):
+            return 0
+        changed = np.flatnonzero(hashes[:len(old)] != old)
+        return int(changed[0]) if len(changed) else len(old)
@@ -0,0 +1,154 @@
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from macro_cache import dataset_ttl
+from macro_fetch import DataFetcher
+from macro_registry import dataset_host, iter_datasets
+
+# --- Warm-up Configuration ---
+# Upstream hosts that rate-limit aggressively get fewer concurrent calls.
+PER_HOST_LIMITS = {
+    "data.eastmoney.com": 2,
+    "data.stats.gov.cn": 1,
+    "www.chinamoney.com.cn": 1,
+    "finance.sina.com.cn": 2,
+}
+DEFAULT_HOST_LIMIT = 4
+
+
+class HostLimiter:
+    def __init__(self, limits=None, default_limit=DEFAULT_HOST_LIMIT):
+        self.limits = dict(PER_HOST_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def limit(self, host):
+        return max(1, self.limits.get(host, self.default_limit))
+
+    def __call__(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit(host))
+            return self._semaphores[host]
+
+
+def run_by_host(targets, fn, limiter, workers):
+    # one queue per host: a target is only handed to the pool while its host has
+    # a free slot, so no worker sits on a host semaphore while other hosts wait.
+    # Yields (target, fn(target)) in completion order.
+    queues = {}
+    for target in targets:
+        queues.setdefault(dataset_host(target[2]), deque()).append(target)
+    active = dict.fromkeys(queues, 0)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while queues or running:
+            started = True
+            while started and len(running) < workers:
+                # round-robin over hosts, one target each per pass
+                started = False
+                for host in list(queues):
+                    if len(running) >= workers or active[host] >= limiter.limit(host):
+                        continue
+                    target = queues[host].popleft()
+                    # the host moves to the back, so a single free worker also rotates
+                    queue = queues.pop(host)
+                    if queue:
+                        queues[host] = queue
+                    running[pool.submit(fn, target)] = (host, target)
+                    active[host] += 1
+                    started = True
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                host, target = running.pop(future)
+                active[host] -= 1
+                yield target, future.result()
+
+
+def call_with_retry(loader, retries=3, backoff=1.0):
+    for attempt in range(retries + 1):
+        try:
+            return loader()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random() / 2))
+
+
+def warmup_targets(regions=None, datasets=None, registry=None):
+    for region_name, dataset_name, info in iter_datasets(regions, registry):
+        if datasets and dataset_name not in datasets:
+            continue
+        # only parameterless interfaces have a well-defined default request
+        if info.get("params"):
+            continue
+        yield region_name, dataset_name, info
+
+
+def warm_one(fetcher, limiter, region_name, dataset_name, info, force=False, retries=3, backoff=1.0):
+    age = fetcher.cache.age(region_name, dataset_name, {})
+    if not force and age is not None and age <= dataset_ttl(info):
+        return "fresh", 0.0, None
+    start = time.perf_counter()
+    try:
+        with limiter(dataset_host(info)):
+            df = call_with_retry(lambda: fetcher.load(region_name, dataset_name), retries=retries, backoff=backoff)
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError(f"接口返回了 {type(df).__name__}，而不是 DataFrame")
+    except Exception as e:
+        return "failed", time.perf_counter() - start, e
+    return "ok", time.perf_counter() - start, None
+
+
+def warmup(fetcher=None, regions=None, datasets=None, workers=16, limiter=None,
+           force=False, retries=3, backoff=1.0, progress=None):
+    fetcher = fetcher or DataFetcher()
+    limiter = limiter or HostLimiter()
+    targets = list(warmup_targets(regions, datasets, fetcher.registry))
+    report = {"ok": [], "fresh": [], "failed": []}
+    results = run_by_host(
+        targets, lambda t: warm_one(fetcher, limiter, *t, force, retries, backoff), limiter, workers
+    )
+    for done, ((region_name, dataset_name, _), (status, elapsed, error)) in enumerate(results, start=1):
+        report[status].append((region_name, dataset_name, elapsed, error))
+        if progress:
+            progress(done, len(targets), region_name, dataset_name, status, elapsed, error)
+    return report
+
+
+def print_progress(done, total, region_name, dataset_name, status, elapsed, error):
+    line = f"[{done}/{total}] {status:<6} {region_name}/{dataset_name} ({elapsed:.1f}s)"
+    if error is not None:
+        line += f" - {error}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="并发预热 AKShare 宏观数据缓存")
+    parser.add_argument("--region", action="append", help="仅预热指定国家/地区 (可重复)")
+    parser.add_argument("--dataset", action="append", help="仅预热指定数据集 (可重复)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=1.0)
+    parser.add_argument("--force", action="store_true", help="忽略 TTL，全部重新获取")
+    args = parser.parse_args(argv)
+
+    report = warmup(
+        regions=args.region, datasets=args.dataset, workers=args.workers,
+        force=args.force, retries=args.retries, backoff=args.backoff,
+        progress=print_progress
+    )
+    print(f"完成: {len(report['ok'])} 已更新, {len(report['fresh'])} 仍新鲜, {len(report['failed'])} 失败")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
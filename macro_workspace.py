@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from macro_normalize import clean_numeric, normalize
+
+# --- Comparison Workspace ---
+# Series from different datasets are resampled onto one calendar with explicit
+# rules and joined on their sorted date index.
+ALIGN_FREQUENCIES = {
+    "日度": "D",
+    "周度": "W-FRI",
+    "月度": "MS",
+    "季度": "QS",
+    "年度": "YS",
+}
+ALIGN_AGGREGATIONS = {
+    "期末值": "last",
+    "均值": "mean",
+    "合计": "sum",
+}
+
+
+def series_label(region_name, dataset_name, column):
+    return f"{region_name}/{dataset_name}: {column}"
+
+
+def fetch_many(fetcher, targets, workers=8):
+    # targets: iterable of (region_name, dataset_name); one parallel round trip
+    def load(target):
+        try:
+            return target, fetcher.fetch(*target)
+        except Exception as e:
+            return target, e
+
+    targets = list(targets)
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+        return dict(pool.map(load, targets))
+
+
+def numeric_columns(df, layout_key):
+    _, date_col, numeric_cols = normalize(df, layout_key=layout_key)
+    return numeric_cols if date_col is not None else []
+
+
+def extract_series(df, layout_key, column):
+    formatted, date_col, _ = normalize(df, layout_key=layout_key)
+    values = clean_numeric(formatted[column])
+    series = pd.Series(values.to_numpy(), index=pd.DatetimeIndex(formatted[date_col]), name=column)
+    series = series[series.index.notna()].sort_index()
+    return series[~series.index.duplicated(keep="last")]
+
+
+def align_series(series, freq="MS", how="last"):
+    # series: {label: pd.Series indexed by date}
+    # min_count keeps empty periods as NaN instead of summing them to 0
+    options = {"min_count": 1} if how == "sum" else {}
+    resampled = {
+        label: getattr(s.resample(freq), how)(**options)
+        for label, s in series.items()
+        if not s.empty
+    }
+    if not resampled:
+        return pd.DataFrame()
+    # every resampled index is sorted and on the same grid, so the outer join
+    # is a merge of sorted indexes rather than a hash join
+    aligned = pd.concat(resampled, axis=1, join="outer", sort=True)
+    aligned.index.name = "date"
+    return aligned.dropna(how="all")
@@ -1,10 +1,26 @@
 import streamlit as st
-import akshare as ak
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
+import sqlite3
 import sys
 
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from macro_charts import build_line_chart, needs_downsampling
+from macro_correlation import MIN_PERIODS, CorrelationScanner, aligned_matrix, cached_series
+from macro_fetch import DataFetcher
+from macro_metrics import METRICS, STAGE_LABELS, start_metrics_server
+from macro_incremental import refresh_incremental
+from macro_nbs_catalog import NBS_KINDS, PATH_SEPARATOR, ROOT_ID, NbsCatalog
+from macro_normalize import normalize, numeric_frame
+from macro_registry import AKSHARE_MACRO_MAP
+from macro_store import FrameRef, FrameStore
+from macro_tasks import TaskRunner
+from macro_transforms import TRANSFORM_LABELS, TransformEngine, prepare_frame
+from macro_workspace import (
+    ALIGN_AGGREGATIONS, ALIGN_FREQUENCIES, align_series, extract_series, fetch_many, numeric_columns, series_label
+)
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="AKShare Macro Data Visualizer",
@@ -13,328 +29,185 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- Data Mapping & UI Structures ---
-NBS_DATA_STRUCTURE = {
-    "年度数据": {
-        "国民经济核算": {"国内生产总值": None, "支出法国内生产总值": None, "国民总收入": None},
-        "人口": {"总人口": None, "人口数及其构成": None, "人口的城乡构成": None},
-        "就业和工资": {"就业基本情况": None, "城镇单位就业人员及工资": None},
-        "价格": {"居民消费价格指数": None, "商品零售价格指数": None}
-    },
-    "季度数据": {
-        "国民经济核算": {"国内生产总值": None, "三大产业贡献率": None},
-        "农业": {"主要农产品产量": None}
-    },
-    "月度数据": {
-        "价格": {"居民消费价格指数": None, "工业生产者价格指数": None},
-        "工业": {"工业增加值": None, "主要工业产品产量": None},
-        "固定资产投资": {"固定资产投资（不含农户）": None}
-    }
-}
-NBS_REGION_DATA_STRUCTURE = {
-    "分省年度数据": {"国民经济核算": {"地区生产总值": None}, "人民生活": {"居民消费水平": None}},
-    "分省季度数据": {"国民经济核算": {"地区生产总值": None}, "人民生活": {"居民人均可支配收入": None}}
-}
-
-AKSHARE_MACRO_MAP = {
-    "中国宏观": {
-        "中国宏观杠杆率": {"func": ak.macro_cnbs, "desc": "中国国家金融与发展实验室-中国宏观杠杆率数据", "url": "http://114.115.232.154:8080/"},
-        "企业商品价格指数": {"func": ak.macro_china_qyspjg, "desc": "东方财富-经济数据一览-中国-企业商品价格指数", "url": "http://data.eastmoney.com/cjsj/qyspjg.html"},
-        "外商直接投资数据": {"func": ak.macro_china_fdi, "desc": "东方财富-经济数据一览-中国-外商直接投资数据", "url": "https://data.eastmoney.com/cjsj/fdi.html"},
-        "LPR品种数据": {"func": ak.macro_china_lpr, "desc": "中国 LPR 品种数据", "url": "https://data.eastmoney.com/cjsj/globalRateLPR.html"},
-        "城镇调查失业率": {"func": ak.macro_china_urban_unemployment, "desc": "国家统计局-月度数据-城镇调查失业率", "url": "https://data.stats.gov.cn/easyquery.htm?cn=A01&zb=A0203&sj=202304"},
-        "社会融资规模增量统计": {"func": ak.macro_china_shrzgm, "desc": "商务数据中心-国内贸易-社会融资规模增量统计", "url": "http://data.mofcom.gov.cn/gnmy/shrzgm.shtml"},
-        "中国 GDP 年率": {"func": ak.macro_china_gdp_yearly, "desc": "金十数据中心-中国 GDP 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_gdp_yoy"},
-        "中国 CPI 年率报告": {"func": ak.macro_china_cpi_yearly, "desc": "中国年度 CPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_cpi_yoy"},
-        "中国 CPI 月率报告": {"func": ak.macro_china_cpi_monthly, "desc": "中国月度 CPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_cpi_mom"},
-        "中国 PPI 年率报告": {"func": ak.macro_china_ppi_yearly, "desc": "中国年度 PPI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_ppi_yoy"},
-        "以美元计算出口年率": {"func": ak.macro_china_exports_yoy, "desc": "中国以美元计算出口年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_exports_yoy"},
-        "以美元计算进口年率": {"func": ak.macro_china_imports_yoy, "desc": "中国以美元计算进口年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_imports_yoy"},
-        "以美元计算贸易帐": {"func": ak.macro_china_trade_balance, "desc": "中国以美元计算贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_trade_balance"},
-        "工业增加值增长": {"func": ak.macro_china_gyzjz, "desc": "东方财富-中国工业增加值增长", "url": "https://data.eastmoney.com/cjsj/gyzjz.html"},
-        "规模以上工业增加值年率": {"func": ak.macro_china_industrial_production_yoy, "desc": "中国规模以上工业增加值年率报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_industrial_production_yoy"},
-        "官方制造业 PMI": {"func": ak.macro_china_pmi_yearly, "desc": "中国年度PMI数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_manufacturing_pmi"},
-        "财新制造业PMI终值": {"func": ak.macro_china_cx_pmi_yearly, "desc": "中国年度财新 PMI 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_caixin_manufacturing_pmi"},
-        "财新服务业PMI": {"func": ak.macro_china_cx_services_pmi_yearly, "desc": "中国财新服务业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_chinese_caixin_services_pmi"},
-        "中国官方非制造业PMI": {"func": ak.macro_china_non_man_pmi, "desc": "中国官方非制造业 PMI", "url": "https://datacenter.jin10.com/reportType/dc_chinese_non_manufacturing_pmi"},
-        "外汇储备": {"func": ak.macro_china_fx_reserves_yearly, "desc": "中国年度外汇储备数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_fx_reserves"},
-        "M2货币供应年率": {"func": ak.macro_china_m2_yearly, "desc": "中国年度 M2 数据", "url": "https://datacenter.jin10.com/reportType/dc_chinese_m2_money_supply_yoy"},
-        "新房价指数": {"func": ak.macro_china_new_house_price, "desc": "中国新房价指数月度数据", "url": "http://data.eastmoney.com/cjsj/newhouse.html", "params": ["city_first", "city_second"]},
-        "企业景气及企业家信心指数": {"func": ak.macro_china_enterprise_boom_index, "desc": "中国企业景气及企业家信心指数数据", "url": "http://data.eastmoney.com/cjsj/qyjqzs.html"},
-        "全国税收收入": {"func": ak.macro_china_national_tax_receipts, "desc": "中国全国税收收入数据", "url": "http://data.eastmoney.com/cjsj/nationaltaxreceipts.aspx"},
-        "银行理财产品发行数量": {"func": ak.macro_china_bank_financing, "desc": "银行理财产品发行数量", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI01516267.html"},
-        "原保险保费收入": {"func": ak.macro_china_insurance_income, "desc": "原保险保费收入", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMM00088870.html"},
-        "手机出货量": {"func": ak.macro_china_mobile_number, "desc": "手机出货量", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00225823.html"},
-        "菜篮子产品批发价格指数": {"func": ak.macro_china_vegetable_basket, "desc": "菜篮子产品批发价格指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00009275.html"},
-        "农产品批发价格总指数": {"func": ak.macro_china_agricultural_product, "desc": "农产品批发价格总指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00009274.html"},
-        "农副指数": {"func": ak.macro_china_agricultural_index, "desc": "农副指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662543.html"},
-        "能源指数": {"func": ak.macro_china_energy_index, "desc": "能源指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662539.html"},
-        "大宗商品价格指数": {"func": ak.macro_china_commodity_price_index, "desc": "大宗商品价格数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662535.html"},
-        "费城半导体指数": {"func": ak.macro_global_sox_index, "desc": "费城半导体指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00055562.html"},
-        "义乌小商品指数-电子元器件": {"func": ak.macro_china_yw_electronic_index, "desc": "义乌小商品指数-电子元器件数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00055551.html"},
-        "建材指数": {"func": ak.macro_china_construction_index, "desc": "建材指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00662541.html"},
-        "建材价格指数": {"func": ak.macro_china_construction_price_index, "desc": "建材价格指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00237146.html"},
-        "物流景气指数": {"func": ak.macro_china_lpi_index, "desc": "物流景气指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00352262.html"},
-        "原油运输指数": {"func": ak.macro_china_bdti_index, "desc": "原油运输指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107668.html"},
-        "超灵便型船运价指数": {"func": ak.macro_china_bsi_index, "desc": "超灵便型船运价指数数据", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107667.html"},
-        "海岬型运费指数": {"func": ak.macro_shipping_bci, "desc": "海岬型运费指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107666.html"},
-        "波罗的海干散货指数": {"func": ak.macro_shipping_bdi, "desc": "波罗的海干散货指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107664.html"},
-        "巴拿马型运费指数": {"func": ak.macro_shipping_bpi, "desc": "巴拿马型运费指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107665.html"},
-        "成品油运输指数": {"func": ak.macro_shipping_bcti, "desc": "成品油运输指数", "url": "https://data.eastmoney.com/cjsj/hyzs_list_EMI00107669.html"},
-        "新增信贷数据": {"func": ak.macro_china_new_financial_credit, "desc": "中国新增信贷数据数据", "url": "http://data.eastmoney.com/cjsj/xzxd.html"},
-        "居民消费价格指数": {"func": ak.macro_china_cpi, "desc": "中国居民消费价格指数", "url": "http://data.eastmoney.com/cjsj/cpi.html"},
-        "国内生产总值": {"func": ak.macro_china_gdp, "desc": "中国国内生产总值", "url": "http://data.eastmoney.com/cjsj/gdp.html"},
-        "工业品出厂价格指数": {"func": ak.macro_china_ppi, "desc": "工业品出厂价格指数", "url": "http://data.eastmoney.com/cjsj/ppi.html"},
-        "采购经理人指数": {"func": ak.macro_china_pmi, "desc": "采购经理人指数", "url": "http://data.eastmoney.com/cjsj/pmi.html"},
-        "中国城镇固定资产投资": {"func": ak.macro_china_gdzctz, "desc": "中国城镇固定资产投资", "url": "http://data.eastmoney.com/cjsj/gdzctz.html"},
-        "海关进出口增减情况": {"func": ak.macro_china_hgjck, "desc": "中国海关进出口增减情况一览表", "url": "https://data.eastmoney.com/cjsj/hgjck.html"},
-        "财政收入": {"func": ak.macro_china_czsr, "desc": "中国财政收入", "url": "http://data.eastmoney.com/cjsj/czsr.html"},
-        "外汇贷款数据": {"func": ak.macro_china_whxd, "desc": "外汇贷款数据", "url": "http://data.eastmoney.com/cjsj/whxd.html"},
-        "本外币存款": {"func": ak.macro_china_wbck, "desc": "本外币存款", "url": "http://data.eastmoney.com/cjsj/wbck.html"},
-        "新债发行": {"func": ak.macro_china_bond_public, "desc": "中国外汇交易中心暨全国银行间同业拆借中心-债券信息披露-新债发行", "url": "https://www.chinamoney.com.cn/chinese/xzjfx/"},
-        "消费者信心指数": {"func": ak.macro_china_xfzxx, "desc": "东方财富网-消费者信心指数", "url": "https://data.eastmoney.com/cjsj/xfzxx.html"},
-        "存款准备金率": {"func": ak.macro_china_reserve_requirement_ratio, "desc": "国家统计局-存款准备金率", "url": "https://data.eastmoney.com/cjsj/ckzbj.html"},
-        "社会消费品零售总额": {"func": ak.macro_china_consumer_goods_retail, "desc": "东方财富-经济数据-社会消费品零售总额", "url": "http://data.eastmoney.com/cjsj/xfp.html"},
-        "全社会用电分类情况表": {"func": ak.macro_china_society_electricity, "desc": "国家统计局-全社会用电分类情况表", "url": "http://finance.sina.com.cn/mac/#industry-6-0-31-1"},
-        "全社会客货运输量": {"func": ak.macro_china_society_traffic_volume, "desc": "国家统计局-全社会客货运输量-非累计", "url": "http://finance.sina.com.cn/mac/#industry-10-0-31-1"},
-        "邮电业务基本情况": {"func": ak.macro_china_postal_telecommunicational, "desc": "国家统计局-邮电业务基本情况-非累计", "url": "http://finance.sina.com.cn/mac/#industry-11-0-31-1"},
-        "国际旅游外汇收入构成": {"func": ak.macro_china_international_tourism_fx, "desc": "国家统计局-国际旅游外汇收入构成", "url": "http://finance.sina.com.cn/mac/#industry-15-0-31-3"},
-        "民航客座率及载运率": {"func": ak.macro_china_passenger_load_factor, "desc": "国家统计局-民航客座率及载运率", "url": "http://finance.sina.com.cn/mac/#industry-20-0-31-1"},
-        "航贸运价指数": {"func": ak.macro_china_freight_index, "desc": "新浪财经-中国宏观经济数据-航贸运价指数", "url": "http://finance.sina.com.cn/mac/#industry-22-0-31-2"},
-        "央行货币当局资产负债": {"func": ak.macro_china_central_bank_balance, "desc": "新浪财经-中国宏观经济数据-央行货币当局资产负债", "url": "http://finance.sina.com.cn/mac/#fininfo-8-0-31-2"},
-        "保险业经营情况": {"func": ak.macro_china_insurance, "desc": "新浪财经-中国宏观经济数据-保险业经营情况", "url": "http://finance.sina.com.cn/mac/#fininfo-19-0-31-3"},
-        "货币供应量": {"func": ak.macro_china_supply_of_money, "desc": "新浪财经-中国宏观经济数据-货币供应量", "url": "http://finance.sina.com.cn/mac/#fininfo-1-0-31-1"},
-        "FR007利率互换曲线历史数据": {"func": ak.macro_china_swap_rate, "desc": "国家统计局-FR007利率互换曲线历史数据 (近一年)", "url": "https://www.chinamoney.com.cn/chinese/bkcurvfxhis/?cfgItemType=72&curveType=FR007", "params": ["start_date", "end_date"]},
-        "央行黄金和外汇储备": {"func": ak.macro_china_foreign_exchange_gold, "desc": "国家统计局-央行黄金和外汇储备", "url": "http://finance.sina.com.cn/mac/#fininfo-5-0-31-2"},
-        "商品零售价格指数": {"func": ak.macro_china_retail_price_index, "desc": "国家统计局-商品零售价格指数", "url": "http://finance.sina.com.cn/mac/#price-12-0-31-1"},
-        "国房景气指数": {"func": ak.macro_china_real_estate, "desc": "国家统计局-国房景气指数", "url": "http://data.eastmoney.com/cjsj/hyzs_list_EMM00121987.html"},
-        "外汇和黄金储备": {"func": ak.macro_china_fx_gold, "desc": "中国外汇和黄金储备", "url": "http://data.eastmoney.com/cjsj/hjwh.html"},
-        "中国货币供应量": {"func": ak.macro_china_money_supply, "desc": "东方财富-经济数据-中国宏观-中国货币供应量", "url": "http://data.eastmoney.com/cjsj/hbgyl.html"},
-        "全国股票交易统计表": {"func": ak.macro_china_stock_market_cap, "desc": "全国股票交易统计表", "url": "http://data.eastmoney.com/cjsj/gpjytj.html"},
-        "上海银行业同业拆借报告": {"func": ak.macro_china_shibor_all, "desc": "上海银行业同业拆借报告", "url": "https://datacenter.jin10.com/reportType/dc_shibor"},
-        "人民币香港银行同业拆息": {"func": ak.macro_china_hk_market_info, "desc": "香港同业拆借报告", "url": "https://datacenter.jin10.com/reportType/dc_hk_market_info"},
-        "中国日度沿海六大电库存(历史)": {"func": ak.macro_china_daily_energy, "desc": "中国日度沿海六大电库存数据(不再更新)", "url": "https://datacenter.jin10.com/reportType/dc_qihuo_energy_report"},
-        "人民币汇率中间价报告(历史)": {"func": ak.macro_china_rmb, "desc": "中国人民币汇率中间价报告(2017-2021)", "url": "https://datacenter.jin10.com/reportType/dc_rmb_data"},
-        "深圳融资融券报告": {"func": ak.macro_china_market_margin_sz, "desc": "深圳融资融券报告", "url": "https://datacenter.jin10.com/reportType/dc_market_margin_sz"},
-        "上海融资融券报告": {"func": ak.macro_china_market_margin_sh, "desc": "上海融资融券报告", "url": "https://datacenter.jin10.com/reportType/dc_market_margin_sse"},
-        "上海黄金交易所报告": {"func": ak.macro_china_au_report, "desc": "上海黄金交易所报告", "url": "https://datacenter.jin10.com/reportType/dc_sge_report"},
-        "股票筹资": {"func": ak.macro_stock_finance, "desc": "同花顺-数据中心-宏观数据-股票筹资", "url": "https://data.10jqka.com.cn/macro/finance/"},
-        "新增人民币贷款": {"func": ak.macro_rmb_loan, "desc": "同花顺-数据中心-宏观数据-新增人民币贷款", "url": "https://data.10jqka.com.cn/macro/loan/"},
-        "人民币存款余额": {"func": ak.macro_rmb_deposit, "desc": "同花顺-数据中心-宏观数据-人民币存款余额", "url": "https://data.10jqka.com.cn/macro/rmb/"},
-    },
-    "国家统计局(通用接口)": {
-        "全国数据": {"func": ak.macro_china_nbs_nation, "desc": "国家统计局全国数据通用接口。请通过下面的下拉菜单选择数据路径。", "url": "https://data.stats.gov.cn/easyquery.htm", "params": ["ui_nbs_nation"]},
-        "地区数据": {"func": ak.macro_china_nbs_region, "desc": "国家统计局地区数据通用接口。请通过下面的下拉菜单选择数据路径。", "url": "https://data.stats.gov.cn/easyquery.htm", "params": ["ui_nbs_region"]},
-    },
-    "全球宏观": {
-        "宏观日历-华尔街见闻": {"func": ak.macro_info_ws, "desc": "华尔街见闻-日历-宏观", "url": "https://wallstreetcn.com/calendar", "params": ["date"]},
-        "全球宏观事件-百度": {"func": ak.news_economic_baidu, "desc": "全球宏观指标重大事件", "url": "https://gushitong.baidu.com/calendar", "params": ["date"]},
-    },
-    "重要机构": {
-       "SPDR黄金ETF持仓": {"func": ak.macro_cons_gold, "desc": "全球最大黄金 ETF—SPDR Gold Trust 持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_etf_gold"},
-       "iShares白银ETF持仓": {"func": ak.macro_cons_silver, "desc": "全球最大白银 ETF--iShares Silver Trust 持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_etf_sliver"},
-       "欧佩克月度报告": {"func": ak.macro_cons_opec_month, "desc": "欧佩克月度原油产量报告", "url": "https://datacenter.jin10.com/reportType/dc_opec_report"},
-       "LME持仓报告": {"func": ak.macro_euro_lme_holding, "desc": "伦敦金属交易所(LME)-持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_lme_traders_report"},
-       "LME库存报告": {"func": ak.macro_euro_lme_stock, "desc": "伦敦金属交易所(LME)-库存报告", "url": "https://datacenter.jin10.com/reportType/dc_lme_report"},
-       "CFTC外汇类非商业持仓": {"func": ak.macro_usa_cftc_nc_holding, "desc": "美国商品期货交易委员会CFTC外汇类非商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_nc_report"},
-       "CFTC商品类非商业持仓": {"func": ak.macro_usa_cftc_c_holding, "desc": "美国商品期货交易委员会CFTC商品类非商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_c_report"},
-       "CFTC外汇类商业持仓": {"func": ak.macro_usa_cftc_merchant_currency_holding, "desc": "美国商品期货交易委员会CFTC外汇类商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_merchant_currency"},
-       "CFTC商品类商业持仓": {"func": ak.macro_usa_cftc_merchant_goods_holding, "desc": "美国商品期货交易委员会 CFTC 商品类商业持仓报告", "url": "https://datacenter.jin10.com/reportType/dc_cftc_merchant_goods"},
-       "CME贵金属成交量": {"func": ak.macro_usa_cme_merchant_goods_holding, "desc": "芝加哥交易所-贵金属成交量数据", "url": "https://datacenter.jin10.com/org"},
-    },
-    "美国宏观": {
-        "美国GDP月度报告": {"func": ak.macro_usa_gdp_monthly, "desc": "美国国内生产总值(GDP)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_gdp"},
-        "美国CPI月率报告": {"func": ak.macro_usa_cpi_monthly, "desc": "美国 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_cpi"},
-        "美国CPI年率报告": {"func": ak.macro_usa_cpi_yoy, "desc": "东方财富-经济数据一览-美国-CPI年率", "url": "https://data.eastmoney.com/cjsj/foreign_0_12.html"},
-        "美国核心CPI月率报告": {"func": ak.macro_usa_core_cpi_monthly, "desc": "美国核心 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_cpi"},
-        "美国个人支出月率报告": {"func": ak.macro_usa_personal_spending, "desc": "美国个人支出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_personal_spending"},
-        "美国零售销售月率报告": {"func": ak.macro_usa_retail_sales, "desc": "美国零售销售月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_retail_sales"},
-        "美国进口物价指数报告": {"func": ak.macro_usa_import_price, "desc": "美国进口物价指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_import_price"},
-        "美国出口价格指数报告": {"func": ak.macro_usa_export_price, "desc": "美国出口价格指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_export_price"},
-        "美联储劳动力市场状况指数": {"func": ak.macro_usa_lmci, "desc": "美联储劳动力市场状况指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_lmci"},
-        "美国失业率报告": {"func": ak.macro_usa_unemployment_rate, "desc": "美国失业率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_unemployment_rate"},
-        "美国挑战者企业裁员人数报告": {"func": ak.macro_usa_job_cuts, "desc": "美国挑战者企业裁员人数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_job_cuts"},
-        "美国非农就业人数报告": {"func": ak.macro_usa_non_farm, "desc": "美国非农就业人数报告", "url": "https://datacenter.jin10.com/reportType/dc_nonfarm_payrolls"},
-        "美国ADP就业人数报告": {"func": ak.macro_usa_adp_employment, "desc": "美国 ADP 就业人数报告", "url": "https://datacenter.jin10.com/reportType/dc_adp_nonfarm_employment"},
-        "美国核心PCE物价指数年率报告": {"func": ak.macro_usa_core_pce_price, "desc": "美国核心 PCE 物价指数年率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_pce_price"},
-        "美国实际个人消费支出季率初值报告": {"func": ak.macro_usa_real_consumer_spending, "desc": "美国实际个人消费支出季率初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_real_consumer_spending"},
-        "美国贸易帐报告": {"func": ak.macro_usa_trade_balance, "desc": "美国贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_trade_balance"},
-        "美国经常帐报告": {"func": ak.macro_usa_current_account, "desc": "美国经常帐报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_current_account"},
-        "贝克休斯钻井报告": {"func": ak.macro_usa_rig_count, "desc": "贝克休斯钻井报告", "url": "https://datacenter.jin10.com/reportType/dc_rig_count_summary"},
-        "美国生产者物价指数(PPI)报告": {"func": ak.macro_usa_ppi, "desc": "美国生产者物价指数(PPI)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ppi"},
-        "美国核心生产者物价指数(PPI)报告": {"func": ak.macro_usa_core_ppi, "desc": "美国核心生产者物价指数(PPI)报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_core_ppi"},
-        "美国API原油库存报告": {"func": ak.macro_usa_api_crude_stock, "desc": "美国 API 原油库存报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_api_crude_stock"},
-        "美国Markit制造业PMI初值报告": {"func": ak.macro_usa_pmi, "desc": "美国 Markit 制造业 PMI 初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_pmi"},
-        "美国ISM制造业PMI报告": {"func": ak.macro_usa_ism_pmi, "desc": "美国 ISM 制造业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ism_pmi"},
-        "美国工业产出月率报告": {"func": ak.macro_usa_industrial_production, "desc": "美国工业产出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_industrial_production"},
-        "美国耐用品订单月率报告": {"func": ak.macro_usa_durable_goods_orders, "desc": "美国耐用品订单月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_durable_goods_orders"},
-        "美国工厂订单月率报告": {"func": ak.macro_usa_factory_orders, "desc": "美国工厂订单月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_factory_orders"},
-        "美国Markit服务业PMI初值报告": {"func": ak.macro_usa_services_pmi, "desc": "美国Markit服务业PMI初值报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_services_pmi"},
-        "美国商业库存月率报告": {"func": ak.macro_usa_business_inventories, "desc": "美国商业库存月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_business_inventories"},
-        "美国ISM非制造业PMI报告": {"func": ak.macro_usa_ism_non_pmi, "desc": "美国 ISM 非制造业 PMI 报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_ism_non_pmi"},
-        "美国NAHB房产市场指数报告": {"func": ak.macro_usa_nahb_house_market_index, "desc": "美国 NAHB 房产市场指数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_nahb_house_market_index"},
-        "美国新屋开工总数年化报告": {"func": ak.macro_usa_house_starts, "desc": "美国新屋开工总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_house_starts"},
-        "美国新屋销售总数年化报告": {"func": ak.macro_usa_new_home_sales, "desc": "美国新屋销售总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_new_home_sales"},
-        "美国营建许可总数报告": {"func": ak.macro_usa_building_permits, "desc": "美国营建许可总数报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_building_permits"},
-        "美国成屋销售总数年化报告": {"func": ak.macro_usa_exist_home_sales, "desc": "美国成屋销售总数年化报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_exist_home_sales"},
-        "美国FHFA房价指数月率报告": {"func": ak.macro_usa_house_price_index, "desc": "美国 FHFA 房价指数月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_house_price_index"},
-        "美国S&P/CS20座大城市房价指数年率报告": {"func": ak.macro_usa_spcs20, "desc": "美国S&P/CS20座大城市房价指数年率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_spcs20"},
-        "美国成屋签约销售指数月率报告": {"func": ak.macro_usa_pending_home_sales, "desc": "美国成屋签约销售指数月率报告", "url": "https://datacenter.jin10.com/reportType/dc_usa_pending_home_sales"},
-        "美国未决房屋销售月率": {"func": ak.macro_usa_phs, "desc": "东方财富-经济数据一览-美国-未决房屋销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_0_5.html"},
-        "美国谘商会消费者信心指数报告": {"func": ak.macro_usa_cb_consumer_confidence, "desc": "美国谘商会消费者信心指数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_cb_consumer_confidence_all.js?v=1578576859"},
-        "美国NFIB小型企业信心指数报告": {"func": ak.macro_usa_nfib_small_business, "desc": "美国NFIB小型企业信心指数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_nfib_small_business_all.js?v=1578576631"},
-        "美国密歇根大学消费者信心指数初值报告": {"func": ak.macro_usa_michigan_consumer_sentiment, "desc": "美国密歇根大学消费者信心指数初值报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228"},
-        "美国EIA原油库存报告": {"func": ak.macro_usa_eia_crude_rate, "desc": "美国EIA原油库存报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228"},
-        "美国初请失业金人数报告": {"func": ak.macro_usa_initial_jobless, "desc": "美国初请失业金人数报告", "url": "https://cdn.jin10.com/dc/reports/dc_usa_michigan_consumer_sentiment_all.js?v=1578576228"},
-        "美国原油产量报告": {"func": ak.macro_usa_crude_inner, "desc": "美国原油产量报告", "url": "https://datacenter.jin10.com/reportType/dc_eia_crude_oil_produce"},
-    },
-    "欧元区宏观": {
-        "欧元区季度GDP年率报告": {"func": ak.macro_euro_gdp_yoy, "desc": "欧元区季度 GDP 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_gdp_yoy"},
-        "欧元区CPI月率报告": {"func": ak.macro_euro_cpi_mom, "desc": "欧元区 CPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_cpi_mom"},
-        "欧元区CPI年率报告": {"func": ak.macro_euro_cpi_yoy, "desc": "欧元区 CPI 年率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_cpi_yoy"},
-        "欧元区PPI月率报告": {"func": ak.macro_euro_ppi_mom, "desc": "欧元区 PPI 月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_ppi_mom"},
-        "欧元区零售销售月率报告": {"func": ak.macro_euro_retail_sales_mom, "desc": "欧元区零售销售月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_retail_sales_mom"},
-        "欧元区季调后就业人数季率报告": {"func": ak.macro_euro_employment_change_qoq, "desc": "欧元区季调后就业人数季率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_employment_change_qoq"},
-        "欧元区失业率报告": {"func": ak.macro_euro_unemployment_rate_mom, "desc": "欧元区失业率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_unemployment_rate_mom"},
-        "欧元区未季调贸易帐报告": {"func": ak.macro_euro_trade_balance, "desc": "欧元区未季调贸易帐报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_trade_balance_mom"},
-        "欧元区经常帐报告": {"func": ak.macro_euro_current_account_mom, "desc": "欧元区经常帐报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_current_account_mom"},
-        "欧元区工业产出月率报告": {"func": ak.macro_euro_industrial_production_mom, "desc": "欧元区工业产出月率报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_industrial_production_mom"},
-        "欧元区制造业PMI初值报告": {"func": ak.macro_euro_manufacturing_pmi, "desc": "欧元区制造业 PMI 初值报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_manufacturing_pmi"},
-        "欧元区服务业PMI终值报告": {"func": ak.macro_euro_services_pmi, "desc": "欧元区服务业 PMI 终值报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_services_pmi"},
-        "欧元区ZEW经济景气指数报告": {"func": ak.macro_euro_zew_economic_sentiment, "desc": "欧元区 ZEW 经济景气指数报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_zew_economic_sentiment"},
-        "欧元区Sentix投资者信心指数报告": {"func": ak.macro_euro_sentix_investor_confidence, "desc": "欧元区 Sentix 投资者信心指数报告", "url": "https://datacenter.jin10.com/reportType/dc_eurozone_sentix_investor_confidence"},
-    },
-    "中国香港宏观": {
-        "消费者物价指数": {"func": ak.macro_china_hk_cpi, "desc": "东方财富-经济数据一览-中国香港-消费者物价指数", "url": "https://data.eastmoney.com/cjsj/foreign_8_0.html"},
-        "消费者物价指数年率": {"func": ak.macro_china_hk_cpi_ratio, "desc": "东方财富-经济数据一览-中国香港-消费者物价指数年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_1.html"},
-        "失业率": {"func": ak.macro_china_hk_rate_of_unemployment, "desc": "东方财富-经济数据一览-中国香港-失业率", "url": "https://data.eastmoney.com/cjsj/foreign_8_2.html"},
-        "香港GDP": {"func": ak.macro_china_hk_gbp, "desc": "东方财富-经济数据一览-中国香港-香港 GDP", "url": "https://data.eastmoney.com/cjsj/foreign_8_3.html"},
-        "香港GDP同比": {"func": ak.macro_china_hk_gbp_ratio, "desc": "东方财富-经济数据一览-中国香港-香港 GDP 同比", "url": "https://data.eastmoney.com/cjsj/foreign_8_4.html"},
-        "香港楼宇买卖合约数量": {"func": ak.macro_china_hk_building_volume, "desc": "东方财富-经济数据一览-中国香港-香港楼宇买卖合约数量", "url": "https://data.eastmoney.com/cjsj/foreign_8_5.html"},
-        "香港楼宇买卖合约成交金额": {"func": ak.macro_china_hk_building_amount, "desc": "东方财富-经济数据一览-中国香港-香港楼宇买卖合约成交金额", "url": "https://data.eastmoney.com/cjsj/foreign_8_6.html"},
-        "香港商品贸易差额年率": {"func": ak.macro_china_hk_trade_diff_ratio, "desc": "东方财富-经济数据一览-中国香港-香港商品贸易差额年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_7.html"},
-        "香港制造业PPI年率": {"func": ak.macro_china_hk_ppi, "desc": "东方财富-经济数据一览-中国香港-香港制造业PPI年率", "url": "https://data.eastmoney.com/cjsj/foreign_8_8.html"},
-    },
-    "德国宏观": {
-        "IFO商业景气指数": {"func": ak.macro_germany_ifo, "desc": "东方财富-数据中心-经济数据一览-IFO商业景气指数", "url": "https://data.eastmoney.com/cjsj/foreign_1_0.html"},
-        "消费者物价指数月率终值": {"func": ak.macro_germany_cpi_monthly, "desc": "东方财富-数据中心-经济数据一览-德国-消费者物价指数月率终值", "url": "https://data.eastmoney.com/cjsj/foreign_1_1.html"},
-        "消费者物价指数年率终值": {"func": ak.macro_germany_cpi_yearly, "desc": "东方财富-数据中心-经济数据一览-德国-消费者物价指数年率终值", "url": "https://data.eastmoney.com/cjsj/foreign_1_2.html"},
-        "贸易帐-季调后": {"func": ak.macro_germany_trade_adjusted, "desc": "东方财富-数据中心-经济数据一览-德国-贸易帐(季调后)", "url": "https://data.eastmoney.com/cjsj/foreign_1_3.html"},
-        "GDP": {"func": ak.macro_germany_gdp, "desc": "东方财富-数据中心-经济数据一览-德国-GDP", "url": "https://data.eastmoney.com/cjsj/foreign_1_4.html"},
-        "实际零售销售月率": {"func": ak.macro_germany_retail_sale_monthly, "desc": "东方财富-数据中心-经济数据一览-德国-实际零售销售月率", "url": "https://data.eastmoney.com/cjsj/foreign_1_5.html"},
-        "实际零售销售年率": {"func": ak.macro_germany_retail_sale_yearly, "desc": "东方财富-数据中心-经济数据一览-德国-实际零售销售年率", "url": "https://data.eastmoney.com/cjsj/foreign_1_6.html"},
-        "ZEW经济景气指数": {"func": ak.macro_germany_zew, "desc": "东方财富-数据中心-经济数据一览-德国-ZEW 经济景气指数", "url": "https://data.eastmoney.com/cjsj/foreign_1_7.html"},
-    },
-    "瑞士宏观": {
-        "SVME采购经理人指数": {"func": ak.macro_swiss_svme, "desc": "东方财富-经济数据-瑞士-SVME采购经理人指数", "url": "http://data.eastmoney.com/cjsj/foreign_2_0.html"},
-        "贸易帐": {"func": ak.macro_swiss_trade, "desc": "东方财富-经济数据-瑞士-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_2_1.html"},
-        "消费者物价指数年率": {"func": ak.macro_swiss_cpi_yearly, "desc": "东方财富-经济数据-瑞士-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_2.html"},
-        "GDP季率": {"func": ak.macro_swiss_gdp_quarterly, "desc": "东方财富-经济数据-瑞士-GDP 季率", "url": "http://data.eastmoney.com/cjsj/foreign_2_3.html"},
-        "GDP年率": {"func": ak.macro_swiss_gbd_yearly, "desc": "东方财富-经济数据-瑞士-GDP 年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_4.html"},
-        "央行公布利率决议": {"func": ak.macro_swiss_gbd_bank_rate, "desc": "东方财富-经济数据-瑞士-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_2_5.html"},
-    },
-    "日本宏观": {
-        "央行公布利率决议": {"func": ak.macro_japan_bank_rate, "desc": "东方财富-经济数据-日本-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_3_0.html"},
-        "全国消费者物价指数年率": {"func": ak.macro_japan_cpi_yearly, "desc": "东方财富-经济数据-日本-全国消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_3_1.html"},
-        "全国核心消费者物价指数年率": {"func": ak.macro_japan_core_cpi_yearly, "desc": "东方财富-经济数据-日本-全国核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_2_2.html"},
-        "失业率": {"func": ak.macro_japan_unemployment_rate, "desc": "东方财富-经济数据-日本-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_2_3.html"},
-        "领先指标终值": {"func": ak.macro_japan_head_indicator, "desc": "东方财富-经济数据-日本-领先指标终值", "url": "http://data.eastmoney.com/cjsj/foreign_3_4.html"},
-    },
-    "英国宏观": {
-        "Halifax房价指数月率": {"func": ak.macro_uk_halifax_monthly, "desc": "东方财富-经济数据-英国-Halifax 房价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_0.html"},
-        "Halifax房价指数年率": {"func": ak.macro_uk_halifax_yearly, "desc": "东方财富-经济数据-英国-Halifax 房价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_1.html"},
-        "贸易帐": {"func": ak.macro_uk_trade, "desc": "东方财富-经济数据-英国-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_4_2.html"},
-        "央行公布利率决议": {"func": ak.macro_uk_bank_rate, "desc": "东方财富-经济数据-英国-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_4_3.html"},
-        "核心消费者物价指数年率": {"func": ak.macro_uk_core_cpi_yearly, "desc": "东方财富-经济数据-英国-核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_4.html"},
-        "核心消费者物价指数月率": {"func": ak.macro_uk_cpi_monthly, "desc": "东方财富-经济数据-英国-核心消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_7.html"},
-        "消费者物价指数年率": {"func": ak.macro_uk_cpi_yearly, "desc": "东方财富-经济数据-英国-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_6.html"},
-        "消费者物价指数月率": {"func": ak.macro_uk_cpi_monthly, "desc": "东方财富-经济数据-英国-消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_7.html"},
-        "零售销售月率": {"func": ak.macro_uk_retail_monthly, "desc": "东方财富-经济数据-英国-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_8.html"},
-        "零售销售年率": {"func": ak.macro_uk_retail_yearly, "desc": "东方财富-经济数据-英国-零售销售年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_9.html"},
-        "Rightmove房价指数年率": {"func": ak.macro_uk_rightmove_yearly, "desc": "东方财富-经济数据-英国-Rightmove 房价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_4_10.html"},
-        "Rightmove房价指数月率": {"func": ak.macro_uk_rightmove_monthly, "desc": "东方财富-经济数据-英国-Rightmove 房价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_4_11.html"},
-        "GDP季率初值": {"func": ak.macro_uk_gdp_quarterly, "desc": "东方财富-经济数据-英国-GDP 季率初值", "url": "http://data.eastmoney.com/cjsj/foreign_4_12.html"},
-        "GDP年率初值": {"func": ak.macro_uk_gdp_yearly, "desc": "东方财富-经济数据-英国-GDP 年率初值", "url": "http://data.eastmoney.com/cjsj/foreign_4_13.html"},
-        "失业率": {"func": ak.macro_uk_unemployment_rate, "desc": "东方财富-经济数据-英国-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_4_14.html"},
-    },
-    "澳大利亚宏观": {
-        "零售销售月率": {"func": ak.macro_australia_retail_rate_monthly, "desc": "东方财富-经济数据-澳大利亚-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_5_0.html"},
-        "贸易帐": {"func": ak.macro_australia_trade, "desc": "东方财富-经济数据-澳大利亚-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_5_1.html"},
-        "失业率": {"func": ak.macro_australia_unemployment_rate, "desc": "东方财富-经济数据-澳大利亚-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_5_2.html"},
-        "生产者物价指数季率": {"func": ak.macro_australia_ppi_quarterly, "desc": "东方财富-经济数据-澳大利亚-生产者物价指数季率", "url": "http://data.eastmoney.com/cjsj/foreign_5_3.html"},
-        "消费者物价指数季率": {"func": ak.macro_australia_cpi_quarterly, "desc": "东方财富-经济数据-澳大利亚-消费者物价指数季率", "url": "http://data.eastmoney.com/cjsj/foreign_5_4.html"},
-        "消费者物价指数年率": {"func": ak.macro_australia_cpi_yearly, "desc": "东方财富-经济数据-澳大利亚-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_5_5.html"},
-        "央行公布利率决议": {"func": ak.macro_australia_bank_rate, "desc": "东方财富-经济数据-澳大利亚-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_5_6.html"},
-    },
-    "加拿大宏观": {
-        "新屋开工": {"func": ak.macro_canada_new_house_rate, "desc": "东方财富-经济数据-加拿大-新屋开工", "url": "http://data.eastmoney.com/cjsj/foreign_7_0.html"},
-        "失业率": {"func": ak.macro_canada_unemployment_rate, "desc": "东方财富-经济数据-加拿大-失业率", "url": "http://data.eastmoney.com/cjsj/foreign_7_1.html"},
-        "贸易帐": {"func": ak.macro_canada_trade, "desc": "东方财富-经济数据-加拿大-贸易帐", "url": "http://data.eastmoney.com/cjsj/foreign_7_2.html"},
-        "零售销售月率": {"func": ak.macro_canada_retail_rate_monthly, "desc": "东方财富-经济数据-加拿大-零售销售月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_3.html"},
-        "央行公布利率决议": {"func": ak.macro_canada_bank_rate, "desc": "东方财富-经济数据-加拿大-央行公布利率决议", "url": "http://data.eastmoney.com/cjsj/foreign_7_4.html"},
-        "核心消费者物价指数年率": {"func": ak.macro_canada_core_cpi_yearly, "desc": "东方财富-经济数据-加拿大-核心消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_7_5.html"},
-        "核心消费者物价指数月率": {"func": ak.macro_canada_core_cpi_monthly, "desc": "东方财富-经济数据-加拿大-核心消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_6.html"},
-        "消费者物价指数年率": {"func": ak.macro_canada_cpi_yearly, "desc": "东方财富-经济数据-加拿大-消费者物价指数年率", "url": "http://data.eastmoney.com/cjsj/foreign_7_7.html"},
-        "消费者物价指数月率": {"func": ak.macro_canada_cpi_monthly, "desc": "东方财富-经济数据-加拿大-消费者物价指数月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_8.html"},
-        "GDP月率": {"func": ak.macro_canada_gdp_monthly, "desc": "东方财富-经济数据-加拿大-GDP 月率", "url": "http://data.eastmoney.com/cjsj/foreign_7_9.html"},
-    }
-}
-
-
-@st.cache_data
-def fetch_data(region_name, dataset_name, **kwargs):
+@st.cache_resource
+def get_fetcher():
+    return DataFetcher()
+
+@st.cache_resource
+def get_metadata_index():
+    # datasets cached before the index existed are described once at startup
+    fetcher = get_fetcher()
+    fetcher.metadata.backfill(fetcher.cache)
+    return fetcher.metadata
+
+@st.cache_resource
+def get_frame_store():
+    return FrameStore()
+
+@st.cache_resource
+def get_task_runner():
+    return TaskRunner()
+
+@st.cache_resource
+def get_transform_engine():
+    return TransformEngine()
+
+@st.cache_resource
+def get_nbs_catalog():
+    return NbsCatalog()
+
+@st.cache_resource
+def get_metrics_exporter():
+    # one exporter per app process; a second process on the same port goes without
     try:
-        func = AKSHARE_MACRO_MAP[region_name][dataset_name]["func"]
-        data = func(**kwargs)
-        return data
+        return start_metrics_server()
+    except OSError:
+        return None
+
+@st.cache_resource
+def get_correlation_scanner(freq, max_lag, min_periods):
+    return CorrelationScanner(max_lag=max_lag, min_periods=min_periods)
+
+# --- Background Loading ---
+# Loads run on the shared TaskRunner, keyed by (session, slot); the script only
+# polls, so a slow upstream never blocks the page.
+INLINE_WAIT = 0.3
+TASK_POLL_SECONDS = 0.5
+
+def load_frame(ref, fetcher, store):
+    # runs on a worker thread: no st.* calls; errors are returned as text
+    try:
+        if ref.history:
+            df = refresh_incremental(fetcher, ref.region_name, ref.dataset_name, ref.kwargs)
+        else:
+            df = fetcher.fetch(ref.region_name, ref.dataset_name, ref.kwargs)
     except Exception as e:
-        st.error(f"获取数据时发生错误: {e}")
+        return f"{e}"
+    # sessions keep a FrameRef; the shared store holds the single compacted copy
+    return store.put(ref.key, df, ref.layout_key) if isinstance(df, pd.DataFrame) else df
+
+def load_workspace(fetcher, store, targets):
+    results = {}
+    for target, df in fetch_many(fetcher, targets).items():
+        if isinstance(df, pd.DataFrame):
+            results[target] = FrameRef(*target)
+            store.put(results[target].key, df, results[target].layout_key)
+        else:
+            results[target] = f"{df}"
+    return results
+
+def task_owner(slot):
+    ctx = get_script_run_ctx()
+    return (ctx.session_id if ctx else None, slot)
+
+def submit_task(slot, label, fn, *args, tag=None):
+    task = get_task_runner().submit(task_owner(slot), label, fn, *args, tag=tag)
+    task.wait(INLINE_WAIT)
+    return task
+
+def consume_task(slot, on_result):
+    # -> the task while it is still running; otherwise hands its outcome to on_result
+    runner = get_task_runner()
+    owner = task_owner(slot)
+    task = runner.get(owner)
+    if task is None:
         return None
+    state = task.state
+    if state in ("queued", "pending", "running"):
+        return task
+    runner.discard(owner, task)
+    if state == "done":
+        on_result(task, task.result())
+    elif state == "failed":
+        on_result(task, f"{task.future.exception()}")
+    elif state == "timeout":
+        # the worker cannot be interrupted; its late result is simply dropped
+        task.cancel()
+        on_result(task, f"请求超时 (超过 {task.timeout:.0f} 秒)，已放弃等待")
+    return None
+
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def render_task_status(slot, on_result, on_cancel):
+    task = consume_task(slot, on_result)
+    if task is None:
+        st.rerun()
+    col_msg, col_cancel = st.columns([5, 1])
+    if task.state == "running":
+        col_msg.info(f"正在后台加载 {task.label}，已用时 {task.elapsed:.0f} 秒。可以继续浏览，完成后自动显示。")
+    else:
+        col_msg.info(f"{task.label} 正在排队等待空闲的加载线程，已等待 {task.elapsed:.0f} 秒。")
+    col_cancel.button("取消加载", key=f"cancel_{slot}", on_click=on_cancel)
+
+def format_bytes(size):
+    return f"{size / 1024 / 1024:.1f} MB"
+
+def render_memory_report():
+    store = get_frame_store()
+    stats = store.stats()
+    refs = [st.session_state.get("data"), *st.session_state.get("workspace_frames", {}).values()]
+    sizes = {ref.key: (ref, store.nbytes(ref.key)) for ref in refs if isinstance(ref, FrameRef)}
+    resident = sum(size for _, size in sizes.values() if size is not None)
+    with st.sidebar.expander("内存占用"):
+        st.markdown(
+            f"**共享数据缓存:** {format_bytes(stats['bytes'])} / {format_bytes(stats['max_bytes'])}，"
+            f"{stats['entries']} 个数据集"
+        )
+        st.markdown(f"**当前会话引用:** {len(sizes)} 个数据集，{format_bytes(resident)} (与其他会话共享)")
+        for ref, size in sizes.values():
+            st.caption(f"{ref.region_name}/{ref.dataset_name}: " + (format_bytes(size) if size is not None else "已换出，使用时从磁盘缓存重新加载"))
 
-def find_and_format_date_column(df):
-    date_col_names = ['date', '日期', '年份', '月份', '季度', '时间', '统计时间', '数据日期', 'TRADE_DATE']
-    df_copy = df.copy()
-    if 'item' in df_copy.columns and 'value' in df_copy.columns and 'date' in df_copy.columns:
-        try:
-            df_copy['date'] = pd.to_datetime(df_copy['date'], format='%Y%m')
-            df_pivot = df_copy.pivot(index='date', columns='item', values='value').reset_index()
-            return df_pivot, 'date'
-        except Exception:
-            pass
-    for col in df_copy.columns:
-        if any(name in col.lower() for name in date_col_names):
-            try:
-                df_copy[col] = pd.to_datetime(df_copy[col], errors='coerce')
-                df_copy.dropna(subset=[col], inplace=True)
-                return df_copy, col
-            except Exception:
-                continue
-    return df_copy, None
+def browse_nbs_tree(catalog, kind, dataset_name, node_id):
+    # one selectbox per level; a subtree is fetched only once it is expanded
+    path = catalog.node_path(kind, node_id)
+    depth = len(path.split(PATH_SEPARATOR)) + 1 if path else 1
+    while True:
+        children = catalog.children(kind, node_id)
+        if not children:
+            return node_id
+        choice = st.sidebar.selectbox(
+            f"选择{depth}级目录", children, format_func=lambda child: child[1],
+            key=f"nbs_{dataset_name}_{kind}_{node_id}"
+        )
+        node_id, _, is_leaf = choice
+        if is_leaf:
+            return node_id
+        depth += 1
 
 def render_nbs_ui(dataset_name):
     st.sidebar.subheader("数据路径选择")
+    catalog = get_nbs_catalog()
     param_inputs = {}
-    data_structure = NBS_DATA_STRUCTURE if dataset_name == "全国数据" else NBS_REGION_DATA_STRUCTURE
-    
-    kind = st.sidebar.selectbox("选择数据类型", list(data_structure.keys()), key=f"nbs_{dataset_name}_kind")
+
+    kind = st.sidebar.selectbox("选择数据类型", list(NBS_KINDS[dataset_name]), key=f"nbs_{dataset_name}_kind")
     param_inputs['kind'] = kind
-    
-    level1_keys = list(data_structure[kind].keys())
-    level1_choice = st.sidebar.selectbox("选择一级目录", level1_keys, key=f"nbs_{dataset_name}_l1")
-    path_parts = [level1_choice]
-    
-    level2_data = data_structure[kind].get(level1_choice)
-    if isinstance(level2_data, dict):
-        level2_keys = list(level2_data.keys())
-        level2_choice = st.sidebar.selectbox("选择二级目录", level2_keys, key=f"nbs_{dataset_name}_l2")
-        path_parts.append(level2_choice)
-    
-    param_inputs['path'] = " > ".join(path_parts)
-    st.sidebar.success(f"已选路径: `{param_inputs['path']}`")
 
-    if dataset_name == "地区数据":
-        param_inputs['indicator'] = st.sidebar.text_input("输入指标 (indicator)", "例如: 地区生产总值_累计值(亿元)")
-        param_inputs['region'] = st.sidebar.text_input("输入地区 (region)", "例如: 河北省")
+    query = st.sidebar.text_input("搜索目录或指标 (支持拼音/首字母)", key=f"nbs_{dataset_name}_query")
+    hits = catalog.search(kind, query) if query else []
+    hit = None
+    if hits:
+        hit = st.sidebar.selectbox(
+            "搜索结果", hits, key=f"nbs_{dataset_name}_hit",
+            format_func=lambda h: h["path"] + (f" > {h['indicator']}" if h["indicator"] else "")
+        )
+    elif query:
+        st.sidebar.caption("本地目录中没有匹配项。展开过的目录会自动加入索引，也可运行 macro_nbs_catalog.py 预先构建完整目录。")
+
+    try:
+        node_id = browse_nbs_tree(catalog, kind, dataset_name, hit["node_id"] if hit else ROOT_ID)
+        param_inputs['path'] = catalog.node_path(kind, node_id)
+        st.sidebar.success(f"已选路径: `{param_inputs['path']}`")
+
+        if dataset_name == "地区数据":
+            indicators = catalog.indicators(kind, node_id)
+            preset = hit["indicator"] if hit and hit["indicator"] in indicators else None
+            param_inputs['indicator'] = st.sidebar.selectbox(
+                "选择指标 (indicator)", indicators, index=indicators.index(preset) if preset else 0,
+                key=f"nbs_{dataset_name}_{kind}_{node_id}_indicator"
+            )
+            param_inputs['region'] = st.sidebar.selectbox("选择地区 (region)", catalog.regions(kind), key=f"nbs_{dataset_name}_{kind}_region")
+    except Exception as e:
+        st.sidebar.error(f"加载统计局目录失败: {e}")
+        return None
 
     st.sidebar.subheader("时间区间")
     st.sidebar.markdown("示例: `2023` (年), `2023A` (季), `LAST10` (最近10期)")
@@ -342,28 +215,245 @@ def render_nbs_ui(dataset_name):
     
     return param_inputs
 
+def open_dataset(region_name, dataset_name):
+    st.session_state.main_region = region_name
+    st.session_state.main_dataset = dataset_name
+    reset_dataset_view()
+
+def render_catalog_search():
+    query = st.sidebar.text_input("搜索数据集 (名称/描述/列名)", key="catalog_query")
+    if not query:
+        return
+    try:
+        hits = get_metadata_index().search(query)
+    except sqlite3.Error:
+        # locked or corrupt index file, or SQLite built without FTS5
+        st.sidebar.caption("数据集索引暂不可用，无法搜索。")
+        return
+    if not hits:
+        st.sidebar.caption("没有匹配的数据集。")
+        return
+    hit = st.sidebar.selectbox("匹配的数据集", hits, format_func=lambda h: f"{h[0]}/{h[1]}", key="catalog_hit")
+    st.sidebar.button("打开该数据集", on_click=open_dataset, args=hit)
+
+def render_dataset_metadata(meta):
+    if not meta or meta["rows"] is None:
+        st.sidebar.caption("尚未缓存：获取一次后即可在此查看行数、日期范围和列信息。")
+        return
+    lines = [f"**缓存行数:** {meta['rows']}"]
+    if meta["first_date"]:
+        lines.append(f"**日期范围:** {meta['first_date']} ~ {meta['last_date']} (日期列 `{meta['date_col']}`)")
+    freq = meta["freq"] or "未知"
+    if meta["observed_freq"] and meta["observed_freq"] != meta["freq"]:
+        freq += f" (实测 {meta['observed_freq']})"
+    lines.append(f"**频率:** {freq}")
+    lines.append(f"**列:** {', '.join(meta['columns'])}")
+    refreshed = datetime.fromtimestamp(meta["fetched_at"]).strftime("%Y-%m-%d %H:%M")
+    if meta["fetch_seconds"] is not None:
+        refreshed += f" (耗时 {meta['fetch_seconds']:.1f}s)"
+    lines.append(f"**最近刷新:** {refreshed}")
+    if meta["kwargs"]:
+        lines.append(f"**参数:** `{meta['kwargs']}`")
+    st.sidebar.caption("\n\n".join(lines))
+
+def reset_dataset_view():
+    # only the single-dataset view is reset; the comparison workspace survives
+    get_task_runner().cancel(task_owner("dataset"))
+    for key in ("data", "dataset_name", "dataset_info", "layout_key"):
+        st.session_state.pop(key, None)
+
+def finish_dataset_load(task, result):
+    # a loaded frame is already in the shared store; only errors need recording
+    if not isinstance(result, pd.DataFrame):
+        st.session_state.data = result
+
+def finish_workspace_load(task, result):
+    workspace = st.session_state.get("workspace", [])
+    results = result if isinstance(result, dict) else {target: result for target in task.tag}
+    for target, value in results.items():
+        if target not in workspace:
+            continue
+        if isinstance(value, FrameRef):
+            st.session_state.workspace_frames[target] = value
+        else:
+            st.session_state.workspace_errors[target] = value
+
+def cancel_workspace_load():
+    task = get_task_runner().cancel(task_owner("workspace"))
+    if task is not None:
+        finish_workspace_load(task, "已取消")
+
+def render_workspace():
+    st.header("🔀 多序列对比")
+    workspace = st.session_state.setdefault("workspace", [])
+    frames = st.session_state.setdefault("workspace_frames", {})
+    errors = st.session_state.setdefault("workspace_errors", {})
+
+    st.sidebar.header("添加数据集")
+    region = st.sidebar.selectbox("选择一个国家/地区:", list(AKSHARE_MACRO_MAP.keys()), key="ws_region")
+    # only parameterless interfaces have a well-defined default request
+    dataset_names = [name for name, info in AKSHARE_MACRO_MAP[region].items() if not info.get("params")]
+    if not dataset_names:
+        st.sidebar.info("该分类下的数据集需要参数，请在单数据集模式中查看。")
+    else:
+        dataset = st.sidebar.selectbox("选择一个数据集:", dataset_names, key="ws_dataset")
+        if st.sidebar.button("加入对比", type="primary") and (region, dataset) not in workspace:
+            workspace.append((region, dataset))
+
+    if not workspace:
+        st.info("从侧边栏添加多个数据集（可跨国家/地区），即可在同一频率下对比。")
+        return
+
+    kept = st.multiselect(
+        "对比中的数据集:", workspace, default=workspace,
+        format_func=lambda target: f"{target[0]}/{target[1]}"
+    )
+    if kept != workspace:
+        workspace[:] = kept
+        for target in list(frames) + list(errors):
+            if target not in kept:
+                frames.pop(target, None)
+                errors.pop(target, None)
+
+    store = get_frame_store()
+    task = consume_task("workspace", finish_workspace_load)
+    # never loaded, or evicted from the shared store since the last rerun
+    missing = tuple(
+        target for target in workspace
+        if target not in errors and (target not in frames or store.get(frames[target].key) is None)
+    )
+    if missing and (task is None or task.tag != missing):
+        task = submit_task("workspace", f"{len(missing)} 个数据集", load_workspace, get_fetcher(), store, missing, tag=missing)
+        task = consume_task("workspace", finish_workspace_load)
+    if task is not None:
+        render_task_status("workspace", finish_workspace_load, cancel_workspace_load)
+
+    loaded = {}
+    options = {}
+    for region_name, dataset_name in workspace:
+        if (region_name, dataset_name) in errors:
+            st.error(f"{region_name}/{dataset_name} 获取失败: {errors[(region_name, dataset_name)]}。移除后重新加入即可重试。")
+            continue
+        ref = frames.get((region_name, dataset_name))
+        df = store.get(ref.key) if ref is not None else None
+        if df is None:
+            # still loading in the background
+            continue
+        loaded[(region_name, dataset_name)] = df
+        layout_key = f"{region_name}/{dataset_name}"
+        for col in numeric_columns(df, layout_key):
+            options[series_label(region_name, dataset_name, col)] = (region_name, dataset_name, col)
+
+    selected = st.multiselect("选择要对比的序列:", list(options))
+    col_freq, col_agg = st.columns(2)
+    freq_label = col_freq.selectbox("对齐频率:", list(ALIGN_FREQUENCIES), index=2)
+    agg_label = col_agg.selectbox("重采样规则:", list(ALIGN_AGGREGATIONS))
+    if not selected:
+        st.info("请至少选择一个序列。")
+        return
+
+    series = {}
+    for label in selected:
+        region_name, dataset_name, col = options[label]
+        series[label] = extract_series(loaded[(region_name, dataset_name)], f"{region_name}/{dataset_name}", col)
+    aligned = align_series(series, ALIGN_FREQUENCIES[freq_label], ALIGN_AGGREGATIONS[agg_label])
+    if aligned.empty:
+        st.warning("所选序列没有可对齐的数据。")
+        return
+
+    fig = build_line_chart(aligned.reset_index(), "date", list(aligned.columns), title=f"多序列对比 ({freq_label})")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(aligned)
+
+def render_correlation():
+    st.header("🧭 相关性与领先滞后扫描")
+    st.caption("扫描本地缓存中的全部数值序列（可先运行 macro_warmup.py 预热缓存），在同一频率下计算两两相关及领先/滞后相关。")
+
+    st.sidebar.header("扫描设置")
+    freq_label = st.sidebar.selectbox("对齐频率:", list(ALIGN_FREQUENCIES), index=2, key="corr_freq")
+    max_lag = st.sidebar.slider("最大领先/滞后期数:", 0, 24, 12, key="corr_max_lag")
+    min_periods = st.sidebar.number_input("最少重叠期数:", min_value=3, value=MIN_PERIODS, step=1, key="corr_min_periods")
+
+    if st.sidebar.button("扫描缓存数据", type="primary"):
+        scanner = get_correlation_scanner(ALIGN_FREQUENCIES[freq_label], max_lag, int(min_periods))
+        with st.spinner("正在读取缓存并计算相关矩阵..."):
+            aligned = aligned_matrix(cached_series(get_fetcher().cache), ALIGN_FREQUENCIES[freq_label], int(min_periods))
+            recomputed = scanner.update(aligned)
+        st.session_state.corr_scanner = scanner
+        st.sidebar.success(f"共 {len(scanner.columns)} 个序列，重新计算 {recomputed} 个。")
+
+    scanner = st.session_state.get("corr_scanner")
+    if scanner is None or not scanner.columns:
+        st.info("点击侧边栏的“扫描缓存数据”开始。缓存中没有足够长的序列时结果为空。")
+        return
+
+    target = st.selectbox("目标序列:", scanner.columns)
+    top_n = st.slider("显示前 N 个相关指标:", 5, 50, 10)
+    related = scanner.top_related(target, top_n)
+    st.markdown("“领先期数”为正表示目标序列领先该指标，为负表示目标序列滞后于该指标。")
+    st.dataframe(related.round(3), hide_index=True)
+
+def render_metrics_panel():
+    exporter = get_metrics_exporter()
+    with st.sidebar.expander("性能指标 (调试)"):
+        if exporter is not None:
+            host, port = exporter.server_address[:2]
+            st.caption(f"Prometheus 抓取地址: http://{host}:{port}/metrics")
+        else:
+            st.caption("指标导出端口被占用，本进程的计时仅在此处显示。")
+        stats = METRICS.snapshot()
+        if not stats:
+            st.caption("尚无计时数据。")
+            return
+        rows = [
+            {
+                "阶段": STAGE_LABELS.get(stage, stage), "次数": s["count"], "合计 (秒)": round(s["sum"], 3),
+                "平均 (毫秒)": round(s["sum"] / s["count"] * 1000, 1),
+                "最近 (毫秒)": round(s["last"] * 1000, 1), "最大 (毫秒)": round(s["max"] * 1000, 1),
+            }
+            for stage, s in stats.items()
+        ]
+        st.dataframe(pd.DataFrame(rows).sort_values("合计 (秒)", ascending=False), hide_index=True)
+        st.caption("本进程内累计，所有会话共享。macro_api.py 在其端口的 /metrics 提供 API 进程的同类计时。")
+        st.button("清零", key="reset_metrics", on_click=METRICS.reset)
+
 def main():
     st.title("📈 AKShare 宏观数据可视化平台")
     st.markdown("从侧边栏选择一个宏观经济数据集进行探索。")
 
+    mode = st.sidebar.radio("模式", ["单数据集浏览", "多序列对比", "相关性扫描"], horizontal=True)
+    if mode == "多序列对比":
+        render_workspace()
+    elif mode == "相关性扫描":
+        render_correlation()
+    else:
+        render_dataset_view()
+    render_memory_report()
+    render_metrics_panel()
+
+def render_dataset_view():
     if 'data' not in st.session_state:
         st.session_state.data = None
         st.session_state.dataset_name = ""
         st.session_state.dataset_info = {}
+        st.session_state.layout_key = None
 
     st.sidebar.header("数据选择")
+    render_catalog_search()
     
     selected_region = st.sidebar.selectbox(
         "选择一个国家/地区:",
         list(AKSHARE_MACRO_MAP.keys()),
-        on_change=lambda: st.session_state.clear()
+        key="main_region",
+        on_change=reset_dataset_view
     )
 
     region_datasets = AKSHARE_MACRO_MAP[selected_region]
     selected_dataset_name = st.sidebar.selectbox(
         "选择一个数据集:",
         list(region_datasets.keys()),
-        on_change=lambda: st.session_state.clear()
+        key="main_dataset",
+        on_change=reset_dataset_view
     )
     
     dataset_info = region_datasets[selected_dataset_name]
@@ -372,6 +462,13 @@ def main():
     desc = dataset_info['desc']
     url = dataset_info.get('url', 'N/A')
     st.sidebar.info(f"**数据描述:**\n\n{desc}\n\n**数据源地址:**\n\n{url}")
+    try:
+        meta = get_metadata_index().get(selected_region, selected_dataset_name)
+    except sqlite3.Error:
+        # the index is a convenience, as on the fetch path: skip the panel
+        pass
+    else:
+        render_dataset_metadata(meta)
 
     param_inputs = {}
     is_nbs_interface = "ui_nbs" in params[0] if params else False
@@ -388,15 +485,34 @@ def main():
             elif "city" in p:
                 param_inputs[p] = st.sidebar.text_input(f"输入 {p}", value="北京" if p == "city_first" else "上海")
     
-    if st.sidebar.button("获取并可视化数据", type="primary"):
-        with st.spinner("正在加载数据..."):
-            df_raw = fetch_data(selected_region, selected_dataset_name, **param_inputs)
-            st.session_state.data = df_raw
-            st.session_state.dataset_name = selected_dataset_name
-            st.session_state.dataset_info = dataset_info
+    incremental = False
+    if dataset_info.get("window"):
+        incremental = st.sidebar.checkbox("增量更新 (保留已下载的历史数据)", value=True)
+
+    if st.sidebar.button("获取并可视化数据", type="primary", disabled=param_inputs is None):
+        ref = FrameRef(selected_region, selected_dataset_name, param_inputs, history=incremental)
+        # a new request supersedes one still running for this session
+        submit_task("dataset", f"{selected_region}/{selected_dataset_name}", load_frame, ref, get_fetcher(), get_frame_store(), tag=ref.key)
+        st.session_state.data = ref
+        st.session_state.dataset_name = selected_dataset_name
+        st.session_state.dataset_info = dataset_info
+        st.session_state.layout_key = f"{selected_region}/{selected_dataset_name}"
     
+    if isinstance(st.session_state.data, FrameRef):
+        ref = st.session_state.data
+        task = consume_task("dataset", finish_dataset_load)
+        if task is None and st.session_state.data is ref and get_frame_store().get(ref.key) is None:
+            # evicted from the shared store: reload it from the disk cache
+            submit_task("dataset", f"{ref.region_name}/{ref.dataset_name}", load_frame, ref, get_fetcher(), get_frame_store(), tag=ref.key)
+            task = consume_task("dataset", finish_dataset_load)
+        if task is not None:
+            render_task_status("dataset", finish_dataset_load, reset_dataset_view)
+            return
+
     if st.session_state.data is not None:
         df_raw = st.session_state.data
+        if isinstance(df_raw, FrameRef):
+            df_raw = get_frame_store().get(df_raw.key)
         
         if isinstance(df_raw, pd.DataFrame) and not df_raw.empty:
             st.header(f"📊 {st.session_state.dataset_name}")
@@ -404,51 +520,63 @@ def main():
             st.markdown(f"**数据描述:** {info['desc']}")
             st.markdown(f"**数据源地址:** [{info.get('url', 'N/A')}]({info.get('url', 'N/A')})")
             
-            df, date_col = find_and_format_date_column(df_raw)
+            df, date_col, numeric_cols = normalize(df_raw, layout_key=st.session_state.layout_key)
             
             st.subheader("数据预览 (原始文本保留)")
             st.dataframe(df)
 
             st.subheader("数据可视化")
             
-            df_for_plotting = df.copy()
             if date_col:
-                for col in df_for_plotting.columns:
-                    if col != date_col:
-                        df_for_plotting[col] = pd.to_numeric(df_for_plotting[col], errors='coerce')
-                
-                numeric_cols = df_for_plotting.select_dtypes(include=['number']).columns.tolist()
-                
                 if not numeric_cols:
-                    st.warning("在数据中未找到可绘制的数值列。")
+                    st.warning("在数据中除日期外未找到可绘制的数值列。")
                 else:
-                    if date_col in numeric_cols:
-                        numeric_cols.remove(date_col)
-                    
-                    if not numeric_cols:
-                         st.warning("在数据中除日期外未找到可绘制的数值列。")
-                    else:
-                        y_axis_options = st.multiselect(
-                            "选择要绘制的 Y 轴数据:",
-                            options=numeric_cols,
-                            default=numeric_cols[0] if numeric_cols else []
-                        )
-
-                        if y_axis_options:
-                            try:
-                                fig = px.line(
-                                    df_for_plotting,
-                                    x=date_col,
-                                    y=y_axis_options,
-                                    title=f"{st.session_state.dataset_name} - 时间序列图"
+                    y_axis_options = st.multiselect(
+                        "选择要绘制的 Y 轴数据:",
+                        options=numeric_cols,
+                        default=numeric_cols[0] if numeric_cols else []
+                    )
+                    transform_label = st.selectbox("衍生指标:", ["原始数据", *TRANSFORM_LABELS])
+                    window = 3
+                    if transform_label == "移动平均":
+                        window = st.number_input("移动平均窗口 (期数):", min_value=2, max_value=120, value=3)
+
+                    if y_axis_options:
+                        try:
+                            if transform_label == "原始数据":
+                                df_for_plotting = numeric_frame(df, date_col, y_axis_options)
+                            else:
+                                # derived series are computed for all numeric columns at once and cached
+                                # keyed by request: different kwargs give different series
+                                derived = get_transform_engine().apply(
+                                    st.session_state.data.key,
+                                    prepare_frame(df, date_col, numeric_cols),
+                                    TRANSFORM_LABELS[transform_label],
+                                    window=int(window)
                                 )
-                                fig.update_traces(connectgaps=False)
-                                fig.update_layout(xaxis_title="日期", yaxis_title="数值", legend_title_text='指标')
-                                st.plotly_chart(fig, use_container_width=True)
-                            except Exception as e:
-                                st.error(f"创建图表时出错: {e}. 请检查数据格式。")
-                        else:
-                            st.info("请至少选择一个 Y 轴数据进行绘图。")
+                                df_for_plotting = derived[y_axis_options].reset_index()
+                            x_range = None
+                            if needs_downsampling(df_for_plotting):
+                                # zooming in re-samples the selected window at full chart resolution
+                                first, last = df_for_plotting[date_col].min(), df_for_plotting[date_col].max()
+                                x_range = st.slider(
+                                    "缩放时间区间:",
+                                    min_value=first.to_pydatetime(),
+                                    max_value=last.to_pydatetime(),
+                                    value=(first.to_pydatetime(), last.to_pydatetime())
+                                )
+                            fig = build_line_chart(
+                                df_for_plotting,
+                                date_col,
+                                y_axis_options,
+                                title=f"{st.session_state.dataset_name} - 时间序列图",
+                                x_range=x_range
+                            )
+                            st.plotly_chart(fig, use_container_width=True)
+                        except Exception as e:
+                            st.error(f"创建图表时出错: {e}. 请检查数据格式。")
+                    else:
+                        st.info("请至少选择一个 Y 轴数据进行绘图。")
             else:
                 st.info("无法自动识别此数据集中的日期列用于绘制时间序列图。")
                 
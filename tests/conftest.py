@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+# modules read MACRO_CACHE_DIR at import time; keep test runs out of the real cache
+os.environ.setdefault("MACRO_CACHE_DIR", tempfile.mkdtemp(prefix="macro_test_cache_"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from macro_cache import DatasetCache
+from macro_fetch import DataFetcher
+
+
+@pytest.fixture
+def make_fetcher(tmp_path):
+    def factory(registry, functions, **kwargs):
+        # functions: akshare function name -> callable, in place of the real module
+        kwargs.setdefault("cache", DatasetCache(root=str(tmp_path / "cache")))
+        return DataFetcher(registry=registry, resolver=lambda info: functions[info["func"]], **kwargs)
+    return factory
@@ -0,0 +1,115 @@
+import threading
+
+import pandas as pd
+import pytest
+import requests
+
+from macro_api import make_server
+from macro_cache import DatasetCache
+
+REGISTRY = {
+    "中国宏观": {
+        "CPI": {"func": "cpi", "desc": "居民消费价格指数", "url": "https://data.eastmoney.com/", "freq": "monthly"},
+        "行业列表": {"func": "industries", "desc": "行业", "url": "https://data.eastmoney.com/", "freq": "static"},
+        "城市": {"func": "cities", "desc": "", "url": "https://data.eastmoney.com/", "params": ["city"]},
+    },
+    "国家统计局": {
+        "全国数据": {"func": "nbs", "desc": "", "url": "https://data.stats.gov.cn/", "params": ["ui_nbs_nation"]},
+    },
+}
+FUNCTIONS = {
+    "cpi": lambda: pd.DataFrame({"日期": ["2024-01-01", "2024-02-01", "2024-03-01"], "今值": ["0.1", "0.2", "0.3"]}),
+    "industries": lambda: pd.DataFrame({"行业": ["银行", "保险"], "代码": ["B1", "B2"]}),
+    "cities": lambda city: pd.DataFrame({"城市": [city], "值": [1.0]}),
+    "nbs": lambda kind, path, period="LAST10": pd.DataFrame({"时间": ["2024"], "值": [len(path)]}),
+}
+
+
+@pytest.fixture
+def serve(make_fetcher):
+    servers = []
+
+    def start(**kwargs):
+        server = make_server(port=0, fetcher=make_fetcher(REGISTRY, FUNCTIONS, **kwargs))
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_catalog_lists_the_fetcher_registry(serve):
+    response = requests.get(f"{serve()}/datasets")
+    assert response.status_code == 200
+    catalog = {d["dataset"]: d for d in response.json()}
+    assert list(catalog) == ["CPI", "行业列表", "城市", "全国数据"]
+    assert catalog["全国数据"]["params"] == ["kind", "path", "period"]
+
+
+def test_slice_returns_numbers(serve):
+    response = requests.get(f"{serve()}/datasets/中国宏观/CPI", params={"start": "2024-02-01"})
+    assert response.status_code == 200
+    assert [row["今值"] for row in response.json()] == [0.2, 0.3]
+
+
+def test_matching_etag_returns_304(serve):
+    url = f"{serve()}/datasets/中国宏观/CPI"
+    etag = requests.get(url).headers["ETag"]
+    assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+    # options are part of the tag
+    assert requests.get(url, params={"columns": "今值"}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_uncached_result_is_tagged_by_content(serve, tmp_path):
+    # a cache too small to keep anything: the ETag comes from the payload
+    url = f"{serve(cache=DatasetCache(root=str(tmp_path / 'tiny'), max_bytes=0))}/datasets/中国宏观/CPI"
+    first = requests.get(url)
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert requests.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    sliced = requests.get(url, params={"start": "2024-03-01"}, headers={"If-None-Match": first.headers["ETag"]})
+    assert sliced.status_code == 200 and sliced.headers["ETag"] != first.headers["ETag"]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/datasets/中国宏观/CPI", {"format": "csv"}),
+    ("/datasets/中国宏观/CPI", {"columns": "前值"}),
+    ("/datasets/中国宏观/行业列表", {"start": "2024-01-01"}),
+    ("/datasets/中国宏观/CPI", {"city": "北京"}),
+    ("/datasets/中国宏观/城市", {"city": "北京", "country": "中国"}),
+    ("/datasets/国家统计局/全国数据", {"kind": "月度数据", "path": "价格指数", "region": "北京市"}),
+])
+def test_bad_requests_return_400(serve, path, params):
+    response = requests.get(f"{serve()}{path}", params=params)
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+@pytest.mark.parametrize("path", ["/datasets/中国宏观/PPI", "/datasets/美国宏观/CPI", "/nothing"])
+def test_unknown_paths_return_404(serve, path):
+    assert requests.get(f"{serve()}{path}").status_code == 404
+
+
+def test_declared_params_are_passed_through(serve):
+    base = serve()
+    assert requests.get(f"{base}/datasets/中国宏观/城市", params={"city": "北京"}).json() == [{"城市": "北京", "值": 1.0}]
+    nbs = requests.get(f"{base}/datasets/国家统计局/全国数据", params={"kind": "月度数据", "path": "价格指数", "period": "2024"})
+    assert nbs.status_code == 200
+
+
+@pytest.mark.parametrize("header, status", [
+    ("{etag}", 304),
+    ('"other", {etag}', 304),
+    ("W/{etag}", 304),
+    ("*", 304),
+    ('"other"', 200),
+    ("{prefix}", 200),
+    ("x{etag}x", 200),
+])
+def test_if_none_match_compares_whole_tags(serve, header, status):
+    url = f"{serve()}/datasets/中国宏观/CPI"
+    etag = requests.get(url).headers["ETag"]
+    value = header.format(etag=etag, prefix=etag[:-3] + '"')
+    assert requests.get(url, headers={"If-None-Match": value}).status_code == status
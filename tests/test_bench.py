@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from macro_bench import NOISE_FLOOR, compare, main, run
+
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory):
+    return run(["cn_month"], repeat=1, fixture_dir=str(tmp_path_factory.mktemp("fixtures")))
+
+
+def test_run_times_every_stage_offline(results):
+    result = results["cn_month"]
+    assert result["source"] == "synthetic" and result["rows"] > 0
+    assert {"cache_read", "parse_dates", "normalize", "chart"} <= set(result["stages"])
+
+
+@pytest.mark.parametrize("seconds, base, flagged", [
+    (0.100, 0.050, True),                     # twice as slow
+    (0.070, 0.050, False),                    # within the tolerance
+    (0.001, 0.0002, False),                   # five times, but below the noise floor
+    (0.0002 + NOISE_FLOOR * 2, 0.0002, True),
+    (0.100, None, False),                     # stage missing from the baseline
+])
+def test_compare_flags_regressions_and_ignores_noise(seconds, base, flagged):
+    current = {"f": {"stages": {"parse_dates": seconds}}}
+    baseline = {"f": {"stages": {} if base is None else {"parse_dates": base}}}
+    assert bool(compare(current, baseline, tolerance=0.5)) is flagged
+
+
+def test_cli_exit_code_follows_the_baseline(tmp_path):
+    fixture_dir, out = str(tmp_path / "fixtures"), tmp_path / "bench.json"
+    args = ["--fixture", "cn_month", "--repeat", "1", "--fixture-dir", fixture_dir]
+    assert main(args + ["--out", str(out)]) == 0
+    measured = json.loads(out.read_text(encoding="utf-8"))
+    # against itself with a generous tolerance: no regression
+    assert main(args + ["--baseline", str(out), "--tolerance", "10"]) == 0
+    # against an impossibly fast baseline: the slowest stage regresses
+    fast = {"cn_month": {"stages": {stage: 0.0 for stage in measured["cn_month"]["stages"]}}}
+    (tmp_path / "fast.json").write_text(json.dumps(fast), encoding="utf-8")
+    assert main(args + ["--baseline", str(tmp_path / "fast.json")]) == 1
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from macro_cache import DAY, DEFAULT_TTL, HOUR, DatasetCache, cache_key, dataset_ttl
+
+REGISTRY = {"中国宏观": {"CPI": {"func": "cpi", "desc": "", "url": "https://data.eastmoney.com/", "freq": "monthly"}}}
+
+
+def frame(value, rows=50):
+    return pd.DataFrame({"日期": pd.date_range("2020-01-01", periods=rows, freq="MS").strftime("%Y-%m-%d"), "值": [value] * rows})
+
+
+def age_file(cache, name, seconds, atime=None):
+    path = cache._path(cache_key("中国宏观", name, {}))
+    mtime = time.time() - seconds
+    os.utime(path, (mtime if atime is None else atime, mtime))
+    return path
+
+
+@pytest.mark.parametrize("info, kwargs, ttl", [
+    ({"freq": "event"}, None, HOUR),
+    ({"freq": "daily"}, None, 6 * HOUR),
+    ({"freq": "quarterly"}, None, 3 * DAY),
+    ({"freq": "yearly"}, None, 7 * DAY),
+    ({}, None, DEFAULT_TTL),
+    ({"freq": "monthly"}, {"kind": "分省年度数据"}, 7 * DAY),
+    ({"freq": "monthly"}, {"kind": "季度数据"}, 3 * DAY),
+])
+def test_ttl_follows_frequency(info, kwargs, ttl):
+    assert dataset_ttl(info, kwargs) == ttl
+
+
+def test_missing_and_corrupt_files_read_as_empty(tmp_path):
+    cache = DatasetCache(root=str(tmp_path))
+    assert cache.read("中国宏观", "CPI") == (None, None)
+    with open(cache._path(cache_key("中国宏观", "CPI", {})), "wb") as f:
+        f.write(b"not parquet")
+    assert cache.read("中国宏观", "CPI") == (None, None)
+
+
+@pytest.fixture
+def upstream():
+    calls, gate = [], threading.Event()
+
+    def cpi():
+        calls.append(1)
+        gate.wait(5)
+        return frame(2.0)
+
+    yield calls, gate, cpi
+    gate.set()
+
+
+def test_fresh_copy_is_served_without_upstream_call(make_fetcher, upstream):
+    calls, gate, cpi = upstream
+    fetcher = make_fetcher(REGISTRY, {"cpi": cpi})
+    fetcher.cache.write("中国宏观", "CPI", {}, frame(1.0))
+    age_file(fetcher.cache, "CPI", DAY - 60)
+    assert fetcher.fetch("中国宏观", "CPI")["值"].iloc[0] == 1.0
+    time.sleep(0.05)
+    assert calls == []
+
+
+def test_expired_copy_is_served_and_refreshed_once(make_fetcher, upstream):
+    calls, gate, cpi = upstream
+    fetcher = make_fetcher(REGISTRY, {"cpi": cpi})
+    fetcher.cache.write("中国宏观", "CPI", {}, frame(1.0))
+    age_file(fetcher.cache, "CPI", DAY + 60)
+
+    # the stale copy comes back while the refresh is still blocked upstream
+    for _ in range(3):
+        assert fetcher.fetch("中国宏观", "CPI")["值"].iloc[0] == 1.0
+    deadline = time.monotonic() + 5
+    while not calls:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    assert calls == [1]
+
+    gate.set()
+    while fetcher.flights.in_flight(cache_key("中国宏观", "CPI", {})):
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    assert calls == [1]
+    assert fetcher.fetch("中国宏观", "CPI")["值"].iloc[0] == 2.0
+    assert fetcher.cache.age("中国宏观", "CPI") < 60
+
+
+def test_eviction_drops_least_recently_read(tmp_path):
+    probe = DatasetCache(root=str(tmp_path / "probe"))
+    probe.write("中国宏观", "a", {}, frame(1.0))
+    size = os.path.getsize(probe._path(cache_key("中国宏观", "a", {})))
+
+    cache = DatasetCache(root=str(tmp_path / "cache"), max_bytes=int(size * 2.5))
+    now = time.time()
+    for i, name in enumerate(["a", "b"]):
+        cache.write("中国宏观", name, {}, frame(float(i)))
+        age_file(cache, name, 600, atime=now - 600 + i)
+    # reading a makes b the least recently used
+    assert cache.read("中国宏观", "a")[0] is not None
+    cache.write("中国宏观", "c", {}, frame(3.0))
+    assert cache.fetched_at("中国宏观", "b") is None
+    assert cache.fetched_at("中国宏观", "a") is not None and cache.fetched_at("中国宏观", "c") is not None
+    # a read keeps the fetch time
+    assert cache.age("中国宏观", "a") >= 600
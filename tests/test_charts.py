@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from macro_charts import build_line_chart, downsample_series, lttb
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 20)
+    idx = lttb(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_extremes():
+    y = np.zeros(1000)
+    y[437] = 50
+    assert 437 in lttb(np.arange(1000, dtype=float), y, 50)
+
+
+def test_short_series_keeps_gaps():
+    dates = pd.Series(pd.date_range("2024-01-31", periods=5, freq="ME"))
+    values = pd.Series([1.0, 2.0, np.nan, 4.0, np.inf])
+    x, y = downsample_series(dates, values, 100)
+    assert len(x) == 5
+    assert np.isnan(y.iloc[2]) and np.isnan(y.iloc[4])
+
+
+def test_long_series_keeps_gap_markers():
+    dates = pd.Series(pd.date_range("2000-01-01", periods=20000, freq="D"))
+    values = pd.Series(np.sin(np.arange(20000) / 50.0))
+    values.iloc[5000:5400] = np.nan
+    x, y = downsample_series(dates, values, 500)
+    assert len(x) <= 502
+    assert x.iloc[0] == dates.iloc[0] and x.iloc[-1] == dates.iloc[-1]
+    gap = y.isna().to_numpy()
+    assert gap.sum() == 1
+    assert x[gap].iloc[0] == dates.iloc[5000]
+    assert x.is_monotonic_increasing
+
+
+def test_chart_trace_keeps_missing_periods():
+    df = pd.DataFrame({"日期": pd.date_range("2024-01-31", periods=5, freq="ME"), "值": [1.0, 2.0, np.nan, 4.0, 5.0]})
+    fig = build_line_chart(df, "日期", ["值"], title="t")
+    assert len(fig.data[0].x) == 5
+    assert fig.data[0].connectgaps is False
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from macro_cache import DatasetCache, cache_key
+from macro_correlation import CorrelationScanner, cached_series, lagged_correlation
+from macro_registry import iter_datasets
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2010-01-01", periods=120, freq="MS")
+    base = pd.Series(rng.normal(size=120), index=index).cumsum()
+    df = pd.DataFrame({
+        "a": base,
+        # b follows a three months later
+        "b": base.shift(3) + rng.normal(scale=0.3, size=120),
+        "c": rng.normal(size=120),
+    })
+    df.iloc[rng.choice(120, 15, replace=False), 0] = np.nan
+    df.iloc[:20, 2] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 7])
+def test_matches_pairwise_pandas_corr(frame, k):
+    X = frame.to_numpy()
+    T = len(X)
+    corr = lagged_correlation(X[:T - k], X[k:], min_periods=10)
+    for i, x in enumerate(frame.columns):
+        for j, y in enumerate(frame.columns):
+            expected = frame[x].corr(frame[y].shift(-k), min_periods=10)
+            assert corr[i, j] == pytest.approx(expected, nan_ok=True)
+
+
+def test_too_few_overlapping_periods_is_nan():
+    A = np.array([[1.0], [2.0], [np.nan], [4.0]])
+    assert np.isnan(lagged_correlation(A, A, min_periods=4)[0, 0])
+    assert lagged_correlation(A, A, min_periods=3)[0, 0] == pytest.approx(1.0)
+
+
+def test_top_related_finds_the_lead(frame):
+    scanner = CorrelationScanner(max_lag=6, min_periods=24)
+    scanner.update(frame)
+    top = scanner.top_related("a").set_index("序列")
+    assert top.loc["b", "领先期数"] == 3
+    assert scanner.top_related("b").set_index("序列").loc["a", "领先期数"] == -3
+
+
+def test_incremental_update_matches_full_scan(frame):
+    scanner = CorrelationScanner(max_lag=4, min_periods=24)
+    scanner.update(frame[["a", "c"]])
+    extended = frame.copy()
+    extended["c"] = extended["c"].iloc[::-1].to_numpy()
+    # b is new and c was revised; the a/a block is reused
+    assert scanner.update(extended) == 2
+    full = CorrelationScanner(max_lag=4, min_periods=24)
+    full.update(extended)
+    np.testing.assert_allclose(scanner.cube, full.cube, equal_nan=True)
+
+
+def test_state_is_swapped_as_a_whole(frame):
+    scanner = CorrelationScanner(max_lag=2, min_periods=24)
+    scanner.update(frame)
+    columns, cube = scanner._state
+    scanner.update(frame[["a", "b"]])
+    # a reader holding the old state still sees a matching cube
+    assert cube.shape[1] == len(columns) == 3
+    assert scanner.cube.shape[1] == len(scanner.columns) == 2
+    assert scanner.top_related("c").empty
+
+
+def test_scanning_the_cache_leaves_eviction_order_alone(tmp_path, frame):
+    cache = DatasetCache(root=str(tmp_path))
+    region_name, dataset_name, _ = next(
+        t for t in iter_datasets(["中国宏观"]) if not t[2].get("params")
+    )
+    df = pd.DataFrame({"日期": frame.index.strftime("%Y-%m-%d"), "值": frame["a"].to_numpy()})
+    cache.write(region_name, dataset_name, {}, df)
+    path = cache._path(cache_key(region_name, dataset_name, {}))
+    os.utime(path, (1_000_000, os.path.getmtime(path)))
+    assert len(cached_series(cache, ["中国宏观"])) == 1
+    assert os.stat(path).st_atime == 1_000_000
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from macro_cache import cache_key
+from macro_export import export
+
+REGISTRY = {
+    "r": {
+        "fresh": {"func": "fresh", "desc": "", "url": "https://a.example/", "freq": "monthly"},
+        "expired": {"func": "expired", "desc": "", "url": "https://b.example/", "freq": "monthly"},
+    },
+}
+
+
+def frame(value):
+    return pd.DataFrame({"日期": ["2024-01-01", "2024-02-01"], "值": [value, value]})
+
+
+def test_export_skips_expired_cache_and_records_source(make_fetcher, tmp_path):
+    calls = []
+    functions = {
+        "fresh": lambda: calls.append("fresh") or frame(1.0),
+        "expired": lambda: calls.append("expired") or frame(2.0),
+    }
+    fetcher = make_fetcher(REGISTRY, functions)
+    fetcher.cache.write("r", "fresh", {}, frame(1.0))
+    fetcher.cache.write("r", "expired", {}, frame(0.0))
+    old = time.time() - 30 * 86400
+    os.utime(fetcher.cache._path(cache_key("r", "expired", {})), (old, old))
+    threads = set(threading.enumerate())
+
+    manifest = export(str(tmp_path / "out"), fetcher, retries=0)
+
+    assert calls == ["expired"]
+    # no background refresh left running; only the metadata recorder may have started
+    assert {t.name.split("_")[0] for t in set(threading.enumerate()) - threads} <= {"macro-metadata"}
+    entries = json.load(open(manifest.path, encoding="utf-8"))["datasets"]
+    assert entries["r/fresh"]["source"] == "cache"
+    assert entries["r/expired"]["source"] == "upstream"
+    exported = pd.read_parquet(tmp_path / "out" / entries["r/expired"]["path"])
+    assert exported["值"].tolist() == [2.0, 2.0]
+
+
+def test_interrupted_export_resumes_from_manifest(make_fetcher, tmp_path):
+    registry = {"r": {name: {"func": name, "desc": "", "url": "https://a.example/"} for name in ("a", "b", "c")}}
+    calls = []
+    broken = {"b"}
+
+    def upstream(name):
+        def call():
+            calls.append(name)
+            if name in broken:
+                raise ValueError("接口异常")
+            return frame(1.0)
+        return call
+
+    fetcher = make_fetcher(registry, {name: upstream(name) for name in registry["r"]})
+    out_dir = str(tmp_path / "out")
+
+    def interrupt(done, total, entry):
+        if done == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        export(out_dir, fetcher, workers=1, retries=0, progress=interrupt)
+    first = json.load(open(os.path.join(out_dir, "manifest.json"), encoding="utf-8"))["datasets"]
+    assert first["r/a"]["status"] == "ok" and first["r/b"]["status"] == "failed"
+    assert "r/c" not in first
+
+    calls.clear()
+    broken.clear()
+    seen = []
+    manifest = export(out_dir, fetcher, workers=1, retries=0, progress=lambda done, total, entry: seen.append(total))
+
+    # the exported dataset is skipped; the failed and missing ones are fetched again
+    assert sorted(calls) == ["b", "c"] and seen == [2, 2]
+    assert manifest.entries["r/a"] == first["r/a"]
+    assert all(entry["status"] == "ok" for entry in manifest.entries.values())
+
+    seen.clear()
+    export(out_dir, fetcher, workers=1, retries=0, resume=False, progress=lambda done, total, entry: seen.append(total))
+    assert seen == [3, 3, 3]
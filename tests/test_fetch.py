@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from macro_fetch import CircuitBreaker, CircuitOpenError, SingleFlight, is_host_failure
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_single_flight_shares_one_call():
+    flights, calls, gate = SingleFlight(), [], threading.Event()
+
+    def slow():
+        calls.append(1)
+        gate.wait(5)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("k", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while not flights.in_flight("k"):
+        time.sleep(0.001)
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert calls == [1] and results == ["result"] * 5
+    assert not flights.in_flight("k")
+
+
+def test_single_flight_propagates_errors_and_forgets_key():
+    flights = SingleFlight()
+    with pytest.raises(KeyError):
+        flights.do("k", lambda: {}["missing"])
+    assert flights.do("k", lambda: 2) == 2
+
+
+def test_breaker_transitions():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, clock=clock)
+    for _ in range(2):
+        breaker.record_failure("h")
+    assert breaker.state("h") == "closed"
+    breaker.record_failure("h")
+    assert breaker.state("h") == "open" and not breaker.allow("h")
+
+    clock.now = 60
+    assert breaker.state("h") == "half-open"
+    assert breaker.allow("h") and not breaker.allow("h")  # a single trial call
+    breaker.record_failure("h")
+    assert breaker.state("h") == "open"
+
+    clock.now = 120
+    assert breaker.allow("h")
+    breaker.record_success("h")
+    assert breaker.state("h") == "closed" and breaker.allow("h")
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+    breaker.record_failure("h")
+    breaker.record_failure("h")
+    breaker.record_success("h")
+    breaker.record_failure("h")
+    assert breaker.state("h") == "closed"
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (requests.ConnectionError(), True),
+    (requests.Timeout(), True),
+    (TimeoutError(), True),
+    (http_error(503), True),
+    (http_error(429), True),
+    (http_error(404), False),
+    (KeyError("data"), False),
+    (ValueError("bad period"), False),
+    (requests.exceptions.JSONDecodeError("x", "", 0), False),
+])
+def test_host_failure_classification(exc, expected):
+    assert is_host_failure(exc) is expected
+
+
+REGISTRY = {
+    "国家统计局": {
+        "全国数据": {"func": "nbs", "desc": "", "url": "https://data.stats.gov.cn/", "freq": "monthly"},
+        "其他数据": {"func": "other", "desc": "", "url": "https://data.stats.gov.cn/", "freq": "monthly"},
+    },
+}
+
+
+def test_bad_request_does_not_open_breaker(make_fetcher):
+    def nbs(period):
+        raise KeyError("returndata")
+
+    fetcher = make_fetcher(REGISTRY, {"nbs": nbs, "other": lambda: pd.DataFrame({"a": [1]})})
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            fetcher.fetch("国家统计局", "全国数据", {"period": "bad"})
+    assert fetcher.fetch("国家统计局", "其他数据")["a"].tolist() == [1]
+
+
+def test_network_errors_open_breaker(make_fetcher):
+    def nbs(period):
+        raise requests.ConnectionError("down")
+
+    fetcher = make_fetcher(REGISTRY, {"nbs": nbs, "other": lambda: pd.DataFrame({"a": [1]})})
+    for _ in range(3):
+        with pytest.raises(requests.ConnectionError):
+            fetcher.fetch("国家统计局", "全国数据", {"period": "2023"})
+    with pytest.raises(CircuitOpenError):
+        fetcher.fetch("国家统计局", "其他数据")
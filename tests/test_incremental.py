@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+import requests
+
+from macro_incremental import refresh_incremental, requested_range, upsert
+
+REGISTRY = {
+    "中国宏观": {
+        "利率互换": {
+            "func": "swap", "desc": "", "url": "https://www.chinamoney.com.cn/", "freq": "daily",
+            "params": ["start_date", "end_date"], "window": "date_range",
+        },
+    },
+}
+UPSTREAM = pd.DataFrame({"日期": pd.bdate_range("2019-01-01", "2024-06-28")})
+UPSTREAM["利率"] = range(len(UPSTREAM))
+
+
+class SwapStub:
+    def __init__(self):
+        self.calls = []
+        self.revision = 0.0
+        self.down = False
+
+    def __call__(self, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        if self.down:
+            raise requests.ConnectionError("down")
+        rows = UPSTREAM[UPSTREAM["日期"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+        return pd.DataFrame({"日期": rows["日期"].dt.strftime("%Y-%m-%d"), "利率": rows["利率"] + self.revision})
+
+
+@pytest.fixture
+def swap(make_fetcher):
+    stub = SwapStub()
+    return stub, make_fetcher(REGISTRY, {"swap": stub})
+
+
+def fetch(fetcher, start, end, **kwargs):
+    return refresh_incremental(fetcher, "中国宏观", "利率互换", {"start_date": start, "end_date": end}, **kwargs)
+
+
+def test_earlier_range_is_backfilled_and_sliced(swap):
+    stub, fetcher = swap
+    fetch(fetcher, "20240101", "20240301")
+    df = fetch(fetcher, "20200101", "20200301")
+    assert df["日期"].min() >= "2020-01-01" and df["日期"].max() <= "2020-03-01"
+    assert len(df) == UPSTREAM["日期"].between("2020-01-01", "2020-03-01").sum()
+    assert stub.calls[-1] == ("20200101", "20240101")
+
+
+def test_stored_history_is_sliced_without_upstream_call(swap):
+    stub, fetcher = swap
+    fetch(fetcher, "20240101", "20240301")
+    calls = len(stub.calls)
+    df = fetch(fetcher, "20240201", "20240215")
+    assert len(stub.calls) == calls
+    assert df["日期"].tolist() == UPSTREAM.loc[UPSTREAM["日期"].between("2024-02-01", "2024-02-15"), "日期"].dt.strftime("%Y-%m-%d").tolist()
+
+
+def test_empty_backfill_is_not_repeated(swap):
+    stub, fetcher = swap
+    fetch(fetcher, "20190101", "20190301")
+    fetch(fetcher, "20100101", "20190301")
+    calls = len(stub.calls)
+    df = fetch(fetcher, "20100101", "20190301")
+    assert len(stub.calls) == calls
+    assert df["日期"].min() == "2019-01-01"
+
+
+def test_forced_refresh_reads_lookback_and_keeps_requested_end(swap):
+    stub, fetcher = swap
+    fetch(fetcher, "20240101", "20240301")
+    stub.revision = 0.5
+    df = fetch(fetcher, "20240101", "20240301", today=pd.Timestamp("2024-06-28"), force=True)
+    assert stub.calls[-1] == ("20240223", "20240628")
+    assert df["日期"].max() <= "2024-03-01"
+    # the look-back rows were revised, older ones kept
+    revised = df.set_index("日期")["利率"] % 1
+    assert revised["2024-02-29"] == 0.5 and revised["2024-01-02"] == 0.0
+
+
+def test_upsert_newer_rows_win():
+    history = pd.DataFrame({"日期": ["2024-01-01", "2024-02-01"], "值": [1.0, 2.0]})
+    new = pd.DataFrame({"日期": ["2024-02-01", "2024-03-01"], "值": [2.5, 3.0]})
+    merged = upsert(history, new)
+    assert merged["日期"].tolist() == ["2024-01-01", "2024-02-01", "2024-03-01"]
+    assert merged["值"].tolist() == [1.0, 2.5, 3.0]
+
+
+@pytest.mark.parametrize("period, start, end, last", [
+    ("2023", "2023-01-01", "2023-12-31", None),
+    ("2020-2023", "2020-01-01", "2023-12-31", None),
+    ("2023B-", "2023-04-01", None, None),
+    ("202305", "2023-05-01", "2023-05-31", None),
+    ("LAST10", None, None, 10),
+])
+def test_requested_nbs_period(period, start, end, last):
+    requested = requested_range({"window": "nbs_period"}, {"period": period})
+    assert requested["start"] == (pd.Timestamp(start) if start else None)
+    assert requested["end"] == (pd.Timestamp(end) if end else None)
+    assert requested["last"] == last
+
+
+def test_unparseable_period_is_passed_through():
+    assert requested_range({"window": "nbs_period"}, {"period": "2020,2022"}) is None
+
+
+def test_failed_backfill_serves_stored_history_and_retries(swap):
+    stub, fetcher = swap
+    fetch(fetcher, "20240101", "20240301")
+    stub.down = True
+    df = fetch(fetcher, "20231101", "20240131")
+    assert df["日期"].min() == "2024-01-01" and df["日期"].max() == "2024-01-31"
+
+    stub.down = False
+    df = fetch(fetcher, "20231101", "20240131")
+    assert df["日期"].min() == "2023-11-01"
+    assert stub.calls[-1] == ("20231101", "20240101")
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pandas as pd
+
+from macro_metadata import MetadataIndex
+
+REGISTRY = {
+    "国家统计局": {
+        "全国数据": {"func": "nbs", "desc": "统计局数据", "url": "https://data.stats.gov.cn/", "params": ["period"]},
+        "工业增加值": {"func": "industry", "desc": "规模以上工业", "url": "https://data.stats.gov.cn/", "freq": "monthly"},
+    },
+}
+
+
+def nbs(period):
+    return pd.DataFrame({"时间": [f"{period}01", f"{period}02"], f"指标{period}": [1.0, 2.0]})
+
+
+def industry():
+    return pd.DataFrame({"月份": ["2024年1月份", "2024年2月份"], "同比增长": ["6.8", "7.0"]})
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+class BlockingIndex:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.recorded = []
+
+    def record(self, *args):
+        self.gate.wait(5)
+        self.recorded.append(args[:3])
+
+
+def test_rows_are_keyed_by_request(make_fetcher):
+    fetcher = make_fetcher(REGISTRY, {"nbs": nbs, "industry": industry})
+    index = fetcher.metadata
+    fetcher.load("国家统计局", "全国数据", {"period": "2023"})
+    wait_until(lambda: index.get("国家统计局", "全国数据")["rows"] is not None)
+    fetcher.load("国家统计局", "全国数据", {"period": "2024"})
+    wait_until(lambda: index.get("国家统计局", "全国数据")["kwargs"] == {"period": "2024"})
+
+    assert index.get("国家统计局", "全国数据", {"period": "2023"})["columns"] == ["时间", "指标2023"]
+    assert index.get("国家统计局", "全国数据", {"period": "2024"})["columns"] == ["时间", "指标2024"]
+    assert index.get("国家统计局", "全国数据", {})["rows"] is None
+    assert index.get("国家统计局", "工业增加值")["rows"] is None
+    assert index.search("指标2024") == [("国家统计局", "全国数据")]
+
+
+def test_recording_does_not_hold_up_the_fetch(make_fetcher):
+    index = BlockingIndex()
+    fetcher = make_fetcher(REGISTRY, {"nbs": nbs, "industry": industry}, metadata=index)
+    try:
+        df = fetcher.load("国家统计局", "工业增加值")
+        assert df["同比增长"].tolist() == ["6.8", "7.0"] and index.recorded == []
+    finally:
+        index.gate.set()
+    wait_until(lambda: len(index.recorded) == 1)
+    assert index.recorded[0][:2] == ("国家统计局", "工业增加值")
+
+
+def test_backfill_describes_cached_defaults(make_fetcher):
+    fetcher = make_fetcher(REGISTRY, {"nbs": nbs, "industry": industry})
+    fetcher.cache.write("国家统计局", "工业增加值", {}, industry())
+    assert fetcher.metadata.get("国家统计局", "工业增加值")["rows"] is None
+    assert fetcher.metadata.backfill(fetcher.cache) == 1
+    meta = fetcher.metadata.get("国家统计局", "工业增加值", {})
+    assert meta["rows"] == 2 and meta["first_date"] == "2024-01-01" and meta["freq"] == "monthly"
+
+
+def test_registry_changes_are_synced(tmp_path):
+    path = str(tmp_path / "metadata.sqlite")
+    MetadataIndex(path, REGISTRY).get("国家统计局", "工业增加值")
+    changed = {"国家统计局": {"工业增加值": {**REGISTRY["国家统计局"]["工业增加值"], "freq": "quarterly", "desc": "新描述"}}}
+    index = MetadataIndex(path, changed)
+    meta = index.get("国家统计局", "工业增加值")
+    assert meta["freq"] == "quarterly" and meta["desc"] == "新描述"
+    assert index.get("国家统计局", "全国数据") is None
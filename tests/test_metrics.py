@@ -0,0 +1,39 @@
+import pytest
+import requests
+
+from macro_metrics import METRIC_NAME, StageMetrics, start_metrics_server
+
+
+def test_render_uses_cumulative_buckets():
+    metrics = StageMetrics(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.05, 1.0):
+        metrics.observe("pivot", seconds)
+    lines = metrics.render().splitlines()
+    assert f'{METRIC_NAME}_bucket{{stage="pivot",le="0.01"}} 1' in lines
+    assert f'{METRIC_NAME}_bucket{{stage="pivot",le="0.1"}} 3' in lines
+    assert f'{METRIC_NAME}_bucket{{stage="pivot",le="+Inf"}} 4' in lines
+    assert f'{METRIC_NAME}_count{{stage="pivot"}} 4' in lines
+
+
+def test_timed_failures_are_recorded():
+    metrics = StageMetrics()
+    with pytest.raises(ValueError):
+        with metrics.time("upstream"):
+            raise ValueError("bad")
+    assert metrics.snapshot()["upstream"]["count"] == 1
+
+
+def test_exporter_serves_the_process_metrics():
+    metrics = StageMetrics()
+    metrics.observe("chart", 0.2)
+    server = start_metrics_server(port=0, metrics=metrics)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        response = requests.get(f"{base}/metrics")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert f'{METRIC_NAME}_count{{stage="chart"}} 1' in response.text
+        assert requests.get(f"{base}/other").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,137 @@
+import warnings
+from types import SimpleNamespace
+
+import pytest
+import urllib3
+
+import macro_nbs_catalog
+from macro_nbs_catalog import NbsCatalog, ignore_nbs_certificate_warning
+
+UNVERIFIED = (
+    "Unverified HTTPS request is being made to host '{}'. Adding certificate verification is strongly advised."
+)
+
+
+def test_insecure_warning_is_silenced_only_for_the_nbs_host():
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # pytest resets filters per test; reinstall the module's filter on top
+        ignore_nbs_certificate_warning()
+        warnings.warn(UNVERIFIED.format("data.stats.gov.cn"), urllib3.exceptions.InsecureRequestWarning)
+        assert caught == []
+        warnings.warn(UNVERIFIED.format("example.com"), urllib3.exceptions.InsecureRequestWarning)
+        assert len(caught) == 1
+
+
+TREE = {
+    "zb": [("A01", "价格指数", False), ("A02", "工业", False)],
+    "A01": [("A0101", "居民消费价格指数", True), ("A0102", "工业生产者出厂价格指数", True)],
+    "A02": [("A0201", "工业增加值增长速度", True)],
+}
+INDICATORS = {
+    "A0101": ["居民消费价格指数(上年同月=100)", "食品烟酒类居民消费价格指数(上年同月=100)"],
+    "A0102": ["工业生产者出厂价格指数(上年同月=100)"],
+    "A0201": ["工业增加值同比增长(%)"],
+}
+PINYIN = {"工": "gong", "业": "ye", "重": "zhong", "价": "jia", "格": "ge", "指": "zhi", "数": "shu"}
+
+
+class StubClient:
+    def __init__(self, tree=TREE):
+        self.tree_ = tree
+        self.calls = []
+
+    def tree(self, dbcode, node_id):
+        self.calls.append(("tree", dbcode, node_id))
+        return self.tree_[node_id]
+
+    def indicators(self, dbcode, node_id):
+        self.calls.append(("indicators", dbcode, node_id))
+        return INDICATORS[node_id]
+
+    def regions(self, dbcode):
+        self.calls.append(("regions", dbcode))
+        return ["北京市", "天津市"]
+
+
+class OfflineClient:
+    def __getattr__(self, name):
+        raise AssertionError(f"unexpected upstream call: {name}")
+
+
+def fake_lazy_pinyin(name, style=None, errors=None):
+    syllables = [PINYIN.get(c, c.lower()) for c in name]
+    return [s[0] for s in syllables] if style else syllables
+
+
+@pytest.fixture
+def fake_pinyin(monkeypatch):
+    monkeypatch.setattr(macro_nbs_catalog, "lazy_pinyin", fake_lazy_pinyin)
+    monkeypatch.setattr(macro_nbs_catalog, "Style", SimpleNamespace(FIRST_LETTER="initials"), raising=False)
+
+
+@pytest.fixture
+def no_pinyin(monkeypatch):
+    monkeypatch.setattr(macro_nbs_catalog, "lazy_pinyin", None)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "nbs_catalog.json")
+
+
+def test_children_are_fetched_once_and_persisted(path, no_pinyin):
+    client = StubClient()
+    catalog = NbsCatalog(path, client)
+    assert catalog.children("月度数据") == [("A01", "价格指数", False), ("A02", "工业", False)]
+    assert catalog.children("月度数据") == catalog.children("月度数据")
+    assert client.calls == [("tree", "hgyd", "zb")]
+    # subtrees stay unexpanded until asked for
+    assert catalog.children("月度数据", "A01")[0] == ("A0101", "居民消费价格指数", True)
+    assert len(client.calls) == 2
+
+    reopened = NbsCatalog(path, OfflineClient())
+    assert [c[0] for c in reopened.children("月度数据", "A01")] == ["A0101", "A0102"]
+    assert reopened.node_path("月度数据", "A0102") == "价格指数 > 工业生产者出厂价格指数"
+
+
+def test_indicators_and_regions_are_cached(path, no_pinyin):
+    client = StubClient()
+    catalog = NbsCatalog(path, client)
+    for _ in range(2):
+        assert catalog.indicators("月度数据", "A0102") == INDICATORS["A0102"]
+        assert catalog.regions("分省月度数据") == ["北京市", "天津市"]
+    assert client.calls == [("indicators", "hgyd", "A0102"), ("regions", "fsyd")]
+    assert NbsCatalog(path, OfflineClient()).indicators("月度数据", "A0102") == INDICATORS["A0102"]
+
+
+def test_build_indexes_the_whole_kind(path, no_pinyin):
+    client = StubClient()
+    progress = []
+    loaded = NbsCatalog(path, client).build("月度数据", progress=lambda *args: progress.append(args[1:]))
+    assert loaded == 5 and progress[-1][0] == 5
+    assert sorted(c[2] for c in client.calls if c[0] == "indicators") == ["A0101", "A0102", "A0201"]
+    assert not any(c[0] == "regions" for c in client.calls)
+
+    hits = NbsCatalog(path, OfflineClient()).search("月度数据", "烟酒")
+    assert hits == [{"path": "价格指数 > 居民消费价格指数", "node_id": "A0101", "indicator": INDICATORS["A0101"][1]}]
+
+
+def test_search_ranking(path, fake_pinyin):
+    tree = {"zb": [(f"N{i}", name, True) for i, name in enumerate(["GxY数据", "重工业", "产品gy", "工业", "GY指标"])]}
+    catalog = NbsCatalog(path, StubClient(tree))
+    catalog.children("月度数据")
+    # prefix > initials/pinyin prefix > substring > pinyin substring > fuzzy
+    names = [hit["path"] for hit in catalog.search("月度数据", "gy")]
+    assert names == ["GY指标", "工业", "产品gy", "重工业", "GxY数据"]
+
+
+def test_index_built_without_pinyin_gets_keys_later(path, no_pinyin, monkeypatch):
+    catalog = NbsCatalog(path, StubClient())
+    catalog.children("月度数据")
+    assert catalog.search("月度数据", "gy") == []
+
+    monkeypatch.setattr(macro_nbs_catalog, "lazy_pinyin", fake_lazy_pinyin)
+    monkeypatch.setattr(macro_nbs_catalog, "Style", SimpleNamespace(FIRST_LETTER="initials"), raising=False)
+    reopened = NbsCatalog(path, OfflineClient())
+    assert [hit["node_id"] for hit in reopened.search("月度数据", "gy")] == ["A02"]
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from macro_normalize import LayoutCache, clean_numeric, detect_date_format, detect_layout, normalize, parse_dates
+
+
+@pytest.mark.parametrize("values, fmt, expected", [
+    (["2024-01-31", "2024-02-29"], "%Y-%m-%d", ["2024-01-31", "2024-02-29"]),
+    (["2024-01-31 15:00:00", "2024-02-29T09:30"], "iso8601", ["2024-01-31 15:00", "2024-02-29 09:30"]),
+    (["2024/1/31", "2024/2/29"], "%Y/%m/%d", ["2024-01-31", "2024-02-29"]),
+    (["2024年1月31日", "2024年2月29日"], "%Y年%m月%d日", ["2024-01-31", "2024-02-29"]),
+    (["20240131", "20240229"], "%Y%m%d", ["2024-01-31", "2024-02-29"]),
+    (["2024-01", "2024-2"], "%Y-%m", ["2024-01-01", "2024-02-01"]),
+    (["202401", "202402"], "%Y%m", ["2024-01-01", "2024-02-01"]),
+    (["2024年1月份", "2024年12月"], "cn_month", ["2024-01-01", "2024-12-01"]),
+    (["2024年第1季度", "2023年第1-3季度"], "cn_quarter", ["2024-01-01", "2023-07-01"]),
+    (["2024Q1", "2024-q4"], "quarter", ["2024-01-01", "2024-10-01"]),
+    (["2024A", "2024D"], "nbs_quarter", ["2024-01-01", "2024-10-01"]),
+    (["2023年", "2024"], "year", ["2023-01-01", "2024-01-01"]),
+])
+def test_date_formats(values, fmt, expected):
+    series = pd.Series(values)
+    assert detect_date_format(series) == fmt
+    assert parse_dates(series).tolist() == pd.to_datetime(expected).tolist()
+
+
+def test_numeric_dates_and_stray_rows():
+    assert detect_date_format(pd.Series([202401, 202402, None])) == "%Y%m"
+    parsed = parse_dates(pd.Series(["2024-01-31", "2024-02-29", "数据来源: 国家统计局"], index=[5, 6, 7]))
+    assert parsed.index.tolist() == [5, 6, 7]
+    assert parsed.isna().tolist() == [False, False, True]
+
+
+def test_undetected_format_falls_back_to_inference():
+    assert detect_date_format(pd.Series(["Jan 2024", "Feb 2024"])) == "infer"
+    assert detect_date_format(pd.Series([None, None])) is None
+
+
+def test_clean_numeric_strips_display_text():
+    cleaned = clean_numeric(pd.Series(["1,234.5", "3.2%", "--", "abc"]))
+    assert cleaned.iloc[:2].tolist() == [1234.5, 3.2]
+    assert cleaned.iloc[2:].isna().all()
+
+
+def test_item_value_frames_are_pivoted():
+    df = pd.DataFrame({"date": ["2024A", "2024A", "2024B"], "item": ["GDP", "CPI", "GDP"], "value": ["1", "2", "3"]})
+    formatted, date_col, numeric_cols = normalize(df)
+    assert date_col == "date" and sorted(numeric_cols) == ["CPI", "GDP"]
+    assert formatted["GDP"].tolist() == [1.0, 3.0]
+
+
+def test_layout_cache_is_invalidated_by_schema_change(tmp_path):
+    layouts = LayoutCache(str(tmp_path / "layouts.json"))
+    df = pd.DataFrame({"月份": ["2024年1月份"], "今值": ["1.0"]})
+    layouts.put("k", detect_layout(df))
+    assert LayoutCache(layouts.path).get("k", df.columns)["date_format"] == "cn_month"
+    assert layouts.get("k", ["月份", "今值", "前值"]) is None
+
+
+def test_repeated_values_are_mapped_back_in_place():
+    series = pd.Series(["2024A", None, "2024B", "2024A", "bad", "2024B"], index=list("uvwxyz"), name="date")
+    expected = pd.to_datetime(["2024-01-01", None, "2024-04-01", "2024-01-01", None, "2024-04-01"])
+    pd.testing.assert_series_equal(
+        parse_dates(series, "nbs_quarter"), pd.Series(expected, index=series.index, name="date"), check_freq=False
+    )
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import macro_registry
+from macro_registry import AKSHARE_MACRO_MAP, dataset_host, iter_datasets, resolve_func
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [name[:-3] for name in os.listdir(ROOT) if name.startswith("macro_") and name.endswith(".py")]
+# any eager `import akshare` fails loudly instead of silently succeeding
+ISOLATED = """
+import sys
+
+class BlockAkshare:
+    def find_spec(self, name, path=None, target=None):
+        if name == "akshare" or name.startswith("akshare."):
+            raise ImportError("akshare imported eagerly")
+
+sys.meta_path.insert(0, BlockAkshare())
+"""
+
+
+def run_isolated(code, tmp_path):
+    env = {**os.environ, "MACRO_CACHE_DIR": str(tmp_path)}
+    result = subprocess.run(
+        [sys.executable, "-c", ISOLATED + code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_modules_do_not_import_akshare(tmp_path):
+    run_isolated(f"import {', '.join(sorted(MODULES))}\nassert 'akshare' not in sys.modules", tmp_path)
+
+
+def test_app_renders_without_importing_akshare(tmp_path):
+    pytest.importorskip("streamlit")
+    run_isolated(
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('streamlit_app.py', default_timeout=60).run()\n"
+        "assert not at.exception, [e.value for e in at.exception]\n"
+        "assert 'akshare' not in sys.modules",
+        tmp_path,
+    )
+
+
+def test_every_entry_names_a_function(monkeypatch):
+    class FakeAkshare:
+        def __getattr__(self, name):
+            return ("akshare", name)
+
+    monkeypatch.setattr(macro_registry, "_akshare", FakeAkshare())
+    for region_name, dataset_name, info in iter_datasets():
+        assert isinstance(info["func"], str) and info["func"].isidentifier(), (region_name, dataset_name)
+        assert resolve_func(info) == ("akshare", info["func"])
+        assert dataset_host(info)
+
+
+def test_every_entry_resolves_in_akshare(monkeypatch):
+    akshare = pytest.importorskip("akshare")
+    monkeypatch.setattr(macro_registry, "_akshare", None)
+    missing = [
+        f"{region_name}/{dataset_name}: {info['func']}"
+        for region_name, dataset_name, info in iter_datasets()
+        if not callable(getattr(akshare, info["func"], None))
+    ]
+    assert missing == []
+    assert resolve_func(next(iter(AKSHARE_MACRO_MAP["中国宏观"].values()))) is not None
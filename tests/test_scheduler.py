@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+from macro_cache import HOUR, cache_key
+from macro_scheduler import RETRY_AFTER, ReleaseScheduler
+
+REGISTRY = {
+    "中国宏观": {
+        "CPI月率": {"func": "cpi", "desc": "", "url": "https://data.eastmoney.com/", "freq": "monthly"},
+        "GDP年率": {"func": "gdp", "desc": "", "url": "https://data.eastmoney.com/", "freq": "quarterly"},
+    },
+}
+RELEASE = pd.Timestamp("2024-03-09 09:30", tz="Asia/Shanghai").timestamp()
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = []
+        self.down = False
+
+    def __call__(self, name):
+        def load():
+            self.calls.append(name)
+            if self.down:
+                raise requests.ConnectionError("down")
+            return pd.DataFrame({"日期": ["2024-02-01"], "今值": [0.7]})
+        return load
+
+
+def calendar(day):
+    if day.strftime("%Y%m%d") != "20240309":
+        return pd.DataFrame(columns=["time", "region", "event"])
+    return pd.DataFrame({"time": [RELEASE], "region": ["中国"], "event": ["中国2月CPI月率"]})
+
+
+@pytest.fixture
+def scheduler(make_fetcher):
+    upstream = Upstream()
+    fetcher = make_fetcher(REGISTRY, {"cpi": upstream("cpi"), "gdp": upstream("gdp")})
+    for dataset_name in REGISTRY["中国宏观"]:
+        fetcher.load("中国宏观", dataset_name)
+        # both copies were fetched the evening before the release
+        path = fetcher.cache._path(cache_key("中国宏观", dataset_name, {}))
+        os.utime(path, (RELEASE - 12 * HOUR, RELEASE - 12 * HOUR))
+    upstream.calls.clear()
+    return upstream, ReleaseScheduler(fetcher, calendar=calendar, clock=lambda: RELEASE, retries=0, backoff=0)
+
+
+def test_release_refreshes_only_the_matched_dataset(scheduler):
+    upstream, scheduler = scheduler
+    assert scheduler.run_once(RELEASE + 60) == {"ok": [], "failed": []}
+    report = scheduler.run_once(RELEASE + 3 * 60)
+    assert [(r, d) for r, d, *_ in report["ok"]] == [("中国宏观", "CPI月率")]
+    assert upstream.calls == ["cpi"]
+    # the refreshed copy postdates the release; nothing else is due
+    assert scheduler.run_once(RELEASE + 4 * 60) == {"ok": [], "failed": []}
+
+
+def test_failed_refresh_waits_before_retrying(scheduler):
+    upstream, scheduler = scheduler
+    upstream.down = True
+    now = RELEASE + 3 * 60
+    assert len(scheduler.run_once(now)["failed"]) == 1
+    assert scheduler.run_once(now + RETRY_AFTER - 1)["failed"] == []
+    assert len(scheduler.run_once(now + RETRY_AFTER)["failed"]) == 1
+    assert upstream.calls == ["cpi", "cpi"]
+
+
+def test_next_run_wakes_for_the_release_check(scheduler):
+    _, scheduler = scheduler
+    scheduler.poll_interval = 10 * 60
+    scheduler.run_once(RELEASE - HOUR / 2)
+    assert scheduler.next_run(RELEASE - 20 * 60) == RELEASE - 10 * 60
+    # the first check after the release comes before the next poll or calendar reload
+    assert scheduler.next_run(RELEASE + 60) == RELEASE + 2 * 60
+
+
+def test_calendar_errors_keep_ttl_fallback(scheduler):
+    upstream, scheduler = scheduler
+
+    def broken(day):
+        raise requests.ConnectionError("calendar down")
+
+    scheduler.calendar = broken
+    # without release times the monthly copy expires after its one-day TTL
+    assert scheduler.run_once(RELEASE)["ok"] == []
+    report = scheduler.run_once(RELEASE + 12 * HOUR)
+    assert [d for _, d, *_ in report["ok"]] == ["CPI月率"]
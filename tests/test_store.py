@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import macro_normalize
+from macro_store import FrameRef, FrameStore, _float32_exact, compact, frame_bytes
+
+
+@pytest.mark.parametrize("values, exact", [
+    ([1.5, 2.25, np.nan], True),
+    ([0.1, 0.2, 103.7], True),
+    ([1234567.891], False),
+    ([16777217.0], False),
+    ([np.nan, np.inf], True),
+])
+def test_float32_exact(values, exact):
+    assert _float32_exact(np.array(values)) is exact
+
+
+def frame(rows=40):
+    return pd.DataFrame({
+        "日期": [f"2024-{m % 12 + 1:02d}-01" for m in range(rows)],
+        "今值": [f"{i / 10:.1f}" for i in range(rows)],
+        "地区": ["北京", "上海"] * (rows // 2),
+        "备注": [f"note {i}" for i in range(rows)],
+        "价格": np.linspace(1, 2, rows).round(2),
+        "精确值": np.full(rows, 1234567.891),
+        "数量": np.arange(rows, dtype=np.int64),
+    })
+
+
+def test_compact_dtypes():
+    out = compact(frame(), "test/compact_dtypes")
+    # date and value columns stay text for normalization, even at low cardinality
+    assert out["日期"].dtype == "string[pyarrow]" and out["今值"].dtype == "string[pyarrow]"
+    assert isinstance(out["地区"].dtype, pd.CategoricalDtype)
+    assert out["备注"].dtype == "string[pyarrow]"
+    assert out["价格"].dtype == np.float32 and out["精确值"].dtype == np.float64
+    assert out["数量"].dtype == np.int8
+    assert out["精确值"].tolist() == frame()["精确值"].tolist()
+
+
+def test_item_value_columns_stay_text():
+    df = pd.DataFrame({"date": ["2024A", "2024B"] * 10, "item": ["GDP"] * 20, "value": ["1.0", "2.0"] * 10})
+    out = compact(df, "test/item_value")
+    assert out["value"].dtype == "string[pyarrow]" and isinstance(out["item"].dtype, pd.CategoricalDtype)
+
+
+def test_compact_uses_the_layout_cache(monkeypatch):
+    calls = []
+    detect = macro_normalize.detect_layout
+    monkeypatch.setattr(macro_normalize, "detect_layout", lambda df: calls.append(1) or detect(df))
+    store = FrameStore()
+    ref = FrameRef("中国宏观", "测试布局")
+    store.put(ref.key, frame(), ref.layout_key)
+    store.put(ref.key, frame(), ref.layout_key)
+    assert calls == [1]
+
+
+def test_eviction_is_lru_under_the_byte_budget():
+    size = frame_bytes(compact(frame(), "test/eviction"))
+    store = FrameStore(max_bytes=int(size * 2.5))
+    for key in "abc":
+        store.put(key, frame(), "test/eviction")
+    assert store.get("a") is None
+    store.get("b")
+    store.put("d", frame(), "test/eviction")
+    assert store.get("c") is None and store.get("b") is not None
+    assert store.stats()["entries"] == 2 and store.stats()["bytes"] <= store.max_bytes
+
+
+def test_newest_entry_stays_even_over_budget():
+    store = FrameStore(max_bytes=1)
+    store.put("a", frame(), "test/eviction")
+    store.put("b", frame(), "test/eviction")
+    assert store.get("a") is None and store.get("b") is not None
+    assert store.nbytes("b") > store.max_bytes
@@ -0,0 +1,102 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from macro_tasks import TaskRunner
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def gate():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_superseded_tasks_are_capped_per_session(gate):
+    runner = TaskRunner(workers=4, session_tasks=2)
+    running = []
+
+    def slow(n):
+        running.append(n)
+        gate.wait(5)
+        return n
+
+    tasks = [runner.submit(("a", "dataset"), f"t{n}", slow, n) for n in range(5)]
+    wait_until(lambda: len(running) == 2)
+    time.sleep(0.05)
+    assert running == [0, 1]
+    # the superseded queued tasks are cancelled, only the latest waits
+    assert [t.state for t in tasks] == ["cancelled", "cancelled", "cancelled", "cancelled", "queued"]
+
+    other = runner.submit(("b", "dataset"), "other", lambda: "b")
+    assert other.wait(2) and other.result() == "b"
+
+    gate.set()
+    assert tasks[-1].wait(2) and tasks[-1].result() == 4
+    assert sorted(running) == [0, 1, 4]
+
+
+def test_timeout_counts_from_start(gate):
+    clock = FakeClock()
+    runner = TaskRunner(workers=1, session_tasks=1, timeout=10, clock=clock)
+    first = runner.submit(("a", "dataset"), "slow", gate.wait, 5)
+    second = runner.submit(("b", "dataset"), "waiting", lambda: "done")
+    wait_until(lambda: first.state == "running")
+    clock.now = 11
+    assert first.state == "timeout"
+    assert second.state == "pending"
+    gate.set()
+    assert second.wait(2) and second.state == "done"
+
+
+def test_cancel_queued_task_never_runs(gate):
+    runner = TaskRunner(workers=2, session_tasks=1)
+    ran = []
+    runner.submit(("a", "workspace"), "busy", gate.wait, 5)
+    queued = runner.submit(("a", "dataset"), "queued", ran.append, 1)
+    assert queued.state == "queued"
+    runner.cancel(("a", "dataset"))
+    gate.set()
+    time.sleep(0.1)
+    assert ran == [] and queued.state == "cancelled"
+
+
+class StalledHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(2)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_upstream_calls_get_a_request_timeout(make_fetcher):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StalledHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    registry = {"r": {"d": {"func": "stalled", "desc": "", "url": url}}}
+    # like most akshare functions: requests without an explicit timeout
+    fetcher = make_fetcher(registry, {"stalled": lambda: requests.get(url)}, timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        fetcher.load("r", "d")
+    assert time.monotonic() - start < 1.5
+    assert fetcher.breaker._failures["127.0.0.1"] == 1
+    server.shutdown()
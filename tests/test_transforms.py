@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macro_transforms import TransformEngine, compute, infer_frequency
+
+
+def monthly_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("1990-01-31", periods=n, freq="ME", name="日期")
+    return pd.DataFrame({"a": 100 + rng.normal(0, 1, n).cumsum(), "b": rng.uniform(50, 60, n)}, index=index)
+
+
+def assert_matches_full(engine, key, frame, transform, **kwargs):
+    freq = infer_frequency(frame.index)
+    result = engine.apply(key, frame, transform, **kwargs)
+    expected = compute(frame, transform, freq, **kwargs)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("transform", ["yoy", "mom", "rolling_mean", "rebase"])
+def test_grown_frame_matches_full_compute(transform):
+    engine, frame = TransformEngine(), monthly_frame()
+    assert_matches_full(engine, "k", frame.iloc[:250], transform)
+    assert_matches_full(engine, "k", frame, transform)
+
+
+@pytest.mark.parametrize("transform", ["yoy", "mom", "rolling_mean", "rebase"])
+@pytest.mark.parametrize("row", [0, 100, 297])
+def test_revised_row_is_recomputed(transform, row):
+    engine, frame = TransformEngine(), monthly_frame()
+    engine.apply("k", frame, transform)
+    revised = frame.copy()
+    revised.iloc[row, 0] += 5
+    assert_matches_full(engine, "k", revised, transform)
+
+
+def test_daily_yoy_matches_full_compute():
+    index = pd.bdate_range("2015-01-01", "2024-12-31", name="日期")
+    frame = pd.DataFrame({"a": np.linspace(1, 2, len(index))}, index=index)
+    engine = TransformEngine()
+    assert_matches_full(engine, "k", frame.iloc[:-30], "yoy")
+    assert_matches_full(engine, "k", frame, "yoy")
+
+
+def test_results_are_cached_per_key():
+    engine, frame = TransformEngine(), monthly_frame()
+    engine.apply("a", frame, "mom")
+    other = frame * 2 + 1
+    assert_matches_full(engine, "b", other, "mom")
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pandas as pd
+
+from macro_warmup import HostLimiter, run_by_host, warmup
+
+
+def make_registry(n_per_host):
+    # registry order puts every slow-host entry ahead of the fast host
+    datasets = {f"em{i}": {"func": "em", "desc": "", "url": "https://data.eastmoney.com/x"} for i in range(n_per_host)}
+    datasets.update({f"jin{i}": {"func": "jin", "desc": "", "url": "https://datacenter.jin10.com/x"} for i in range(n_per_host)})
+    return {"r": datasets}
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.002)
+
+
+class Recorder:
+    # upstream stand-in: each host's calls block until its gate opens
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gates = {}
+        self.active = {}
+        self.peak = {}
+        self.done = {}
+
+    def __call__(self, host):
+        gate = self.gates[host] = threading.Event()
+
+        def call():
+            with self.lock:
+                self.active[host] = self.active.get(host, 0) + 1
+                self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            gate.wait(5)
+            with self.lock:
+                self.active[host] -= 1
+                self.done[host] = self.done.get(host, 0) + 1
+            return pd.DataFrame({"a": [1]})
+        return call
+
+
+def test_hosts_are_scheduled_independently(make_fetcher):
+    recorder = Recorder()
+    fetcher = make_fetcher(make_registry(20), {"em": recorder("em"), "jin": recorder("jin")})
+    limiter = HostLimiter({"data.eastmoney.com": 2}, default_limit=4)
+    report = {}
+    thread = threading.Thread(target=lambda: report.update(warmup(fetcher, workers=16, limiter=limiter, retries=0)))
+    thread.start()
+    try:
+        wait_until(lambda: recorder.active.get("em") == 2 and recorder.active.get("jin") == 4)
+        # the fast host drains while every slow-host slot is still held
+        recorder.gates["jin"].set()
+        wait_until(lambda: recorder.done.get("jin") == 20)
+        assert recorder.done.get("em", 0) == 0 and recorder.active["em"] == 2
+    finally:
+        recorder.gates["em"].set()
+        recorder.gates["jin"].set()
+        thread.join(5)
+    assert len(report["ok"]) == 40 and not report["failed"]
+    assert recorder.peak == {"em": 2, "jin": 4}
+
+
+def test_single_worker_rotates_between_hosts():
+    targets = [("r", f"{host}{i}", {"url": f"https://{host}.example/"}) for host in ("a", "b") for i in range(3)]
+    order = [target[1] for target, _ in run_by_host(targets, lambda t: None, HostLimiter(), workers=1)]
+    assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+
+def test_fresh_entries_are_skipped(make_fetcher):
+    recorder = Recorder()
+    fetcher = make_fetcher(make_registry(2), {"em": recorder("em"), "jin": recorder("jin")})
+    for gate in recorder.gates.values():
+        gate.set()
+    warmup(fetcher, retries=0)
+    report = warmup(fetcher, retries=0)
+    assert len(report["fresh"]) == 4
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from macro_workspace import align_series, extract_series, fetch_many
+
+DAILY = pd.Series([1.0, 2.0, 3.0, np.nan, 5.0], index=pd.to_datetime(
+    ["2024-01-02", "2024-01-31", "2024-02-01", "2024-02-15", "2024-04-10"]
+))
+MONTHLY = pd.Series([10.0, 20.0], index=pd.to_datetime(["2024-01-01", "2024-03-01"]))
+
+
+@pytest.mark.parametrize("how, january, april", [("last", 2.0, 5.0), ("mean", 1.5, 5.0), ("sum", 3.0, 5.0)])
+def test_resampling_rules(how, january, april):
+    aligned = align_series({"daily": DAILY, "monthly": MONTHLY}, freq="MS", how=how)
+    assert aligned.index.tolist() == list(pd.date_range("2024-01-01", "2024-04-01", freq="MS"))
+    assert aligned.loc["2024-01-01", "daily"] == january
+    assert aligned.loc["2024-04-01", "daily"] == april
+    assert aligned.loc[["2024-01-01", "2024-03-01"], "monthly"].tolist() == [10.0, 20.0]
+    # a month with no observations stays missing, also when summing
+    assert np.isnan(aligned.loc["2024-03-01", "daily"])
+    assert np.isnan(aligned.loc["2024-02-01", "monthly"])
+
+
+def test_quarterly_alignment_and_empty_inputs():
+    aligned = align_series({"daily": DAILY, "empty": pd.Series(dtype=float)}, freq="QS", how="sum")
+    assert list(aligned.columns) == ["daily"]
+    assert aligned["daily"].tolist() == [6.0, 5.0]
+    assert align_series({}).empty
+
+
+def test_duplicate_dates_keep_the_last_row():
+    df = pd.DataFrame({
+        "日期": ["2024-02-01", "2024-01-01", "2024-02-01", "bad"],
+        "今值": ["2.0", "1.0", "2.5", "9"],
+    })
+    series = extract_series(df, None, "今值")
+    assert series.index.tolist() == list(pd.to_datetime(["2024-01-01", "2024-02-01"]))
+    assert series.tolist() == [1.0, 2.5]
+
+
+class StubFetcher:
+    def fetch(self, region_name, dataset_name):
+        if dataset_name == "down":
+            raise requests.ConnectionError("down")
+        return pd.DataFrame({"日期": ["2024-01-01"], "值": [dataset_name]})
+
+
+def test_fetch_many_returns_errors_per_target():
+    results = fetch_many(StubFetcher(), [("r", "ok"), ("r", "down"), ("r", "other")], workers=2)
+    assert set(results) == {("r", "ok"), ("r", "down"), ("r", "other")}
+    assert isinstance(results[("r", "down")], requests.ConnectionError)
+    assert results[("r", "other")]["值"].tolist() == ["other"]
+    assert fetch_many(StubFetcher(), []) == {}